@@ -1,7 +1,9 @@
 # backend/ai_intent.py
-import os, json
+import os, json, time
 import requests
 
+from metrics import LLM_SECONDS, LLM_FALLBACKS
+
 __all__ = ["safe_merge_ai_intent"]
 
 def _ai_extract_intent(text: str) -> dict:
@@ -9,6 +11,7 @@ def _ai_extract_intent(text: str) -> dict:
     Use Ollama (format=json) to extract phone-shopping intent from free-form text.
     Returns {} on any error (so callers never break).
     """
+    t0 = time.perf_counter()
     try:
         ollama_url = os.environ.get("OLLAMA_URL", "http://127.0.0.1:11434")
         model = os.environ.get("OLLAMA_MODEL", "llama3.1:8b")
@@ -59,6 +62,7 @@ def _ai_extract_intent(text: str) -> dict:
         r.raise_for_status()
         raw = r.json().get("response", "{}").strip()
         data = json.loads(raw)
+        LLM_SECONDS.observe(time.perf_counter() - t0, call="ai_intent", outcome="ok")
 
         # normalize “both size prefs set” -> none
         if data.get("prefer_small") and data.get("prefer_large"):
@@ -78,6 +82,8 @@ def _ai_extract_intent(text: str) -> dict:
         # drop null/empty
         return {k: v for k, v in data.items() if v not in (None, "", [], {})}
     except Exception:
+        LLM_SECONDS.observe(time.perf_counter() - t0, call="ai_intent", outcome="error")
+        LLM_FALLBACKS.inc(call="ai_intent")
         return {}
 
 def safe_merge_ai_intent(user_text: str, current: dict) -> dict:
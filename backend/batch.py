@@ -0,0 +1,145 @@
+# backend/batch.py
+"""
+Scoring many intents at once (/recommend/batch).
+
+A BatchScorer is built once per catalog snapshot (see main.catalog_cached) and
+keeps the catalog as numpy arrays. A chunk of m normalized intents becomes:
+
+  * an (m x phones) boolean matrix with the rules of main.filter_df_by_intent
+    plus the strict budget gate of the chat results path. Numeric limits are
+    broadcast comparisons; OS / brand / feature rows are computed once per
+    distinct value in the chunk and stacked;
+  * the main.rank_df score: its linear part is W @ F.T, with the spec terms
+    of scoring.features per phone in F and one row of scoring.weights per
+    intent in W, plus the weighted over/under-budget term broadcast from the
+    budgets.
+
+Each intent then takes its best k rows (ties to newer phones, one per Slug),
+as unique_topn(rank_df(...)) would.
+"""
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+import scoring
+
+MAX_CELLS = 4_000_000       # intents x phones evaluated per chunk
+
+MINIMUMS = (("min_battery", "Battery_mAh"), ("min_ram", "RAM_GB"),
+            ("min_storage", "Storage_GB"), ("min_camera", "MainCameraMP"))
+
+def _col(df: pd.DataFrame, c: str) -> np.ndarray:
+    return pd.to_numeric(df[c], errors="coerce").to_numpy(dtype=float)
+
+def _limits(intents: List[dict], key: str) -> np.ndarray:
+    return np.array([np.nan if it.get(key) is None else float(it[key]) for it in intents])
+
+def _at_least(x: np.ndarray, t: np.ndarray) -> np.ndarray:
+    """x >= t per (intent, phone); unknown values and unset limits pass."""
+    return np.isnan(t)[:, None] | np.isnan(x)[None, :] | (x[None, :] >= t[:, None])
+
+class BatchScorer:
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self.n = len(df)
+        self.price = _col(df, "PriceUSD")
+        self.priced = (self.price == self.price) & (self.price > 0)
+        self.year = _col(df, "ReleaseYear")
+        self.display = _col(df, "DisplayInches")
+        self.spec = {c: _col(df, c) for _, c in MINIMUMS}
+
+        self.F = scoring.features(df)
+
+        self.os = df["OS"].astype(str).str.lower()
+        self.brand_codes, brands = pd.factorize(df["Brand"].astype(str).str.lower())
+        self.brand_ids = {b: i for i, b in enumerate(brands)}
+        self.features = df["NotableFeatures"].astype(str).str.lower()
+        self.slug_codes = pd.factorize(df["Slug"].astype(str))[0]
+
+    def _brand_ids(self, brands) -> tuple:
+        return tuple(sorted(self.brand_ids[b] for b in {str(x).lower() for x in brands if x} if b in self.brand_ids))
+
+    def _category_row(self, it: dict, memo: Dict[tuple, np.ndarray]) -> np.ndarray:
+        """OS, brand and must-have rules of one intent, from rows memoized in `memo`."""
+        def row(key, build):
+            m = memo.get(key)
+            if m is None:
+                m = memo[key] = build()
+            return m
+
+        ok = np.ones(self.n, dtype=bool)
+        if it.get("os"):
+            s = str(it["os"]).lower()
+            ok &= row(("os", s), lambda: self.os.str.contains(s, regex=False, na=False).to_numpy())
+        if it.get("brands"):
+            ids = self._brand_ids(it["brands"])
+            ok &= row(("brands", ids), lambda: np.isin(self.brand_codes, ids))
+        if it.get("avoid_brands"):
+            ids = self._brand_ids(it["avoid_brands"])
+            ok &= row(("avoid", ids), lambda: ~np.isin(self.brand_codes, ids))
+        for feat in it.get("must_have") or []:
+            token = str(feat).strip().lower()
+            ok &= row(("feature", token), lambda: self.features.str.contains(token, regex=False, na=False).to_numpy())
+        return ok
+
+    def mask(self, intents: List[dict]) -> np.ndarray:
+        """(intents x phones) candidates, as filter_df_by_intent + the strict budget gate."""
+        budget = _limits(intents, "budget")
+        budget[budget == 0] = np.nan    # no budget, as in _strict_budget_df and scores()
+        ok = np.isnan(budget)[:, None] | (self.priced[None, :] & (self.price[None, :] <= budget[:, None]))
+        ok &= _at_least(self.year, _limits(intents, "min_year"))
+        ok &= _at_least(-self.year, -_limits(intents, "max_year"))
+        small = np.array([it.get("prefer_small") is True for it in intents])
+        large = np.array([it.get("prefer_large") is True for it in intents]) & ~small
+        ok &= _at_least(-self.display, np.where(small, -6.2, np.nan))
+        ok &= _at_least(self.display, np.where(large, 6.7, np.nan))
+        for key, col in MINIMUMS:
+            ok &= _at_least(self.spec[col], _limits(intents, key))
+        # memoized per call, so per chunk: at most a few rows per intent, freed with the chunk
+        memo: Dict[tuple, np.ndarray] = {}
+        ok &= np.stack([self._category_row(it, memo) for it in intents])
+        return ok
+
+    def scores(self, intents: List[dict]) -> np.ndarray:
+        """(intents x phones) rank_df scores."""
+        ws = [scoring.weights(it) for it in intents]
+        s = np.stack([scoring.weight_vector(w) for w in ws]) @ self.F.T
+        budget = _limits(intents, "budget")
+        has = ~np.isnan(budget) & (budget != 0)
+        if has.any():
+            wb = np.array([w["budget"] for w in ws])[has][:, None]
+            s[has] += wb * scoring.budget_term(self.price[None, :], budget[has][:, None])
+        return s
+
+    def top(self, ok: np.ndarray, score: np.ndarray, k: int) -> List[int]:
+        """Best k row positions of one intent: score, then newer; one per Slug."""
+        n_ok = int(ok.sum())
+        s = np.where(ok, score, -np.inf)
+        m = k * 4
+        while True:
+            m = min(m, n_ok)
+            part = np.argpartition(-s, m - 1)[:m] if 0 < m < self.n else np.flatnonzero(ok)
+            part = part[np.lexsort((-np.nan_to_num(self.year[part], nan=-1), -s[part]))]
+            out, seen = [], set()
+            for i in part:
+                code = self.slug_codes[i]
+                if code in seen:
+                    continue
+                seen.add(code)
+                out.append(int(i))
+                if len(out) == k:
+                    break
+            if len(out) == k or m == n_ok:
+                return out
+            m *= 4
+
+    def run(self, intents: List[dict], k: int):
+        """Yield (intent position, candidate mask, [(row, score)]), scoring MAX_CELLS at a time."""
+        step = max(1, MAX_CELLS // max(1, self.n))
+        for lo in range(0, len(intents), step):
+            chunk = intents[lo:lo + step]
+            ok, score = self.mask(chunk), self.scores(chunk)
+            for j in range(len(chunk)):
+                rows = self.top(ok[j], score[j], k) if ok[j].any() else []
+                yield lo + j, ok[j], [(i, float(score[j, i])) for i in rows]
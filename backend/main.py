@@ -1,17 +1,32 @@
 from __future__ import annotations
 from config import PHONES_CSV, USE_LLM, ALLOW_SCRAPERS, DEMO_SEED
+import batch
+import metrics
+import profiling
+import scoring
+import search
+import similar
+import skyline
+from metrics import (STAGE_SECONDS, LLM_SECONDS, HTTP_SECONDS, RELAX_RUNGS, LLM_FALLBACKS,
+                     CACHE_REQUESTS, SESSIONS_CREATED, SESSIONS_ACTIVE, WARMUP_SECONDS)
 import random
 if DEMO_SEED:
     try: random.seed(int(DEMO_SEED))
     except: random.seed(42)
 
-import os, re, json, uuid, math
-from typing import Any, Dict, List, Optional, Tuple
+import os, re, json, uuid, math, threading, time, hashlib
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import urlencode
 
 import pandas as pd
-import requests           
+try:
+    import orjson  # optional: faster response encoding, stdlib json otherwise
+except ImportError:
+    orjson = None
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi import FastAPI
+from fastapi import FastAPI, Header, HTTPException, Query, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
 
 app = FastAPI()
 
@@ -42,6 +57,22 @@ CSV_PATH = os.getenv("PHONES_CSV", "data/processed/phones_clean.csv")
 USE_OLLAMA = os.getenv("USE_OLLAMA", "1") == "1"
 OLLAMA_URL = os.getenv("OLLAMA_URL", "http://127.0.0.1:11434")
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3.1:8b")  # good balance offline
+WIKI_API_URL = os.getenv("WIKI_API_URL", "https://en.wikipedia.org/w/api.php")
+
+# `requests` is only needed for LLM and image calls: import it on first use
+# (or during startup warmup) rather than at module import.
+_HTTP = None
+_HTTP_LOCK = threading.Lock()
+
+def _http():
+    """Shared requests.Session, so Ollama/Wikipedia calls reuse connections."""
+    global _HTTP
+    if _HTTP is None:
+        with _HTTP_LOCK:
+            if _HTTP is None:
+                import requests
+                _HTTP = requests.Session()
+    return _HTTP
 
 # =========================
 # FastAPI
@@ -57,27 +88,53 @@ app.add_middleware(
 # Session store
 # =========================
 SESSIONS: Dict[str, Dict[str, Any]] = {}
+SESSIONS_ACTIVE.set_function(lambda: len(SESSIONS))
 
 # =========================
 # Data loading
 # =========================
-_DF_CACHE: Optional[pd.DataFrame] = None
-
 EXPECTED_COLS = [
     "ID","Brand","Model","Slug","ReleaseYear","PriceUSD","DisplayInches",
     "Battery_mAh","RAM_GB","Storage_GB","MainCameraMP","OS","Weight_g",
     "NotableFeatures","SourceFiles"
 ]
 
-def load_df() -> pd.DataFrame:
-    global _DF_CACHE
-    if _DF_CACHE is not None:
-        return _DF_CACHE
-    if not os.path.exists(CSV_PATH):
-        _DF_CACHE = pd.DataFrame(columns=EXPECTED_COLS)
-        return _DF_CACHE
-
-    df = pd.read_csv(CSV_PATH, low_memory=False)
+# The catalog lives in one immutable snapshot. A reload builds a complete new
+# snapshot off to the side and swaps the reference in a single assignment, so
+# requests holding the old frame finish on it and new requests see the new one.
+# Anything derived from the catalog lives in `snapshot.derived` and moves with it.
+CATALOG_POLL_SECONDS = float(os.getenv("CATALOG_POLL_SECONDS", "30"))  # 0 = no watcher
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")  # unset = /admin endpoints disabled
+
+class CatalogSnapshot(NamedTuple):
+    version: str
+    df: pd.DataFrame
+    stat: Optional[Tuple[int, int]]  # (mtime_ns, size) of the CSV it was read from
+    derived: Dict[str, Any]
+
+_SNAPSHOT: Optional[CatalogSnapshot] = None
+_SNAPSHOT_LOCK = threading.Lock()
+_DERIVED_BUILDERS: Dict[str, Callable[[pd.DataFrame], Any]] = {}
+
+def _catalog_stat(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+        return (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return None
+
+def _catalog_hash(path: str) -> str:
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()[:12]
+
+def _read_catalog(path: str) -> pd.DataFrame:
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=EXPECTED_COLS)
+
+    df = pd.read_csv(path, low_memory=False)
     for c in EXPECTED_COLS:
         if c not in df.columns:
             df[c] = None
@@ -98,9 +155,113 @@ def load_df() -> pd.DataFrame:
     # strip strings
     for c in ["Brand","Model","OS","NotableFeatures","Slug"]:
         df[c] = df[c].astype(str).str.strip()
+    return df
+
+def _build_snapshot(path: str, version: Optional[str] = None) -> CatalogSnapshot:
+    """Read the CSV and pre-build every registered derived cache for it."""
+    stat = _catalog_stat(path)
+    if version is None:
+        version = _catalog_hash(path) if stat else "empty"
+    df = _read_catalog(path)
+    # frames filtered / sorted from this one keep the stamp (pandas propagates attrs),
+    # which is how frame_cached tells which snapshot a frame came from
+    df.attrs["catalog"] = version
+    derived: Dict[str, Any] = {}
+    for name, build in list(_DERIVED_BUILDERS.items()):
+        try:
+            derived[name] = build(df)
+        except Exception as e:
+            print(f"[catalog] derived '{name}' failed:", e)
+    return CatalogSnapshot(version, df, stat, derived)
+
+def catalog_snapshot() -> CatalogSnapshot:
+    global _SNAPSHOT
+    snap = _SNAPSHOT
+    if snap is not None:
+        return snap
+    with _SNAPSHOT_LOCK:
+        if _SNAPSHOT is None:
+            _SNAPSHOT = _build_snapshot(CSV_PATH)
+        return _SNAPSHOT
+
+def catalog_version() -> str:
+    return catalog_snapshot().version
+
+def catalog_cached(name: str, build: Callable[[pd.DataFrame], Any]) -> Any:
+    """
+    Per-snapshot cache for anything computed from the catalog (indexes, matrices...).
+    The builder is remembered so the next reload builds it before the swap.
+    """
+    _DERIVED_BUILDERS.setdefault(name, build)
+    return _snapshot_cached(catalog_snapshot(), name, build)
+
+def _snapshot_cached(snap: CatalogSnapshot, name: str, build: Callable[[pd.DataFrame], Any]) -> Any:
+    if name not in snap.derived:
+        CACHE_REQUESTS.inc(cache=name, result="miss")
+        snap.derived[name] = build(snap.df)
+    else:
+        CACHE_REQUESTS.inc(cache=name, result="hit")
+    return snap.derived[name]
+
+def frame_cached(d: pd.DataFrame, name: str, build: Callable[[pd.DataFrame], Any]) -> Optional[Any]:
+    """
+    catalog_cached for a frame taken from the catalog earlier in the request:
+    the cache of the snapshot it came from, or None once that snapshot has been
+    replaced. Row labels are positions (0..n) in every snapshot, so after a
+    reload the same label is usually a different phone.
+    """
+    _DERIVED_BUILDERS.setdefault(name, build)
+    snap = catalog_snapshot()
+    if d.attrs.get("catalog") != snap.version:
+        return None
+    return _snapshot_cached(snap, name, build)
+
+def reload_catalog(force: bool = False) -> bool:
+    """
+    Swap in a fresh snapshot if the CSV changed (or `force`). Returns True if swapped.
+    On read errors the current snapshot stays in place.
+    """
+    global _SNAPSHOT
+    with _SNAPSHOT_LOCK:
+        cur = _SNAPSHOT
+        stat = _catalog_stat(CSV_PATH)
+        if not force and cur is not None and stat == cur.stat:
+            return False
+        version = _catalog_hash(CSV_PATH) if stat else "empty"
+        if not force and cur is not None and version == cur.version:
+            # touched but identical: remember the new stat, keep everything else
+            _SNAPSHOT = cur._replace(stat=stat)
+            return False
+        try:
+            snap = _build_snapshot(CSV_PATH, version)
+        except Exception as e:
+            print("[catalog] reload failed, keeping", cur.version if cur else None, "-", e)
+            return False
+        _SNAPSHOT = snap
+    print(f"[catalog] now serving {snap.version} ({len(snap.df)} rows)")
+    return True
+
+def _catalog_watcher(interval: float) -> None:
+    # Only reload once the file has stopped changing for a full interval,
+    # so a CSV that is still being written is never picked up half-way.
+    pending = None
+    while True:
+        time.sleep(interval)
+        try:
+            stat = _catalog_stat(CSV_PATH)
+            snap = _SNAPSHOT
+            if snap is None or stat == snap.stat:
+                pending = None
+            elif stat != pending:
+                pending = stat
+            else:
+                pending = None
+                reload_catalog()
+        except Exception as e:
+            print("[catalog] watcher:", e)
 
-    _DF_CACHE = df
-    return _DF_CACHE
+def load_df() -> pd.DataFrame:
+    return catalog_snapshot().df
 
 def _price_fallback(row: pd.Series) -> Optional[float]:
     """Simple heuristic if dataset price missing."""
@@ -145,6 +306,30 @@ class ChatMessageResp(BaseModel):
     picks: Optional[List[dict]] = None
     count: int = 0
     ui: Optional[dict] = None  # control hints
+    cursor: Optional[str] = None  # next page of these results (/chat/results)
+
+CHAT_RESP_DEFAULTS = {"ask": None, "picks": None, "count": 0, "ui": None, "cursor": None}
+
+def _chat_resp(**kw) -> dict:
+    """A ChatMessageResp body as a plain dict: the cards are already clean, so no pydantic round trip."""
+    return dict(CHAT_RESP_DEFAULTS, **kw)
+
+def _json_default(o):
+    if hasattr(o, "item"):  # numpy / pandas scalars
+        return o.item()
+    return str(o)
+
+def dumps_json(content) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, default=_json_default,
+                            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=_json_default).encode("utf-8")
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse written by dumps_json (orjson when installed)."""
+    def render(self, content) -> bytes:
+        with STAGE_SECONDS.time(stage="serialize"):
+            return dumps_json(content)
 
 # =========================
 # Intent helpers
@@ -164,6 +349,9 @@ DEFAULT_INTENT: Dict[str, Any] = {
     "min_year": 2018,
     "max_year": None,
     "camera_priority": None,  # True/False
+    "rank_mode": None,  # None (score) | "value" (Pareto skyline first)
+    "preset": None,  # scoring.PRESETS name; None = "balanced"
+    "weights": None,  # per-term overrides, e.g. {"battery": 2.0}
 }
 
 SLOTS = [
@@ -188,6 +376,7 @@ NON_TECH_HINTS = {
     "min_ram": {"type":"segmented", "options":["No preference","6 GB","8 GB","12 GB"]},
     "min_storage": {"type":"segmented", "options":["No preference","128 GB","256 GB","512 GB"]},
     "camera_priority": {"type":"segmented", "options":["No preference","Yes","No"]},
+    "preset": {"type":"segmented", "options":["No preference"] + list(scoring.PRESETS)},
 }
 
 SKIP_PAT = re.compile(r"\b(skip|none|no preference|idk|don'?t know)\b", re.I)
@@ -236,33 +425,37 @@ def _blurb_for_row(intent: dict, row: pd.Series) -> str | None:
     return None
 
 
-def _direct_results_response(session_id: str, intent: dict, skipped: set | None = None) -> ChatMessageResp:
-    """Build results strictly from current intent with budget hard-guard and a personalized blurb."""
-    skipped = skipped or set()
-
+def _direct_candidates(intent: dict, base: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """Candidates for the direct-results path: strict filter, then OS-only, then newest; budget always enforced.
+    Every step reads the same catalog frame (`base`, default one safe_df()), so a reload mid-request cannot mix snapshots."""
+    base = safe_df() if base is None else base
     # 1) strict filter (your filter_df_by_intent already respects budget)
-    d = filter_df_by_intent(safe_df(), intent)
+    d = filter_df_by_intent(base, intent)
     d = _strict_budget_df(d, intent.get("budget"))
 
     # 2) if empty and OS set, keep OS only (but still apply budget!)
     if d.empty and intent.get("os"):
         os_only = {"os": intent["os"], "min_year": intent.get("min_year") or 2018}
-        d = filter_df_by_intent(safe_df(), os_only)
+        d = filter_df_by_intent(base, os_only)
         d = _strict_budget_df(d, intent.get("budget"))
 
     # 3) final fallback: newest → cheapest, BUT still apply budget guard
     if d.empty:
-        d = safe_df().sort_values(["ReleaseYear", "PriceUSD"], ascending=[False, True], na_position="last")
+        d = base.sort_values(["ReleaseYear", "PriceUSD"], ascending=[False, True], na_position="last")
         d = _strict_budget_df(d, intent.get("budget"))
+    return d
 
-    count = int(len(d))
-
-    # rank + build (cap to 3)
+def _direct_rank(intent: dict, base: Optional[pd.DataFrame] = None) -> tuple[pd.DataFrame, int, dict]:
+    """(ranked candidates, count, ranked order); the full order is kept for /chat/results."""
+    d = _direct_candidates(intent, base)
     ranked = rank_df(d, intent)
-    picks = _build_picks_from_df(ranked.head(30), intent)
-    picks = _strict_budget_picks(picks, intent.get("budget"))[:3]
+    return ranked, int(len(d)), _ranked_results(intent, ranked)
 
-    # blurb
+def _direct_picks(ranked: pd.DataFrame, intent: dict) -> list[dict]:
+    picks = _build_picks_from_df(ranked.head(30), intent, already_ranked=True)
+    return _strict_budget_picks(picks, intent.get("budget"))[:3]
+
+def _direct_blurb(ranked: pd.DataFrame, picks: list[dict], intent: dict) -> Optional[str]:
     ask = None
     try:
         if not ranked.empty:
@@ -272,17 +465,31 @@ def _direct_results_response(session_id: str, intent: dict, skipped: set | None
     if not ask and picks:
         top = picks[0]
         ask = f"I’d start with {top['Brand']} {top['Model']} — strong match for what you asked."
+    return ask
+
+def _direct_results(intent: dict, base: Optional[pd.DataFrame] = None) -> tuple[Optional[str], list[dict], int, dict]:
+    """(blurb, picks, count, ranked order) strictly from the intent (and catalog frame `base`);
+    no session involved. The stages are separate so /chat/ws can push each part as soon as it is ready."""
+    ranked, count, results = _direct_rank(intent, base)
+    picks = _direct_picks(ranked, intent)
+    return _direct_blurb(ranked, picks, intent), picks, count, results
+
+def _direct_results_response(session_id: str, intent: dict, skipped: set | None = None) -> dict:
+    """Build results strictly from current intent with budget hard-guard and a personalized blurb."""
+    skipped = skipped or set()
+    ask, picks, count, results = _direct_results(intent)
 
     # save
-    SESSIONS[session_id] = {"intent": intent, "ask_key": None, "skipped": skipped}
+    SESSIONS[session_id] = {"intent": intent, "ask_key": None, "skipped": skipped, "results": results}
 
-    return ChatMessageResp(
+    return _chat_resp(
         session_id=session_id,
         intent=intent,
         ask=ask,
         picks=picks,
         count=count,
         ui=ui_config(),
+        cursor=_results_cursor(results, len(picks)),
     )
 
 
@@ -314,14 +521,15 @@ def _sanitize_conflicts(intent: dict) -> dict:
     return out
 
 
-def candidates_multi(intent: dict) -> tuple[pd.DataFrame, dict, str]:
+@STAGE_SECONDS.time(stage="candidates")
+def candidates_multi(intent: dict, df_all: Optional[pd.DataFrame] = None) -> tuple[pd.DataFrame, dict, str]:
     """
     Progressive selection so final picks never end at 0:
     strict budget -> soft budget -> drop must-have -> budget +15% -> drop size ->
     relax minimums -> drop budget (penalize later) -> fallback newest.
     Returns (df, possibly_modified_intent, note).
     """
-    df_all = safe_df()
+    df_all = safe_df() if df_all is None else df_all
     i0 = dict(intent)
 
     def filt(i: dict, strict: bool) -> pd.DataFrame:
@@ -409,28 +617,36 @@ def candidates_multi(intent: dict) -> tuple[pd.DataFrame, dict, str]:
     base = df_all.sort_values(["ReleaseYear","PriceUSD"], ascending=[False, True], na_position="last")
     return base.head(30), i0, "fallback newest"
 
-def _build_picks_from_df(d: pd.DataFrame, intent: dict) -> list[dict]:
+@STAGE_SECONDS.time(stage="build_picks")
+def _build_picks_from_df(d: pd.DataFrame, intent: dict, top: int = 6, already_ranked: bool = False) -> list[dict]:
     """
     Non-invasive builder with local brand/phone assets + remote image + pros/cons.
-    Keeps the same signature so existing call sites don't change.
+    Keeps the same signature so existing call sites don't change; pass
+    already_ranked=True when `d` is already in final order (rank_df output, a results page).
     """
     picks: list[dict] = []
     if d is None or d.empty:
         return picks
 
     # Rank + dedupe like before
-    try:
-        ranked = rank_df(d, intent)
-    except Exception as e:
-        print("[rank_df] failed:", e)
+    if already_ranked:
         ranked = d
+    else:
+        try:
+            ranked = rank_df(d, intent)
+        except Exception as e:
+            print("[rank_df] failed:", e)
+            ranked = d
     try:
-        ranked = unique_topn(ranked, 6)  # show a few more; UI will cut as needed
+        ranked = unique_topn(ranked, top)  # show a few more; UI will cut as needed
     except Exception as e:
         print("[unique_topn] failed:", e)
-        ranked = ranked.head(6)
+        ranked = ranked.head(top)
+
+    cards = frame_cached(ranked, "phone_cards", PhoneCards)
+    for label, row in ranked.iterrows():
+        card = _static_card(cards, label, row)
 
-    for _, row in ranked.iterrows():
         # --- Remote image (best-effort) ---
         image_url = None
         try:
@@ -438,30 +654,6 @@ def _build_picks_from_df(d: pd.DataFrame, intent: dict) -> list[dict]:
         except Exception as e:
             print("[image] fetch_phone_image_url failed:", e)
 
-        # --- Local offline assets (public/phones, public/brands) ---
-        brand = (row.get("Brand") or "").strip()
-        model = (row.get("Model") or "").strip()
-        slug = row.get("Slug")
-
-        # guard NaN slugs
-        try:
-            is_nan_slug = pd.isna(slug)
-        except Exception:
-            is_nan_slug = False
-
-        if not slug or is_nan_slug or str(slug).lower() == "nan":
-            slug = _slugify(f"{brand}-{model}")
-
-        # /phones/<slug>.jpg|png
-        phone_local = (
-            _public_url_if_exists(f"/phones/{slug}.jpg")
-            or _public_url_if_exists(f"/phones/{slug}.png")
-        )
-
-        # /brands/<brand>.png  (expects lowercase + underscores)
-        brand_key = brand.lower().replace(" ", "_")
-        brand_logo = _public_url_if_exists(f"/brands/{brand_key}.png")
-
         # --- Pros/Cons via LLM (safe fallback) ---
         pros, cons = [], []
         try:
@@ -474,35 +666,14 @@ def _build_picks_from_df(d: pd.DataFrame, intent: dict) -> list[dict]:
         except Exception as e:
             print("[pros/cons-filter] failed:", e)
 
-        # safe numeric coercion
-        def fnum(x, cast):
-            try:
-                return cast(x) if pd.notna(x) else None
-            except Exception:
-                return None
-
-        picks.append({
-            "Brand": row.get("Brand"),
-            "Model": row.get("Model"),
-            "ReleaseYear": fnum(row.get("ReleaseYear"), int) or 0,
-            "PriceUSD": fnum(row.get("PriceUSD"), float) or 0.0,
-            "DisplayInches": fnum(row.get("DisplayInches"), float),
-            "Battery_mAh": fnum(row.get("Battery_mAh"), int),
-            "RAM_GB": fnum(row.get("RAM_GB"), float),
-            "Storage_GB": fnum(row.get("Storage_GB"), float),
-            "MainCameraMP": fnum(row.get("MainCameraMP"), float),
-            "OS": row.get("OS"),
-            "Weight_g": fnum(row.get("Weight_g"), float),
-            "NotableFeatures": row.get("NotableFeatures"),
-
-            # Images (frontend prefers Local → URL → Logo)
-            "ImageLocal": phone_local,
+        # static card (frontend prefers ImageLocal → ImageURL → BrandLogo) + per-request fields
+        card.update({
+            "BestValue": bool(row.get("_best_value", False)),
             "ImageURL": image_url,
-            "BrandLogo": brand_logo,
-
             "Pros": pros,
             "Cons": cons,
         })
+        picks.append(card)
 
     return picks
 
@@ -512,9 +683,13 @@ def _slugify(s: str) -> str:
     return s.strip("-")
 
 def _public_exists(rel: str) -> bool:
+    # Indexed dirs (phones/, brands/) are a set lookup; anything else is probed on disk
+    rel = (rel or "").replace("\\", "/").lstrip("/")
+    if rel.split("/", 1)[0] in PUBLIC_INDEX_DIRS:
+        return rel in _public_index()
     # Check typical dev paths for vite public assets
     for base in ["frontend/public", "public"]:
-        if os.path.exists(os.path.join(base, rel.lstrip("/"))):
+        if os.path.exists(os.path.join(base, rel)):
             return True
     return False
 
@@ -526,10 +701,63 @@ PUBLIC_DIR = os.path.normpath(
     os.path.join(os.path.dirname(__file__), "..", "frontend", "public")
 )
 
+# In-memory index of the asset dirs the card builders probe for every pick.
+# Rebuilt when a directory mtime changes; mtimes are re-checked at most every
+# PUBLIC_INDEX_TTL seconds so the hot path is a set lookup, not a stat.
+PUBLIC_INDEX_DIRS = ("phones", "brands")
+PUBLIC_INDEX_TTL = float(os.getenv("PUBLIC_INDEX_TTL", "30"))
+
+_PUBLIC_INDEX: frozenset = frozenset()
+_PUBLIC_INDEX_MTIMES: Dict[str, Optional[float]] = {}
+_PUBLIC_INDEX_CHECKED = float("-inf")  # the first call always scans
+_PUBLIC_INDEX_LOCK = threading.Lock()
+
+def _public_dir_mtimes() -> Dict[str, Optional[float]]:
+    out: Dict[str, Optional[float]] = {}
+    for d in PUBLIC_INDEX_DIRS:
+        try:
+            out[d] = os.stat(os.path.join(PUBLIC_DIR, d)).st_mtime
+        except OSError:
+            out[d] = None
+    return out
+
+def _scan_public_index() -> frozenset:
+    """Collect '<dir>/<file>' for every file directly under the indexed public dirs."""
+    found = set()
+    for d in PUBLIC_INDEX_DIRS:
+        try:
+            with os.scandir(os.path.join(PUBLIC_DIR, d)) as it:
+                for entry in it:
+                    if entry.is_file():
+                        found.add(f"{d}/{entry.name}")
+        except OSError:
+            continue
+    return frozenset(found)
+
+def refresh_public_index(force: bool = False) -> frozenset:
+    """Rescan the indexed dirs if forced or if any of their mtimes moved."""
+    global _PUBLIC_INDEX, _PUBLIC_INDEX_MTIMES, _PUBLIC_INDEX_CHECKED
+    with _PUBLIC_INDEX_LOCK:
+        mtimes = _public_dir_mtimes()
+        if force or mtimes != _PUBLIC_INDEX_MTIMES:
+            CACHE_REQUESTS.inc(cache="public_index", result="miss")
+            _PUBLIC_INDEX = _scan_public_index()
+            _PUBLIC_INDEX_MTIMES = mtimes
+        _PUBLIC_INDEX_CHECKED = time.monotonic()
+        return _PUBLIC_INDEX
+
+def _public_index() -> frozenset:
+    if time.monotonic() - _PUBLIC_INDEX_CHECKED >= PUBLIC_INDEX_TTL:
+        return refresh_public_index()
+    CACHE_REQUESTS.inc(cache="public_index", result="hit")
+    return _PUBLIC_INDEX
+
 def _public_url_if_exists(rel_path: str):
     """If file exists under frontend/public/<rel>, return '/<rel>' for the frontend to load; else None."""
     try:
         rel = (rel_path or "").replace("\\", "/").lstrip("/")      # 'brands/apple.png'
+        if rel.split("/", 1)[0] in PUBLIC_INDEX_DIRS:
+            return f"/{rel}" if rel in _public_index() else None
         fs_path = os.path.join(PUBLIC_DIR, *rel.split("/"))        # -> .../frontend/public/brands/apple.png
         if os.path.exists(fs_path):
             return f"/{rel}"                                       # frontend can load this directly
@@ -543,7 +771,70 @@ def _slugify(s: str) -> str:
     return s.strip("-")
 # === End: public path helpers ===
 
+# =========================
+# Pick cards (static part)
+# =========================
+# Everything on a pick card that only depends on the phone (coerced specs,
+# slug, local image, brand logo) is built once per catalog snapshot for every
+# row, column by column. A request copies the card and adds the remote image,
+# BestValue and the intent-dependent pros/cons. Local asset URLs follow the
+# public index, so they are re-resolved in bulk whenever it is rescanned.
+CARD_NUMBERS = [  # (column, cast, value when unknown)
+    ("ReleaseYear", int, 0), ("PriceUSD", float, 0.0), ("DisplayInches", float, None),
+    ("Battery_mAh", int, None), ("RAM_GB", float, None), ("Storage_GB", float, None),
+    ("MainCameraMP", float, None), ("Weight_g", float, None),
+]
 
+class PhoneCards:
+    def __init__(self, df: pd.DataFrame):
+        brand, model = df["Brand"].tolist(), df["Model"].tolist()
+        self.slugs = [
+            s if isinstance(s, str) and s and s.lower() != "nan"
+            else _slugify(f"{str(b or '').strip()}-{str(m or '').strip()}")
+            for b, m, s in zip(brand, model, df["Slug"].tolist())
+        ]
+        self.brand_keys = [str(b or "").strip().lower().replace(" ", "_") for b in brand]
+        cols = {"Brand": brand, "Model": model, "OS": df["OS"].tolist(),
+                "NotableFeatures": df["NotableFeatures"].tolist(), "Slug": self.slugs}
+        for c, cast, unknown in CARD_NUMBERS:
+            v = pd.to_numeric(df[c], errors="coerce").astype(float).tolist()
+            cols[c] = [cast(x) if x == x else unknown for x in v]
+        keys = list(cols)
+        self.labels = list(df.index)
+        self.static = dict(zip(self.labels, (dict(zip(keys, vals)) for vals in zip(*cols.values()))))
+        self._assets: Tuple[Optional[frozenset], Dict[Any, dict]] = (None, {})
+
+    def _resolve_assets(self, index: frozenset) -> Dict[Any, dict]:
+        def local(slug):
+            for ext in ("jpg", "png"):
+                if f"phones/{slug}.{ext}" in index:
+                    return f"/phones/{slug}.{ext}"
+            return None
+        assets = {label: {"ImageLocal": local(slug),
+                          "BrandLogo": f"/brands/{key}.png" if f"brands/{key}.png" in index else None}
+                  for label, slug, key in zip(self.labels, self.slugs, self.brand_keys)}
+        self._assets = (index, assets)
+        return assets
+
+    def card(self, label, model=None) -> Optional[dict]:
+        """A copy of the static card for a row id; None if the id (or its Model) is not in this snapshot."""
+        base = self.static.get(label)
+        if base is None or (model is not None and base["Model"] != model):
+            return None
+        index = _public_index()
+        seen, assets = self._assets
+        if seen is not index:
+            assets = self._resolve_assets(index)
+        return dict(base, **assets[label])
+
+def phone_cards() -> PhoneCards:
+    """Static pick cards by row id; built with each catalog snapshot."""
+    return catalog_cached("phone_cards", PhoneCards)
+
+def _static_card(cards: Optional[PhoneCards], label, row: pd.Series) -> dict:
+    """`cards` is frame_cached(ranked, "phone_cards", ...): None once the frame's
+    snapshot has been replaced, and then the card is built from the row itself."""
+    return (cards.card(label) if cards is not None else None) or PhoneCards(row.to_frame().T).card(label)
 
 STATIC_GLOSSARY = {
     "ram": "Memory for running apps. More RAM helps with smooth multitasking.",
@@ -639,20 +930,24 @@ def attach_explanations(intent: dict, row: pd.Series, pros: list[str], cons: lis
 # =========================
 # LLM extraction (JSON)
 # =========================
-def _ollama_generate_json(prompt: str, options: dict | None = None) -> Optional[dict]:
+def _ollama_generate_json(prompt: str, options: dict | None = None, call: str = "json") -> Optional[dict]:
     if not USE_OLLAMA:
         return None
+    t0 = time.perf_counter()
     try:
         payload = {
             "model": OLLAMA_MODEL, "prompt": prompt,
             "stream": False, "format": "json"
         }
         if options: payload["options"] = options
-        r = requests.post(f"{OLLAMA_URL}/api/generate", json=payload, timeout=30)
+        r = _http().post(f"{OLLAMA_URL}/api/generate", json=payload, timeout=30)
         r.raise_for_status()
         raw = (r.json().get("response") or "{}").strip()
-        return json.loads(raw)
+        out = json.loads(raw)
+        LLM_SECONDS.observe(time.perf_counter() - t0, call=call, outcome="ok")
+        return out
     except Exception:
+        LLM_SECONDS.observe(time.perf_counter() - t0, call=call, outcome="error")
         return None
 
 INTENT_SCHEMA = {
@@ -673,9 +968,12 @@ INTENT_SCHEMA = {
         "min_year":{"type":["integer","null"]},
         "max_year":{"type":["integer","null"]},
         "camera_priority":{"type":["boolean","null"]},
+        "rank_mode":{"type":["string","null"], "enum":["value", None]},
+        "preset":{"type":["string","null"], "enum":list(scoring.PRESETS) + [None]},
     }
 }
 
+@STAGE_SECONDS.time(stage="intent_ai")
 def ai_extract_intent(text: str) -> dict:
     """Robust AI intent extraction with schema; returns {} on failure."""
     if not text:
@@ -690,10 +988,13 @@ def ai_extract_intent(text: str) -> dict:
         "- prefer_small true if compact/small (~6.1\"); prefer_large true if large/big (~6.7\"); else null.\n"
         "- must_have: subset of ['5G','wireless charging','IP68','eSIM'] if mentioned.\n"
         "- brands / avoid_brands from the message.\n"
+        "- rank_mode: 'value' if they ask for best value / bang for the buck, else null.\n"
+        "- preset: 'battery-first', 'camera-first', 'performance' or 'budget-first' if one clearly matters most, else null.\n"
         "- Do not invent values. Unstated -> null/empty."
     )
-    j = _ollama_generate_json(sys + "\n\nUser: " + text + "\n\nJSON:", options={"temperature":0.1})
+    j = _ollama_generate_json(sys + "\n\nUser: " + text + "\n\nJSON:", options={"temperature":0.1}, call="extract")
     if not isinstance(j, dict):
+        if USE_OLLAMA: LLM_FALLBACKS.inc(call="extract")
         return {}
     # clean up booleans
     if j.get("prefer_small") and j.get("prefer_large"):
@@ -722,6 +1023,7 @@ BUDGET_PATTS = [
     re.compile(r"\$?\s*(\d{2,5})\s*(?:usd|dollars|\$)?\b", re.I),
 ]
 
+@STAGE_SECONDS.time(stage="intent_rules")
 def rule_extract_intent(text: str) -> dict:
     t = (text or "").lower()
     out: Dict[str, Any] = {}
@@ -767,8 +1069,16 @@ def rule_extract_intent(text: str) -> dict:
         if re.search(rf"\b(avoid|no)\s+{re.escape(b)}\b", t): avoids.append(b.title())
     if likes: out["brands"] = sorted(set(likes))
     if avoids: out["avoid_brands"] = sorted(set(avoids))
+
+    # ranking mode / weight preset
+    if re.search(r"\b(best value|value for money|bang for (?:the|your|my) buck)\b", t):
+        out["rank_mode"] = "value"
+    if re.search(r"\b(battery[- ]first|longest battery)\b", t): out["preset"] = "battery-first"
+    elif re.search(r"\b(camera[- ]first|best camera)\b", t): out["preset"] = "camera-first"
+    elif re.search(r"\b(performance[- ]first|gaming|fastest)\b", t): out["preset"] = "performance"
     return out
 
+@STAGE_SECONDS.time(stage="normalize_intent")
 def normalize_intent(d: dict) -> dict:
     out = dict(DEFAULT_INTENT)
     out.update({k:v for k,v in d.items() if v is not None})
@@ -795,6 +1105,9 @@ def normalize_intent(d: dict) -> dict:
     out["prefer_small"] = to_bool(out.get("prefer_small"))
     out["prefer_large"] = to_bool(out.get("prefer_large"))
     out["camera_priority"] = to_bool(out.get("camera_priority"))
+    out["rank_mode"] = "value" if str(out.get("rank_mode") or "").strip().lower() == "value" else None
+    out["preset"] = scoring.preset_name(out.get("preset"))
+    out["weights"] = scoring.normalize_weights(out.get("weights"))
 
     # arrays
     def to_list(x, title=False):
@@ -824,11 +1137,12 @@ def normalize_intent(d: dict) -> dict:
 # Filtering / ranking
 # =========================
 # change the signature (add strict_budget + compact_max)
+@STAGE_SECONDS.time(stage="filter")
 def filter_df_by_intent(df: pd.DataFrame, intent: Dict[str, Any], strict_budget: bool = False) -> pd.DataFrame:
     d = df.copy()
 
     # --- Budget ---
-    if intent.get("budget") is not None and "PriceUSD" in d.columns:
+    if intent.get("budget") not in (None, "", 0) and "PriceUSD" in d.columns:  # 0 = no budget
         try:
             budget = float(intent["budget"])
         except (TypeError, ValueError):
@@ -925,19 +1239,40 @@ def filter_df_by_intent(df: pd.DataFrame, intent: Dict[str, Any], strict_budget:
 
 
 
+VALUE_POOL = 2000        # rows peeled into Pareto layers in value mode
+VALUE_LAYER_ROWS = 30    # stop peeling once this many rows have a layer
+
+@STAGE_SECONDS.time(stage="rank")
 def rank_df(d: pd.DataFrame, intent: Dict[str, Any]) -> pd.DataFrame:
     if d.empty: return d
-    score = (
-        (d["ReleaseYear"].fillna(2018) - 2017) * 1.0
-        + (d["Battery_mAh"].fillna(3000) / 1000.0) * 0.8
-        + (d["MainCameraMP"].fillna(12) / 12.0) * (1.0 if intent.get("camera_priority") else 0.4)
-        + (d["RAM_GB"].fillna(4) / 4.0) * 0.3
-        + (d["Storage_GB"].fillna(64) / 64.0) * 0.3
-    )
+    # spec terms are precomputed per snapshot: the preset / custom weights cost one product
+    w = scoring.weights(intent)
+    fm = frame_cached(d, "score_features", scoring.FeatureMatrix)
+    score = (fm.rows(d) if fm is not None else scoring.features(d)) @ scoring.weight_vector(w)
     if intent.get("budget"):
-        price = d["PriceUSD"].fillna(intent["budget"])
-        score += (intent["budget"] - price).clip(lower=-999, upper=500) / 500.0
-    return d.assign(_score=score).sort_values(["_score","ReleaseYear"], ascending=[False, False])
+        score += w["budget"] * scoring.budget_term(d["PriceUSD"].to_numpy(dtype=float), float(intent["budget"]))
+    score = pd.Series(score, index=d.index)
+    # on the catalog skyline of its OS family: nothing cheaper matches it on every spec
+    best = _best_value_flags(d)
+    d = d.assign(_score=score, _best_value=best)
+    if intent.get("rank_mode") != "value":
+        return d.sort_values(["_score","ReleaseYear"], ascending=[False, False])
+
+    # value mode: Pareto layers of the candidates first, score within a layer.
+    # Layers are peeled over the best-scoring rows plus the catalog skyline ones,
+    # which keeps a broad candidate set (tens of thousands of rows) cheap.
+    pool = d if len(d) <= VALUE_POOL else d.loc[score.nlargest(VALUE_POOL).index.union(d.index[best.to_numpy()])]
+    layer = pd.Series(skyline.pareto_layers(pool, VALUE_LAYER_ROWS), index=pool.index)
+    d = d.assign(_pareto=layer.reindex(d.index, fill_value=float("inf")))
+    return d.sort_values(["_pareto","_score","ReleaseYear"], ascending=[True, False, False])
+
+def _best_value_flags(d: pd.DataFrame) -> pd.Series:
+    # the flag is relative to the whole catalog d was taken from; once that
+    # snapshot is replaced there is nothing to look it up in, so no flags
+    sky = frame_cached(d, "skyline_index", skyline.SkylineIndex)
+    if sky is None:
+        return pd.Series(False, index=d.index)
+    return sky.flag.reindex(d.index, fill_value=False).astype(bool)
 
 def unique_topn(df: pd.DataFrame, n: int = 3) -> pd.DataFrame:
     if df.empty: return df
@@ -950,10 +1285,11 @@ def unique_topn(df: pd.DataFrame, n: int = 3) -> pd.DataFrame:
 # =========================
 # Image fetch (Wikipedia)
 # =========================
+@STAGE_SECONDS.time(stage="image_lookup")
 def fetch_phone_image_url(brand: str, model: str) -> Optional[str]:
     try:
         title = f"{brand} {model}".strip()
-        r = requests.get("https://en.wikipedia.org/w/api.php", params={
+        r = _http().get(WIKI_API_URL, params={
             "action":"query","prop":"pageimages","format":"json","pithumbsize":"640","titles":title
         }, timeout=10)
         thumb = None
@@ -968,17 +1304,21 @@ def fetch_phone_image_url(brand: str, model: str) -> Optional[str]:
 # =========================
 # LLM pros/cons + blurb
 # =========================
-def _ollama_text(prompt: str, temp=0.25) -> Optional[str]:
+def _ollama_text(prompt: str, temp=0.25, call: str = "text") -> Optional[str]:
     if not USE_OLLAMA:
         return None
+    t0 = time.perf_counter()
     try:
-        r = requests.post(f"{OLLAMA_URL}/api/generate", json={
+        r = _http().post(f"{OLLAMA_URL}/api/generate", json={
             "model": OLLAMA_MODEL, "prompt": prompt, "stream": False,
             "options":{"temperature": temp}
         }, timeout=30)
         r.raise_for_status()
-        return (r.json().get("response") or "").strip()
+        out = (r.json().get("response") or "").strip()
+        LLM_SECONDS.observe(time.perf_counter() - t0, call=call, outcome="ok")
+        return out
     except Exception:
+        LLM_SECONDS.observe(time.perf_counter() - t0, call=call, outcome="error")
         return None
 
 def _compose_blurb(intent: dict, row: pd.Series) -> Optional[str]:
@@ -1041,12 +1381,13 @@ def _compose_blurb(intent: dict, row: pd.Series) -> Optional[str]:
                 f"Phone facts:\n{json.dumps(facts, ensure_ascii=False)}\n\n"
                 "Answer:"
             )
-            txt = _ollama_text(prompt, temp=0.25) or ""
+            txt = _ollama_text(prompt, temp=0.25, call="blurb") or ""
             txt = re.sub(r"\s+", " ", txt).strip()
             if txt:
                 return txt[:500]
         except Exception:
             pass
+        LLM_FALLBACKS.inc(call="blurb")
 
     # --- Heuristic fallback (no LLM) ---
     lines = []
@@ -1111,7 +1452,7 @@ def llm_pros_cons(intent: dict, row: pd.Series) -> Tuple[List[str], List[str]]:
             "NotableFeatures": row.get("NotableFeatures"),
         }, ensure_ascii=False) + "\nJSON:"
     )
-    txt = _ollama_text(prompt, temp=0.2)
+    txt = _ollama_text(prompt, temp=0.2, call="pros_cons")
     if txt:
         try:
             j = json.loads(txt)
@@ -1122,6 +1463,7 @@ def llm_pros_cons(intent: dict, row: pd.Series) -> Tuple[List[str], List[str]]:
         except Exception:
             pass
     # fallback heuristics
+    if USE_OLLAMA: LLM_FALLBACKS.inc(call="pros_cons")
     pros, cons = [], []
     if (row.get("DisplayInches") or 0) >= 6.7: pros.append("Large, immersive display")
     if (row.get("DisplayInches") or 0) <= 6.2: pros.append("Compact size")
@@ -1278,7 +1620,7 @@ def llm_blurb(intent: dict, row: pd.Series) -> Optional[str]:
             "NotableFeatures": row.get("NotableFeatures"),
         }, ensure_ascii=False)
     )
-    return _ollama_text(prompt, temp=0.25)
+    return _ollama_text(prompt, temp=0.25, call="llm_blurb")
 
 # =========================
 # UI helper
@@ -1290,28 +1632,379 @@ def ui_config() -> dict:
     }
 
 
+# =========================
+# Catalog lookup (search)
+# =========================
+def search_index() -> "search.PhoneSearchIndex":
+    """Name index for /phones/search; built with each catalog snapshot."""
+    return catalog_cached("search_index", search.PhoneSearchIndex)
+
+def spec_index() -> "similar.SpecIndex":
+    """Normalized spec matrix for /phones/{slug}/similar; built with each catalog snapshot."""
+    return catalog_cached("spec_index", similar.SpecIndex)
+
+def skyline_index() -> "skyline.SkylineIndex":
+    """Price/spec Pareto skyline per OS family (BestValue flag, /phones/best-value)."""
+    return catalog_cached("skyline_index", skyline.SkylineIndex)
+
+def score_features() -> "scoring.FeatureMatrix":
+    """Scaled spec terms for rank_df; built with each catalog snapshot."""
+    return catalog_cached("score_features", scoring.FeatureMatrix)
+
+def batch_scorer() -> "batch.BatchScorer":
+    """Catalog as arrays for /recommend/batch; built with each catalog snapshot."""
+    return catalog_cached("batch_scorer", batch.BatchScorer)
+
+def _phone_brief(row: pd.Series) -> dict:
+    """Small card for list endpoints that must stay fast: no image fetch, no LLM."""
+    brand = str(row.get("Brand") or "").strip()
+    model = str(row.get("Model") or "").strip()
+    slug = str(row.get("Slug") or "")
+    if not slug or slug.lower() == "nan":
+        slug = _slugify(f"{brand}-{model}")
+
+    def num(col, cast=float):
+        v = row.get(col)
+        return cast(v) if pd.notna(v) else None
+
+    return {
+        "Slug": slug, "Brand": brand, "Model": model,
+        "ReleaseYear": num("ReleaseYear", int), "PriceUSD": num("PriceUSD"), "OS": row.get("OS"),
+        "RAM_GB": num("RAM_GB"), "Storage_GB": num("Storage_GB"),
+        "ImageLocal": _public_url_if_exists(f"/phones/{slug}.jpg") or _public_url_if_exists(f"/phones/{slug}.png"),
+    }
 
+# =========================
+# Result pages (/chat/results)
+# =========================
+# Answering a chat ranks every candidate but only shows the top 3. The session
+# keeps that order (row labels, de-duplicated by Slug) tagged with the intent
+# version and catalog version, so "show me more" is a slice of it plus cards
+# for that page only. Cursors are "<intent version>.<catalog version>.<offset>":
+# a page of a different intent or catalog would not continue the same list.
+RESULTS_KEEP = int(os.getenv("RESULTS_KEEP", "500"))
+RESULTS_PAGE = 3
+
+def intent_version(intent: dict) -> str:
+    """Short stable hash of an intent: any change to it gives a new version."""
+    blob = json.dumps(intent or {}, sort_keys=True, default=str)
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()[:12]
+
+def _ranked_results(intent: dict, ranked: pd.DataFrame) -> dict:
+    # the ids are labels of the snapshot `ranked` was taken from, not of the current one
+    return {"version": intent_version(intent), "catalog": ranked.attrs.get("catalog"),
+            "ids": unique_topn(ranked, RESULTS_KEEP).index.to_numpy()}
+
+def _results_cursor(results: Optional[dict], offset: int) -> Optional[str]:
+    if not results or offset >= len(results["ids"]):
+        return None
+    return f"{results['version']}.{results['catalog']}.{offset}"
+
+# =========================
+# Startup warmup / readiness
+# =========================
+# New workers load the catalog, asset index, HTTP client and LLM model in the
+# background at startup; /readyz answers 503 until that is done so the load
+# balancer keeps traffic on warm pods. Only the catalog is required: the other
+# steps degrade to the existing lazy paths and fallbacks if they fail.
+WARMUP = os.getenv("WARMUP", "1") == "1"
+WARMUP_LLM_TIMEOUT = float(os.getenv("WARMUP_LLM_TIMEOUT", "60"))
+
+_WARMUP_STATE: Dict[str, Any] = {"ready": not WARMUP, "steps": {}}
+
+def _warm_llm() -> Optional[str]:
+    if not USE_OLLAMA:
+        return "skipped"
+    # an empty prompt makes Ollama load the model into memory without generating
+    r = _http().post(f"{OLLAMA_URL}/api/generate", json={"model": OLLAMA_MODEL, "prompt": ""},
+                     timeout=WARMUP_LLM_TIMEOUT)
+    r.raise_for_status()
+    return None
+
+def _warm_pipeline() -> None:
+    # one pass through intent parsing + relaxation so first-call costs
+    # (regex compilation, pandas code paths) are paid here
+    candidates_multi(normalize_intent(rule_extract_intent("android under 700 with long battery")))
+
+WARMUP_STEPS: List[Tuple[str, Callable[[], Any]]] = [
+    ("catalog", catalog_snapshot),
+    ("search_index", search_index),
+    ("spec_index", spec_index),
+    ("skyline_index", skyline_index),
+    ("score_features", score_features),
+    ("batch_scorer", batch_scorer),
+    ("public_index", lambda: refresh_public_index(force=True)),
+    ("http_client", _http),
+    ("llm", _warm_llm),
+    ("pipeline", _warm_pipeline),
+]
+
+def run_warmup() -> bool:
+    """Run every warmup step once; returns readiness (catalog loaded).
+    A step may return a status string ("skipped"); anything else counts as "ok"."""
+    ok = True
+    for name, step in WARMUP_STEPS:
+        t0 = time.perf_counter()
+        try:
+            res = step()
+            status, error = (res if isinstance(res, str) else "ok"), None
+        except Exception as e:
+            status, error = "error", f"{e.__class__.__name__}: {e}"
+            print(f"[warmup] {name} failed:", error)
+            if name == "catalog":
+                ok = False
+        dt = time.perf_counter() - t0
+        WARMUP_SECONDS.set(dt, step=name)
+        _WARMUP_STATE["steps"][name] = {"status": status, "seconds": round(dt, 3), "error": error}
+    _WARMUP_STATE["ready"] = ok
+    print(f"[warmup] {'ready' if ok else 'NOT ready'}:",
+          ", ".join(f"{k} {v['status']} {v['seconds']}s" for k, v in _WARMUP_STATE["steps"].items()))
+    return ok
 
 # =========================
 # Endpoints
 # =========================
+@app.middleware("http")
+async def _time_requests(request: Request, call_next):
+    t0 = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        HTTP_SECONDS.observe(time.perf_counter() - t0, method=request.method,
+                             route=getattr(route, "path", "unmatched"), status=str(status))
+
+@app.get("/metrics")
+def metrics_endpoint():
+    """Prometheus scrape target."""
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+# config is read once at import; liveness just returns it
+_HEALTHZ = {
+    "ok": True,
+    "csv": PHONES_CSV,
+    "use_llm": USE_LLM,
+    "allow_scrapers": ALLOW_SCRAPERS,
+    "demo_seed": DEMO_SEED,
+}
+
 @app.get("/healthz")
 def healthz():
-    from config import PHONES_CSV, USE_LLM, ALLOW_SCRAPERS, DEMO_SEED
-    return {
-        "ok": True,
-        "csv": PHONES_CSV,
-        "use_llm": USE_LLM,
-        "allow_scrapers": ALLOW_SCRAPERS,
-        "demo_seed": DEMO_SEED,
-    }
+    return _HEALTHZ
+
+@app.get("/readyz")
+def readyz():
+    """Readiness probe: 503 until startup warmup has loaded the catalog."""
+    snap = _SNAPSHOT
+    body = {"ready": _WARMUP_STATE["ready"], "catalog_version": snap.version if snap else None,
+            "steps": _WARMUP_STATE["steps"]}
+    return JSONResponse(body, status_code=200 if body["ready"] else 503)
+
+@app.on_event("startup")
+def _start_catalog_watcher():
+    if CATALOG_POLL_SECONDS > 0:
+        threading.Thread(target=_catalog_watcher, args=(CATALOG_POLL_SECONDS,),
+                         name="catalog-watcher", daemon=True).start()
+
+@app.on_event("startup")
+def _start_warmup():
+    if WARMUP:
+        threading.Thread(target=run_warmup, name="warmup", daemon=True).start()
+
+@app.post("/admin/reload-catalog")
+def admin_reload_catalog(force: bool = False, x_admin_token: Optional[str] = Header(None)):
+    """Pick up a newly published CSV now instead of waiting for the watcher."""
+    # every call re-reads the CSV and rebuilds the derived indexes: never open to anyone
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if x_admin_token != ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="bad admin token")
+    swapped = reload_catalog(force=force)
+    snap = catalog_snapshot()
+    return {"ok": True, "reloaded": swapped, "version": snap.version, "rows": int(len(snap.df))}
+
+BATCH_MAX = int(os.getenv("BATCH_MAX", "10000"))
+
+class RecommendBatchReq(BaseModel):
+    intents: List[dict]          # DEFAULT_INTENT fields, plus an optional "id" echoed back
+    k: int = 3
+    include_text: bool = False   # full cards (LLM pros/cons, images) + blurb; slow
+
+@app.post("/recommend/batch")
+def recommend_batch(req: RecommendBatchReq):
+    """
+    Top-k phones for many structured intents, scored together. Streams one NDJSON
+    line per intent in request order: {index, id, intent, count, picks}.
+    No relaxation and no LLM text unless include_text is set.
+    """
+    if not 1 <= req.k <= 20:
+        raise HTTPException(status_code=422, detail="k must be between 1 and 20")
+    if len(req.intents) > BATCH_MAX:
+        raise HTTPException(status_code=413, detail=f"at most {BATCH_MAX} intents per batch")
+    ids = [it.get("id") for it in req.intents]
+    intents = [normalize_intent({k: v for k, v in it.items() if k in DEFAULT_INTENT}) for it in req.intents]
+    scorer = batch_scorer()
+
+    def lines():
+        t0 = time.perf_counter()
+        best = _best_value_flags(scorer.df).to_numpy()
+        briefs: Dict[int, dict] = {}  # the same phones top many intents: one brief per row
+        for i, ok, top in scorer.run(intents, req.k):
+            intent = intents[i]
+            if intent.get("rank_mode") == "value":
+                # Pareto layers depend on the candidate set: rank this one the usual way
+                ranked = unique_topn(rank_df(scorer.df[ok], intent), req.k)
+                top = list(zip(scorer.df.index.get_indexer(ranked.index), ranked.get("_score", [])))
+            line = {"index": i, "id": ids[i], "intent": intent, "count": int(ok.sum())}
+            if req.include_text:
+                rows = scorer.df.iloc[[r for r, _ in top]]
+                rows = rows.assign(_best_value=best[[r for r, _ in top]])
+                line["picks"] = _build_picks_from_df(rows, intent, top=req.k, already_ranked=True)
+                for p, (_, s) in zip(line["picks"], top):
+                    p["score"] = round(s, 4)
+                line["blurb"] = _blurb_for_row(intent, rows.iloc[0]) if len(rows) else None
+            else:
+                for r, _ in top:
+                    if r not in briefs:
+                        briefs[r] = _phone_brief(scorer.df.iloc[r])
+                line["picks"] = [dict(briefs[r], score=round(s, 4), BestValue=bool(best[r])) for r, s in top]
+            yield dumps_json(line) + b"\n"
+        STAGE_SECONDS.observe(time.perf_counter() - t0, stage="batch")
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+@app.get("/phones/search")
+def phones_search(q: str = Query("", max_length=100), limit: int = Query(10, ge=1, le=50)):
+    """Typeahead over Brand + Model: prefix matches on the last word, small typos tolerated."""
+    with STAGE_SECONDS.time(stage="search"):
+        hits = search_index().search(q, limit)
+        results = [dict(_phone_brief(row), score=float(row["_match"])) for _, row in hits.iterrows()]
+    return {"query": q, "results": results}
+
+@app.get("/phones/best-value")
+def phones_best_value(max_price: Optional[float] = Query(None, gt=0), limit: int = Query(10, ge=1, le=50),
+                      os_name: Optional[str] = Query(None, alias="os", max_length=20)):
+    """Pareto-optimal phones under a price (nothing cheaper is as good on every spec), best specced first."""
+    with STAGE_SECONDS.time(stage="best_value"):
+        index = skyline_index()
+        rows = index.df.iloc[index.best_value(max_price, os_name=os_name, limit=limit)]
+        results = [_phone_brief(row) for _, row in rows.iterrows()]
+    return {"max_price": max_price, "os": skyline.os_family(os_name) if os_name else None, "results": results}
+
+@app.get("/phones/{slug}/similar")
+def phones_similar(slug: str, k: int = Query(6, ge=1, le=50), max_price: Optional[float] = Query(None, gt=0),
+                   cheaper: bool = False, os_name: Optional[str] = Query(None, alias="os", max_length=20)):
+    """Nearest phones by specs and features, optionally under a price / cheaper than this / on an OS."""
+    with STAGE_SECONDS.time(stage="similar"):
+        index = spec_index()
+        found = index.neighbours(slug, k, max_price=max_price, cheaper=cheaper, os_name=os_name)
+        if found is None:
+            raise HTTPException(status_code=404, detail="unknown phone")
+        rows = index.df.iloc[[index.row_for(slug)] + [i for i, _ in found]]
+        briefs = [_phone_brief(row) for _, row in rows.iterrows()]
+    return {"phone": briefs[0],
+            "similar": [dict(b, distance=round(d, 4)) for b, (_, d) in zip(briefs[1:], found)]}
+
+@app.get("/chat/results")
+def chat_results(session_id: str, cursor: Optional[str] = Query(None, max_length=40),
+                 limit: int = Query(RESULTS_PAGE, ge=1, le=12)):
+    """Next page of the session's ranked results; no cursor = first page."""
+    sess = SESSIONS.get(session_id)
+    if sess is None:
+        raise HTTPException(status_code=404, detail="unknown session")
+    intent = sess.get("intent") or dict(DEFAULT_INTENT)
+    snap = catalog_snapshot()  # filter, rank and read rows from this one only
+    version, offset = intent_version(intent), 0
+    if cursor:
+        parts = cursor.split(".")
+        if len(parts) != 3 or not parts[2].isdigit():
+            raise HTTPException(status_code=400, detail="bad cursor")
+        if parts[0] != version:
+            raise HTTPException(status_code=409, detail="intent changed; start again without a cursor")
+        if parts[1] != snap.version:
+            raise HTTPException(status_code=409, detail="catalog changed; start again without a cursor")
+        offset = int(parts[2])
+
+    with STAGE_SECONDS.time(stage="results_page"):
+        results = sess.get("results")
+        if not results or results["version"] != version or results["catalog"] != snap.version:
+            # no stored order for this intent / catalog: rank once and keep it
+            results = sess["results"] = _ranked_results(intent, rank_df(_direct_candidates(intent, snap.df), intent))
+        rows = snap.df.loc[results["ids"][offset:offset + limit]]
+        rows = rows.assign(_best_value=_best_value_flags(rows))
+        picks = _build_picks_from_df(rows, intent, top=limit, already_ranked=True)
+    return FastJSONResponse({"session_id": session_id, "offset": offset, "total": int(len(results["ids"])),
+                             "picks": picks, "cursor": _results_cursor(results, offset + len(rows))})
+
+RECOMMEND_MAX_AGE = int(os.getenv("RECOMMEND_MAX_AGE", "300"))
+
+def _query_num(x: float) -> str:
+    # shortest text that parses back to the same float ("600", "0.35", "1234567.5")
+    s = repr(float(x))
+    return s[:-2] if s.endswith(".0") else s
+
+def intent_query(intent: dict) -> str:
+    """Canonical query string of a normalized intent: sorted keys, defaults and empties left out."""
+    parts = []
+    for k in sorted(DEFAULT_INTENT):
+        v = intent.get(k)
+        if v in (None, "", []) or v == DEFAULT_INTENT[k]:
+            continue
+        if isinstance(v, bool):
+            v = "true" if v else "false"
+        elif isinstance(v, float):
+            v = _query_num(v)
+        elif isinstance(v, (list, tuple)):
+            v = ",".join(str(x) for x in v)
+        elif isinstance(v, dict):
+            v = ",".join(f"{t}:{_query_num(x)}" for t, x in sorted(v.items()))
+        parts.append((k, str(v)))
+    return urlencode(parts)
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    tags = [t.strip() for t in header.split(",")]
+    return "*" in tags or any(t.removeprefix("W/") == etag for t in tags)
+
+@app.get("/recommend")
+def recommend(request: Request, if_none_match: Optional[str] = Header(None), x_profile: Optional[str] = Header(None)):
+    """
+    Stateless results for an intent given as query parameters (DEFAULT_INTENT
+    fields; lists comma-separated or repeated), same picks and count as
+    "show results" in chat. Cacheable: the ETag is intent version + catalog
+    version, and a matching If-None-Match gets a 304 without any ranking.
+    """
+    q = request.query_params
+    raw = {k: (",".join(q.getlist(k)) if isinstance(DEFAULT_INTENT[k], list) else q[k])
+           for k in DEFAULT_INTENT if k in q}
+    intent = normalize_intent(raw)
+    snap = catalog_snapshot()  # the ETag's catalog version is the one the body is ranked from
+    etag = f'"{intent_version(intent)}-{snap.version}"'
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={RECOMMEND_MAX_AGE}",
+               "Content-Location": f"/recommend?{intent_query(intent)}"}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    with profiling.request_profile("recommend", x_profile) as prof:
+        prof.tag(intent)
+        ask, picks, count, _ = _direct_results(intent, snap.df)
+    return FastJSONResponse({"intent": intent, "ask": ask, "picks": picks, "count": count}, headers=headers)
 
 @app.post("/chat/start", response_model=ChatStartResp)
 def chat_start():
+    return ChatStartResp(session_id=_new_session(), message=CHAT_GREETING, ui=ui_config())
+
+CHAT_GREETING = "Tell me everything in one go, or use the controls. I’ll ask follow-ups if needed."
+
+def _new_session() -> str:
     sid = str(uuid.uuid4())
+    SESSIONS_CREATED.inc()
     SESSIONS[sid] = {"intent": dict(DEFAULT_INTENT), "skipped": set(), "ask_key": "budget"}
-    msg = "Tell me everything in one go, or use the controls. I’ll ask follow-ups if needed."
-    return ChatStartResp(session_id=sid, message=msg, ui=ui_config())
+    return sid
 
 def _extract_merge(text: str, current: dict) -> dict:
     # AI first, then rules; only fill empty fields
@@ -1340,107 +2033,13 @@ def _next_question(intent: dict, skipped: set) -> Optional[Tuple[str,str]]:
             return key, phr
     return None
 
-def _final_hard_gate(d: pd.DataFrame, intent: dict) -> pd.DataFrame:
-    """Always enforce strict budget and avoid_brands, and OS if specified."""
-    if d is None or d.empty:
-        return d
-    out = d.copy()
-    if intent.get("budget") is not None:
-        price = pd.to_numeric(out["PriceUSD"], errors="coerce")
-        b = float(intent["budget"])
-        out = out[(~price.isna()) & (price > 0) & (price <= b)]
-    if intent.get("avoid_brands"):
-        bad = [s.lower() for s in intent["avoid_brands"]]
-        out = out[~out["Brand"].str.lower().isin(bad)]
-    if intent.get("os"):
-        s = intent["os"].lower()
-        if s.startswith("i"):
-            out = out[(out["OS"].str.contains("ios", case=False, na=False)) | (out["Brand"].str.contains("apple", case=False, na=False))]
-        elif s.startswith("a"):
-            out = out[~((out["OS"].str.contains("ios", case=False, na=False)) | (out["Brand"].str.contains("apple", case=False, na=False)))]
-    return out
-
-def _build_picks(ranked: pd.DataFrame, intent: dict) -> List[dict]:
-    picks: List[dict] = []
-
-    for _, row in ranked.iterrows():
-        # --- Remote image (may be None) ---
-        try:
-            image_url = fetch_phone_image_url(
-                str(row.get("Brand") or ""),
-                str(row.get("Model") or "")
-            )
-        except Exception:
-            image_url = None
-
-        # --- Local offline assets (public/phones, public/brands) ---
-        brand = (row.get("Brand") or "").strip()
-        model = (row.get("Model") or "").strip()
-        slug = row.get("Slug")
-
-        # guard NaN slugs
-        try:
-            is_nan_slug = pd.isna(slug)
-        except Exception:
-            is_nan_slug = False
-
-        if not slug or is_nan_slug or str(slug).lower() == "nan":
-            slug = _slugify(f"{brand}-{model}")
-
-        phone_local = (
-            _public_url_if_exists(f"/phones/{slug}.jpg")
-            or _public_url_if_exists(f"/phones/{slug}.png")
-        )
-
-        brand_key = brand.lower().replace(" ", "_")  # "OnePlus" -> "oneplus"
-        brand_logo = _public_url_if_exists(f"/brands/{brand_key}.png")  # PNG logos you generated
-
-        # --- Pros/Cons via LLM (safe fallback) ---
-        try:
-            pros, cons = llm_pros_cons(intent, row) or ([], [])
-        except Exception:
-            pros, cons = [], []
-
-        # --- Build item safely (coerce only if not NaN) ---
-        price   = float(row["PriceUSD"])     if pd.notna(row.get("PriceUSD"))     else 0.0
-        display = float(row["DisplayInches"])if pd.notna(row.get("DisplayInches"))else None
-        battery = int(row["Battery_mAh"])    if pd.notna(row.get("Battery_mAh"))   else None
-        ram     = float(row["RAM_GB"])       if pd.notna(row.get("RAM_GB"))        else None
-        storage = float(row["Storage_GB"])   if pd.notna(row.get("Storage_GB"))    else None
-        camera  = float(row["MainCameraMP"]) if pd.notna(row.get("MainCameraMP"))  else None
-        weight  = float(row["Weight_g"])     if pd.notna(row.get("Weight_g"))      else None
-
-        picks.append({
-            "Brand": row.get("Brand"),
-            "Model": row.get("Model"),
-            "ReleaseYear": int(row.get("ReleaseYear") or 0),
-            "PriceUSD": price,
-            "DisplayInches": display,
-            "Battery_mAh": battery,
-            "RAM_GB": ram,
-            "Storage_GB": storage,
-            "MainCameraMP": camera,
-            "OS": row.get("OS"),
-            "Weight_g": weight,
-            "NotableFeatures": row.get("NotableFeatures"),
-
-            # Images
-            "ImageURL": image_url,      # remote (may be None)
-            "ImageLocal": phone_local,  # /phones/<slug>.jpg|png if present
-            "BrandLogo": brand_logo,    # /brands/<brand>.png if present
-
-            # LLM outputs
-            "Pros": pros,
-            "Cons": cons,
-        })
-
-    return picks
-
-def _answer_or_ask(intent: dict, skipped: set, user_text: str) -> tuple[Optional[str], Optional[list], int]:
+def _answer_or_ask(intent: dict, skipped: set, user_text: str) -> tuple[Optional[str], Optional[list], int, Optional[dict]]:
     """
     While asking: return the next prompt + a live count.
     When answering: never return picks that violate the user's budget.
+    The last item is the ranked order to keep for /chat/results (None while asking).
     """
+    base = safe_df()  # one catalog snapshot for the whole answer
     lower = (user_text or "").lower()
     force_answer = bool(re.search(r"\b(show\s*results|results|recommend|suggest|buy|best|pick|choose)\b", lower))
 
@@ -1453,20 +2052,21 @@ def _answer_or_ask(intent: dict, skipped: set, user_text: str) -> tuple[Optional
     if nq and not force_answer:
         key, prompt = nq
         try:
-            live = filter_df_by_intent(safe_df(), intent)
+            live = filter_df_by_intent(base, intent)
             live = _strict_budget_df(live, intent.get("budget"))
-            return prompt, None, int(len(live))
+            return prompt, None, int(len(live)), None
         except Exception as e:
             print("[live-count] failed:", e)
-            return prompt, None, 0
+            return prompt, None, 0, None
 
     # time to answer
     try:
         try:
-            df_cand, relaxed_intent, note = candidates_multi(intent)
+            df_cand, relaxed_intent, note = candidates_multi(intent, base)
+            RELAX_RUNGS.inc(rung=note)
         except Exception as e:
             print("[candidates_multi] failed:", e)
-            df_cand = filter_df_by_intent(safe_df(), intent)
+            df_cand = filter_df_by_intent(base, intent)
             relaxed_intent = intent
             note = "soft filter fallback"
 
@@ -1479,18 +2079,20 @@ def _answer_or_ask(intent: dict, skipped: set, user_text: str) -> tuple[Optional
 
         # absolute fallback: still honor budget
         if df_cand is None or df_cand.empty:
-            df_cand = safe_df().sort_values(
+            df_cand = base.sort_values(
                 ["ReleaseYear", "PriceUSD"], ascending=[False, True], na_position="last"
             )
             df_cand = _strict_budget_df(df_cand, intent.get("budget"))
 
         # build cards, cap to 3, enforce budget again on picks
-        picks = _build_picks_from_df(df_cand, intent)
+        ranked = rank_df(df_cand, intent)
+        results = _ranked_results(intent, ranked)
+        picks = _build_picks_from_df(ranked, intent, already_ranked=True)
         picks = _strict_budget_picks(picks, intent.get("budget"))[:3]
 
         # count (strict)
         try:
-            count = len(_strict_budget_df(filter_df_by_intent(safe_df(), intent), intent.get("budget")))
+            count = len(_strict_budget_df(filter_df_by_intent(base, intent), intent.get("budget")))
         except Exception:
             count = len(df_cand)
 
@@ -1507,56 +2109,53 @@ def _answer_or_ask(intent: dict, skipped: set, user_text: str) -> tuple[Optional
                 top = picks[0]
                 ask = f"I’d start with {top['Brand']} {top['Model']} — strong match for what you asked."
 
-        return ask, picks, int(count)
+        return ask, picks, int(count), results
 
     except Exception as e:
         print("[_answer_or_ask] fatal:", e)
         df_top = _strict_budget_df(
-            safe_df().sort_values(["ReleaseYear", "PriceUSD"], ascending=[False, True], na_position="last"),
+            base.sort_values(["ReleaseYear", "PriceUSD"], ascending=[False, True], na_position="last"),
             intent.get("budget"),
         )
         picks = _strict_budget_picks(_build_picks_from_df(df_top, intent), intent.get("budget"))[:3]
         ask = "Here are solid recent options while I sort out that hiccup."
-        return ask, picks, int(len(df_top or []))
-
-
-    # Search
-    base = safe_df()
-    d = filter_df_by_intent(base, intent, strict_budget=True)
-
-    # Relaxations (soft) to reach at least 3 options (but without violating *hard* constraints later)
-    if len(d) < 3:
-        tmp = dict(intent)
-        changed = False
-        if tmp.get("must_have"):
-            tmp["must_have"] = []
-            changed = True
-        if len(filter_df_by_intent(base, tmp)) < 3 and tmp.get("min_battery"):
-            tmp["min_battery"] = int(tmp["min_battery"] * 0.9)
-            changed = True
-        d = filter_df_by_intent(base, tmp) if changed else d
-
-    # Final hard gate — never return over-budget / disliked / OS-mismatched
-    d = _final_hard_gate(d, intent)
-
-    # If nothing and user has budget/avoid/os, ask to relax
-    if d.empty and (intent.get("budget") is not None or intent.get("avoid_brands") or intent.get("os")):
-        return ("I couldn’t find matches within your constraints. Should I relax them a bit (e.g., +15% budget or ignore OS)?", None, 0)
-
-    # If still empty, show general top picks
-    if d.empty:
-        base = base.sort_values(["ReleaseYear","PriceUSD"], ascending=[False, True], na_position="last")
-        d = base.head(30)
-
-    ranked = unique_topn(rank_df(d, intent), 3)
-    picks = _build_picks(ranked, intent)
-
-    return (llm_blurb(intent, ranked.iloc[0]) or "Here’s what I recommend.", picks, int(len(d)))
+        return ask, picks, int(len(df_top or [])), None
 
 # ---------- chat/message ----------
 # ---------- chat/message ----------
 @app.post("/chat/message", response_model=ChatMessageResp)
-def chat_message(req: ChatMessageReq):
+def chat_message(req: ChatMessageReq, x_profile: Optional[str] = Header(None)):
+    with profiling.request_profile("chat_message", x_profile) as prof:
+        resp = _chat_message(req)
+        prof.tag(resp["intent"])
+        return FastJSONResponse(resp)
+
+def _merge_message(sess: dict, text: str) -> tuple[dict, set, bool]:
+    """Fold one user message into the session intent: (intent, skipped, show results now)."""
+    intent = dict(sess.get("intent", DEFAULT_INTENT))
+    skipped = set(sess.get("skipped", set()))
+    lower_text = text.lower()
+
+    # ---- allow "skip" for the last asked slot
+    if wants_to_skip(text) and sess.get("ask_key"):
+        skipped.add(sess["ask_key"])
+
+    # ---- ultra-early budget catch: plain "700" / "$700" / "700 dollars"
+    m_budget = re.fullmatch(r"\s*(\d{2,5})(?:\s*(?:usd|dollars|\$))?\s*$", text, re.I)
+    if m_budget and intent.get("budget") in (None, "", 0):
+        try:
+            intent["budget"] = float(m_budget.group(1))
+        except Exception:
+            pass
+
+    # ---- merge AI + rules into intent (only fill empties), then normalize
+    intent = _extract_merge(text, intent)
+    intent = normalize_intent(intent)
+
+    show_now = bool(re.search(r"\b(show\s*results|show\s*now|results|recommend|suggest|pick|choose|buy)\b", lower_text))
+    return intent, skipped, show_now
+
+def _chat_message(req: ChatMessageReq) -> dict:
     try:
         # ---- session bootstrap
         sess = SESSIONS.get(req.session_id) or {
@@ -1564,29 +2163,11 @@ def chat_message(req: ChatMessageReq):
             "skipped": set(),
             "ask_key": "budget",
         }
-        intent = dict(sess.get("intent", DEFAULT_INTENT))
-        skipped = set(sess.get("skipped", set()))
         text = (req.message or "").strip()
-        lower_text = text.lower()
-
-        # ---- allow "skip" for the last asked slot
-        if wants_to_skip(text) and sess.get("ask_key"):
-            skipped.add(sess["ask_key"])
-
-        # ---- ultra-early budget catch: plain "700" / "$700" / "700 dollars"
-        m_budget = re.fullmatch(r"\s*(\d{2,5})(?:\s*(?:usd|dollars|\$))?\s*$", text, re.I)
-        if m_budget and intent.get("budget") in (None, "", 0):
-            try:
-                intent["budget"] = float(m_budget.group(1))
-            except Exception:
-                pass
-
-        # ---- merge AI + rules into intent (only fill empties), then normalize
-        intent = _extract_merge(text, intent)
-        intent = normalize_intent(intent)
+        intent, skipped, show_now = _merge_message(sess, text)
 
         # ---- FAST-PATH: user explicitly asked to see results now
-        if re.search(r"\b(show\s*results|show\s*now|results|recommend|suggest|pick|choose|buy)\b", lower_text):
+        if show_now:
             # persist current intent before jumping to results
             sess["intent"] = intent
             sess["skipped"] = skipped
@@ -1595,27 +2176,30 @@ def chat_message(req: ChatMessageReq):
             return _direct_results_response(req.session_id, intent, skipped)
 
         # ---- normal flow: decide whether to ask next question or answer now
-        ask, picks, count = _answer_or_ask(intent, skipped, text)
+        ask, picks, count, results = _answer_or_ask(intent, skipped, text)
 
         # ---- save session snapshot
         sess["intent"] = intent
         sess["skipped"] = skipped
+        if results is not None:
+            sess["results"] = results
         SESSIONS[req.session_id] = sess
 
         # ---- respond
-        return ChatMessageResp(
+        return _chat_resp(
             session_id=req.session_id,
             intent=intent,
             ask=ask,
             picks=picks,
             count=int(count or 0),
             ui=ui_config(),
+            cursor=_results_cursor(results, len(picks or [])),
         )
 
     except Exception as e:
         # keep the session intent if available so UI doesn't reset
         safe_intent = SESSIONS.get(req.session_id, {}).get("intent", dict(DEFAULT_INTENT))
-        return ChatMessageResp(
+        return _chat_resp(
             session_id=req.session_id,
             intent=safe_intent,
             ask=f"Sorry — internal error ({e.__class__.__name__}). You can continue or type 'show results'.",
@@ -1632,7 +2216,13 @@ class PatchReq(BaseModel):
     patch: dict
 
 @app.post("/chat/patch", response_model=ChatMessageResp)
-def chat_patch(req: PatchReq):
+def chat_patch(req: PatchReq, x_profile: Optional[str] = Header(None)):
+    with profiling.request_profile("chat_patch", x_profile) as prof:
+        resp = _chat_patch(req)
+        prof.tag(resp["intent"])
+        return FastJSONResponse(resp)
+
+def _chat_patch(req: PatchReq) -> dict:
     try:
         sess = SESSIONS.get(req.session_id) or {"intent": dict(DEFAULT_INTENT), "skipped": set(), "ask_key": "budget"}
         intent = dict(sess.get("intent", DEFAULT_INTENT))
@@ -1656,7 +2246,7 @@ def chat_patch(req: PatchReq):
         except Exception:
             count = 0
 
-        return ChatMessageResp(
+        return _chat_resp(
             session_id=req.session_id,
             intent=intent,
             ask=None,
@@ -1667,7 +2257,7 @@ def chat_patch(req: PatchReq):
     except Exception as e:
         # return previous intent so UI doesn't "freeze"
         sess = SESSIONS.get(req.session_id) or {"intent": dict(DEFAULT_INTENT)}
-        return ChatMessageResp(
+        return _chat_resp(
             session_id=req.session_id,
             intent=sess.get("intent", dict(DEFAULT_INTENT)),
             ask=f"Sorry — patch error ({e.__class__.__name__}).",
@@ -1676,4 +2266,95 @@ def chat_patch(req: PatchReq):
             ui=ui_config(),
         )
 
-
+# ====================================================================
+# Chat over a WebSocket: one session per connection
+# ====================================================================
+# Same logic as /chat/message and /chat/patch without a request per
+# interaction. Client frames (an optional "id" is echoed on every reply):
+#   {"type": "message", "text": "..."}
+#   {"type": "patch", "patch": {...}}
+# Server frames, each pushed as soon as its part is ready:
+#   session  {session_id, message, ui}                 once, on connect
+#   count    {intent, count}                           live candidate count
+#   picks    {picks, cursor}                           cards (cursor -> /chat/results)
+#   ask      {text}                                    blurb or next question
+#   error    {detail}
+#   done                                               end of the replies to one frame
+
+async def _ws_send(ws: WebSocket, frame: dict):
+    await ws.send_text(dumps_json(frame).decode("utf-8"))
+
+async def _ws_message(sid: str, text: str, reply):
+    sess = SESSIONS.get(sid) or {"intent": dict(DEFAULT_INTENT), "skipped": set(), "ask_key": "budget"}
+    intent, skipped, show_now = await run_in_threadpool(_merge_message, sess, text)
+
+    if show_now:
+        # the direct path in stages: count, then cards, then the (LLM) blurb
+        ranked, count, results = await run_in_threadpool(_direct_rank, intent)
+        SESSIONS[sid] = {"intent": intent, "ask_key": None, "skipped": skipped, "results": results}
+        await reply({"type": "count", "intent": intent, "count": count})
+        picks = await run_in_threadpool(_direct_picks, ranked, intent)
+        await reply({"type": "picks", "picks": picks, "cursor": _results_cursor(results, len(picks))})
+        await reply({"type": "ask", "text": await run_in_threadpool(_direct_blurb, ranked, picks, intent)})
+        return
+
+    ask, picks, count, results = await run_in_threadpool(_answer_or_ask, intent, skipped, text)
+    sess["intent"] = intent
+    sess["skipped"] = skipped
+    if results is not None:
+        sess["results"] = results
+    SESSIONS[sid] = sess
+    await reply({"type": "count", "intent": intent, "count": int(count or 0)})
+    if picks:
+        await reply({"type": "picks", "picks": picks, "cursor": _results_cursor(results, len(picks))})
+    await reply({"type": "ask", "text": ask})
+
+async def _ws_patch(sid: str, patch, reply):
+    if not isinstance(patch, dict):
+        await reply({"type": "error", "detail": "patch must be an object"})
+        return
+    resp = await run_in_threadpool(_chat_patch, PatchReq(session_id=sid, patch=patch))
+    if resp["ask"]:
+        await reply({"type": "error", "detail": resp["ask"]})
+    await reply({"type": "count", "intent": resp["intent"], "count": resp["count"]})
+
+@app.websocket("/chat/ws")
+async def chat_ws(ws: WebSocket, session_id: Optional[str] = None):
+    await ws.accept()
+    # resume a known session (e.g. after a reconnect), otherwise start one
+    sid = session_id if session_id in SESSIONS else _new_session()
+    try:
+        await _ws_send(ws, {"type": "session", "session_id": sid, "message": CHAT_GREETING, "ui": ui_config()})
+        while True:
+            raw = await ws.receive_text()
+            try:
+                frame = json.loads(raw)
+                if not isinstance(frame, dict):
+                    raise ValueError
+            except ValueError:
+                await _ws_send(ws, {"type": "error", "detail": "frames must be JSON objects"})
+                continue
+
+            ref = frame.get("id")
+            async def reply(out: dict):
+                if ref is not None:
+                    out["id"] = ref
+                await _ws_send(ws, out)
+
+            kind = frame.get("type")
+            try:
+                with STAGE_SECONDS.time(stage=f"ws_{kind}" if kind in ("message", "patch") else "ws_other"):
+                    if kind == "message":
+                        await _ws_message(sid, str(frame.get("text") or "").strip(), reply)
+                    elif kind == "patch":
+                        await _ws_patch(sid, frame.get("patch") or {}, reply)
+                    else:
+                        await reply({"type": "error", "detail": f"unknown frame type: {kind!r}"})
+            except WebSocketDisconnect:
+                raise
+            except Exception as e:
+                print("[chat_ws] error:", repr(e))
+                await reply({"type": "error", "detail": f"Sorry — internal error ({e.__class__.__name__})."})
+            await reply({"type": "done"})
+    except WebSocketDisconnect:
+        pass
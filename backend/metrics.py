@@ -0,0 +1,172 @@
+# backend/metrics.py
+"""
+Tiny in-process metrics with Prometheus text exposition (format 0.0.4).
+No client library needed: counters, gauges and histograms with labels,
+rendered by `render()` for the /metrics endpoint.
+"""
+import threading, time
+from contextlib import ContextDecorator
+from typing import Callable, Dict, Optional, Tuple
+
+__all__ = [
+    "Counter", "Gauge", "Histogram", "render", "CONTENT_TYPE",
+    "STAGE_SECONDS", "LLM_SECONDS", "HTTP_SECONDS", "RELAX_RUNGS",
+    "LLM_FALLBACKS", "CACHE_REQUESTS", "SESSIONS_CREATED", "SESSIONS_ACTIVE",
+    "WARMUP_SECONDS",
+]
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_BUCKETS = (.001, .0025, .005, .01, .025, .05, .1, .25, .5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_REGISTRY: list = []
+
+def _fmt_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{n}="{_esc(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+def _esc(v) -> str:
+    return str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _num(v: float) -> str:
+    if v == float("inf"):
+        return "+Inf"
+    return repr(float(v)) if not float(v).is_integer() else str(int(v))
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, doc: str, labels: Tuple[str, ...] = ()):
+        self.name, self.doc, self.labels = name, doc, tuple(labels)
+        self._lock = threading.Lock()
+        _REGISTRY.append(self)
+
+    def _key(self, kw: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(kw.get(l, "")) for l in self.labels)
+
+    def header(self) -> list:
+        return [f"# HELP {self.name} {self.doc}", f"# TYPE {self.name} {self.kind}"]
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name, doc, labels=()):
+        super().__init__(name, doc, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        k = self._key(labels)
+        with self._lock:
+            self._values[k] = self._values.get(k, 0.0) + amount
+
+    def lines(self) -> list:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_fmt_labels(self.labels, k)} {_num(v)}" for k, v in items]
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name, doc, labels=()):
+        super().__init__(name, doc, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._fn: Optional[Callable[[], float]] = None
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = float(value)
+
+    def set_function(self, fn: Callable[[], float]) -> None:
+        """Read the value at scrape time (unlabelled gauges only)."""
+        self._fn = fn
+
+    def lines(self) -> list:
+        if self._fn is not None:
+            try:
+                return [f"{self.name} {_num(self._fn())}"]
+            except Exception:
+                return []
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_fmt_labels(self.labels, k)} {_num(v)}" for k, v in items]
+
+class _Timer(ContextDecorator):
+    def __init__(self, hist: "Histogram", labels: Dict[str, str]):
+        self.hist, self.labels = hist, labels
+
+    def _recreate_cm(self):
+        # fresh timer per decorated call: safe across threads and recursion
+        return _Timer(self.hist, self.labels)
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.hist.observe(time.perf_counter() - self.t0, **self.labels)
+        return False
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, doc, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, doc, labels)
+        self.buckets = tuple(sorted(buckets))
+        self._values: Dict[Tuple[str, ...], list] = {}  # key -> [bucket counts..., sum, count]
+
+    def observe(self, value: float, **labels) -> None:
+        k = self._key(labels)
+        with self._lock:
+            row = self._values.get(k)
+            if row is None:
+                row = self._values[k] = [0] * len(self.buckets) + [0.0, 0]
+            for i, b in enumerate(self.buckets):
+                if value <= b:
+                    row[i] += 1
+            row[-2] += value
+            row[-1] += 1
+
+    def time(self, **labels) -> _Timer:
+        """`with H.time(stage="rank"):` or `@H.time(stage="rank")`."""
+        return _Timer(self, labels)
+
+    def lines(self) -> list:
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._values.items())
+        out = []
+        for k, row in items:
+            for i, b in enumerate(self.buckets):
+                le = 'le="%s"' % _num(b)
+                out.append(f"{self.name}_bucket{_fmt_labels(self.labels, k, le)} {row[i]}")
+            le = 'le="+Inf"'
+            out.append(f"{self.name}_bucket{_fmt_labels(self.labels, k, le)} {row[-1]}")
+            out.append(f"{self.name}_sum{_fmt_labels(self.labels, k)} {_num(row[-2])}")
+            out.append(f"{self.name}_count{_fmt_labels(self.labels, k)} {row[-1]}")
+        return out
+
+def render() -> str:
+    out = []
+    for m in _REGISTRY:
+        out += m.header() + m.lines()
+    return "\n".join(out) + "\n"
+
+# ---------- the app's metrics ----------
+STAGE_SECONDS = Histogram(
+    "phonefinder_stage_seconds", "Time spent per recommendation pipeline stage.", ("stage",))
+LLM_SECONDS = Histogram(
+    "phonefinder_llm_seconds", "Ollama call latency by call type and outcome.", ("call", "outcome"))
+HTTP_SECONDS = Histogram(
+    "phonefinder_http_request_seconds", "End-to-end request latency by route.", ("method", "route", "status"))
+RELAX_RUNGS = Counter(
+    "phonefinder_relaxation_total", "Relaxation rung candidates_multi stopped at.", ("rung",))
+LLM_FALLBACKS = Counter(
+    "phonefinder_llm_fallbacks_total", "LLM answers replaced by the heuristic fallback.", ("call",))
+CACHE_REQUESTS = Counter(
+    "phonefinder_cache_requests_total", "Cache lookups by cache and result (hit/miss).", ("cache", "result"))
+SESSIONS_CREATED = Counter(
+    "phonefinder_sessions_created_total", "Chat sessions started.")
+SESSIONS_ACTIVE = Gauge(
+    "phonefinder_sessions", "Chat sessions currently held in memory.")
+WARMUP_SECONDS = Gauge(
+    "phonefinder_warmup_seconds", "Startup warmup time per step.", ("step",))
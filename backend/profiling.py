@@ -0,0 +1,127 @@
+# backend/profiling.py
+"""
+Opt-in per-request wall-clock profiler.
+
+A request is profiled when it carries `X-Profile` equal to ADMIN_TOKEN or wins
+the PROFILE_SAMPLE_RATE draw; without ADMIN_TOKEN only sampling is possible. A sampler thread then reads
+the request thread's stack every PROFILE_INTERVAL_MS and, when the request
+ends, writes collapsed stacks (flamegraph.pl / speedscope / inferno input):
+
+    data/profiles/20250101T120000Z-chat_message-3f2a9c1e.folded
+    data/profiles/20250101T120000Z-chat_message-3f2a9c1e.json   (intent, timings)
+
+The root frame carries the normalized intent, so files for the same intent can
+be concatenated into one flamegraph:
+
+    cat data/profiles/*.folded | flamegraph.pl > chat.svg
+
+Disabled requests cost one random() draw.
+"""
+import hashlib, json, os, random, sys, threading, time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Optional
+
+PROFILE_DIR = os.getenv("PROFILE_DIR", "data/profiles")
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))  # 0.01 = 1% of requests
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "2"))
+PROFILE_TOKEN = os.getenv("ADMIN_TOKEN")
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+
+def _frame_label(code) -> str:
+    path = code.co_filename
+    short = os.path.basename(path) if path.startswith(_HERE) else path.rsplit(os.sep, 2)[-1]
+    return f"{code.co_name} ({short}:{code.co_firstlineno})"
+
+def intent_tag(intent: Optional[dict]) -> str:
+    """'budget=600,os=Android' from the non-empty intent fields (stable order)."""
+    parts = []
+    for k in sorted(intent or {}):
+        v = intent[k]
+        if v in (None, "", [], False):
+            continue
+        if isinstance(v, (list, tuple, set)):
+            v = "+".join(sorted(str(x) for x in v))
+        parts.append(f"{k}={v}")
+    # ';' separates frames and a trailing ' N' is the count in collapsed stacks
+    return (",".join(parts) or "empty").replace(";", ",").replace(" ", "_")
+
+class _NullProfile:
+    enabled = False
+    def __enter__(self): return self
+    def __exit__(self, *exc): return False
+    def tag(self, intent) -> None: pass
+
+_NULL = _NullProfile()
+
+class RequestProfile:
+    """Samples one thread's stack until exit, then writes .folded + .json."""
+    enabled = True
+
+    def __init__(self, endpoint: str, interval_s: float, out_dir: str):
+        self.endpoint, self.interval_s, self.out_dir = endpoint, interval_s, out_dir
+        self.samples: Counter = Counter()
+        self.intent: Optional[dict] = None
+        self._stop = threading.Event()
+
+    def tag(self, intent) -> None:
+        """Record the normalized intent this request ended up with."""
+        self.intent = dict(intent or {})
+
+    def _sample(self, tid: int) -> None:
+        me = sys._getframe()
+        while not self._stop.wait(self.interval_s):
+            f = sys._current_frames().get(tid)
+            if f is None:
+                break
+            stack = []
+            while f is not None and f is not me:
+                stack.append(_frame_label(f.f_code))
+                f = f.f_back
+            self.samples[tuple(reversed(stack))] += 1
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        self.started = datetime.now(timezone.utc)
+        self._thread = threading.Thread(target=self._sample, args=(threading.get_ident(),),
+                                        name=f"profile-{self.endpoint}", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        wall = time.perf_counter() - self.t0
+        try:
+            self._write(wall)
+        except Exception as e:
+            print("[profile] write failed:", e)
+        return False
+
+    def _write(self, wall_s: float) -> None:
+        tag = intent_tag(self.intent)
+        digest = hashlib.sha1(tag.encode("utf-8")).hexdigest()[:8]
+        stamp = self.started.strftime("%Y%m%dT%H%M%S%fZ")
+        base = os.path.join(self.out_dir, f"{stamp}-{self.endpoint}-{digest}")
+        os.makedirs(self.out_dir, exist_ok=True)
+        root = f"{self.endpoint}[{tag}]"
+        with open(base + ".folded", "w", encoding="utf-8") as f:
+            for stack, n in sorted(self.samples.items()):
+                f.write(";".join((root,) + stack) + f" {n}\n")
+        with open(base + ".json", "w", encoding="utf-8") as f:
+            json.dump({
+                "endpoint": self.endpoint, "started": self.started.isoformat(),
+                "wall_ms": round(wall_s * 1000, 3), "interval_ms": self.interval_s * 1000,
+                "samples": sum(self.samples.values()), "intent": self.intent, "intent_tag": tag,
+            }, f, indent=2, default=str)
+
+def request_profile(endpoint: str, header: Optional[str] = None):
+    """Context manager for one request: a RequestProfile when this request is
+    selected (header or sample rate), otherwise a shared no-op."""
+    # no token configured: the header is ignored, or any client could make every
+    # request run the sampler and write files to PROFILE_DIR
+    wanted = bool(PROFILE_TOKEN) and header == PROFILE_TOKEN
+    if not wanted and not (PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE):
+        return _NULL
+    return RequestProfile(endpoint, PROFILE_INTERVAL_MS / 1000.0, PROFILE_DIR)
@@ -0,0 +1,100 @@
+# backend/scoring.py
+"""
+Phone scores as a weight vector over a precomputed feature matrix.
+
+Each catalog snapshot gets one FeatureMatrix (see main.catalog_cached): the
+spec terms below, imputed and scaled once, one row per phone. Ranking a set of
+rows is then one product, F[rows] @ w. The over/under-budget term depends on
+the intent's budget, so it is added on top with its own weight.
+
+Weights come from the intent, in this order:
+
+  * the named preset (PRESETS; "balanced" is the historic ranking);
+  * camera_priority, which lifts the camera weight to at least CAMERA_PRIORITY;
+  * per-term overrides in intent["weights"], e.g. {"battery": 2, "year": 0.5}.
+"""
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+# (term, column, fill, offset, scale): term value = (column.fillna(fill) - offset) / scale
+SCORE_TERMS = (
+    ("year",    "ReleaseYear",  2018.0, 2017.0, 1.0),
+    ("battery", "Battery_mAh",  3000.0, 0.0,    1000.0),
+    ("camera",  "MainCameraMP", 12.0,   0.0,    12.0),
+    ("ram",     "RAM_GB",       4.0,    0.0,    4.0),
+    ("storage", "Storage_GB",   64.0,   0.0,    64.0),
+)
+TERMS = tuple(t for t, *_ in SCORE_TERMS)
+WEIGHT_KEYS = TERMS + ("budget",)
+
+PRESETS: Dict[str, Dict[str, float]] = {
+    "balanced":      {"year": 1.0, "battery": 0.8, "camera": 0.4, "ram": 0.3, "storage": 0.3, "budget": 1.0},
+    "battery-first": {"year": 0.6, "battery": 2.0, "camera": 0.3, "ram": 0.2, "storage": 0.2, "budget": 1.0},
+    "camera-first":  {"year": 0.8, "battery": 0.5, "camera": 2.0, "ram": 0.3, "storage": 0.3, "budget": 1.0},
+    "performance":   {"year": 1.2, "battery": 0.5, "camera": 0.3, "ram": 1.0, "storage": 0.6, "budget": 1.0},
+    "budget-first":  {"year": 1.0, "battery": 0.8, "camera": 0.4, "ram": 0.3, "storage": 0.3, "budget": 3.0},
+}
+DEFAULT_PRESET = "balanced"
+CAMERA_PRIORITY = 1.0
+MAX_WEIGHT = 10.0
+
+def features(df: pd.DataFrame) -> np.ndarray:
+    """(rows x TERMS) term values."""
+    cols = []
+    for _, c, fill, offset, scale in SCORE_TERMS:
+        v = pd.to_numeric(df[c], errors="coerce").to_numpy(dtype=float)
+        cols.append((np.where(np.isnan(v), fill, v) - offset) / scale)
+    return np.column_stack(cols) if len(df) else np.zeros((0, len(cols)))
+
+def budget_term(price: np.ndarray, budget) -> np.ndarray:
+    """Reward for headroom under the budget, penalty over it; unknown prices count as on budget."""
+    return np.clip(budget - np.where(np.isnan(price), budget, price), -999, 500) / 500.0
+
+def preset_name(value) -> Optional[str]:
+    s = str(value or "").strip().lower().replace("_", "-").replace(" ", "-")
+    return s if s in PRESETS else None
+
+def normalize_weights(value) -> Optional[Dict[str, float]]:
+    """{term: weight} from a dict or a "battery:2,year:0.5" string; unknown terms dropped, weights clipped."""
+    if isinstance(value, str):
+        pairs = [p.split(":", 1) for p in value.replace(";", ",").split(",") if ":" in p]
+        value = {k.strip(): v.strip() for k, v in pairs}
+    if not isinstance(value, dict):
+        return None
+    out = {}
+    for k, v in value.items():
+        k = str(k).strip().lower()
+        try:
+            v = float(v)
+        except (TypeError, ValueError):
+            continue
+        if k in WEIGHT_KEYS and v == v:
+            out[k] = min(max(v, 0.0), MAX_WEIGHT)
+    return dict(sorted(out.items())) or None
+
+def weights(intent: dict) -> Dict[str, float]:
+    w = dict(PRESETS[preset_name(intent.get("preset")) or DEFAULT_PRESET])
+    if intent.get("camera_priority"):
+        w["camera"] = max(w["camera"], CAMERA_PRIORITY)
+    w.update(intent.get("weights") or {})
+    return w
+
+def weight_vector(w: Dict[str, float]) -> np.ndarray:
+    return np.array([w[t] for t in TERMS])
+
+class FeatureMatrix:
+    def __init__(self, df: pd.DataFrame):
+        self.index = df.index
+        self.F = features(df)
+
+    def rows(self, d: pd.DataFrame) -> np.ndarray:
+        """Feature rows for a subset of the catalog this matrix was built from (by
+        index label). Labels do not identify a phone across snapshots, so frames
+        from another snapshot must use features(d) instead (see main.frame_cached)."""
+        pos = self.index.get_indexer(d.index)
+        if len(pos) and pos.min() < 0:
+            # labels this catalog never had (e.g. a frame built by hand)
+            return features(d)
+        return self.F[pos]
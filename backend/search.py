@@ -0,0 +1,145 @@
+# backend/search.py
+"""
+Name search over the catalog for typeahead (/phones/search?q=).
+
+Built once per catalog snapshot (see main.catalog_cached):
+
+  * every Brand + Model is split into lower-case alphanumeric tokens, plus
+    each pair of adjacent tokens joined ("pixel 8a" -> "pixel8a"), so
+    "iphone15" and "iphone 15" find the same phone;
+  * the distinct tokens are kept sorted, so all tokens starting with a prefix
+    are one bisect range, and each token maps to a numpy array of row ids;
+  * padded character trigrams map back to tokens, which bounds the typo search
+    to tokens sharing a trigram, checked with an edit distance of 1 (2 for
+    tokens of 8+ characters).
+
+A query matches a phone when every query token matches one of its tokens:
+exactly, as a prefix (the last token, still being typed) or within the typo
+distance. Scores add up per query token (exact > prefix > typo), ties go to
+shorter names, then newer phones; each Slug is listed once.
+"""
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+EXACT, PREFIX, TYPO = 3.0, 2.0, 1.0
+_TOKEN_CACHE_MAX = 4096
+
+def tokenize(text: str) -> List[str]:
+    out, cur = [], []
+    for ch in str(text).lower():
+        if ch.isalnum():
+            cur.append(ch)
+        elif cur:
+            out.append("".join(cur))
+            cur = []
+    if cur:
+        out.append("".join(cur))
+    return out
+
+def _trigrams(token: str) -> set:
+    t = f"  {token} "
+    return {t[i:i + 3] for i in range(len(t) - 2)}
+
+def _within(a: str, b: str, k: int) -> bool:
+    """Optimal string alignment distance(a, b) <= k, giving up early."""
+    if abs(len(a) - len(b)) > k:
+        return False
+    prev2, prev = None, list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i] + [0] * len(b)
+        for j, cb in enumerate(b, 1):
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb))
+            if prev2 is not None and i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        if min(cur) > k:
+            return False
+        prev2, prev = prev, cur
+    return prev[-1] <= k
+
+class PhoneSearchIndex:
+    def __init__(self, df: pd.DataFrame):
+        names = (df["Brand"].astype(str) + " " + df["Model"].astype(str)).tolist()
+        postings: Dict[str, List[int]] = defaultdict(list)
+        n_tokens = np.zeros(len(names), dtype=np.int32)
+        for i, name in enumerate(names):
+            toks = [t for t in tokenize(name) if t != "nan"]
+            n_tokens[i] = len(toks)
+            for t in set(toks + [a + b for a, b in zip(toks, toks[1:])]):
+                postings[t].append(i)
+
+        self.df = df
+        self.n = len(names)
+        self.vocab = sorted(postings)
+        self.postings = [np.asarray(postings[t], dtype=np.int32) for t in self.vocab]
+        self.trigrams: Dict[str, List[int]] = defaultdict(list)
+        for tid, t in enumerate(self.vocab):
+            for g in _trigrams(t):
+                self.trigrams[g].append(tid)
+        self.n_tokens = n_tokens
+        self.year = pd.to_numeric(df["ReleaseYear"], errors="coerce").fillna(0).to_numpy()
+        self.slug_codes = pd.factorize(df["Slug"].astype(str))[0]
+        self._expand_cache: Dict[tuple, list] = {}
+
+    def _prefix_range(self, prefix: str) -> range:
+        lo = bisect_left(self.vocab, prefix)
+        hi = bisect_left(self.vocab, prefix + "\uffff")
+        return range(lo, hi)
+
+    def _expand(self, q: str, as_prefix: bool) -> list:
+        """[(token id, weight)] that the query token q matches."""
+        key = (q, as_prefix)
+        hit = self._expand_cache.get(key)
+        if hit is not None:
+            return hit
+        found: Dict[int, float] = {}
+        if as_prefix:
+            for tid in self._prefix_range(q):
+                found[tid] = EXACT if self.vocab[tid] == q else PREFIX
+        else:
+            tid = bisect_left(self.vocab, q)
+            if tid < len(self.vocab) and self.vocab[tid] == q:
+                found[tid] = EXACT
+        if not found and len(q) >= 3:
+            k = 2 if len(q) >= 8 else 1
+            grams = _trigrams(q)
+            shared = Counter(tid for g in grams for tid in self.trigrams.get(g, ()))
+            # k edits break at most 3k of q's trigrams (+1: a prefix loses its end-padded one)
+            need = len(grams) - 3 * k - (1 if as_prefix else 0)
+            for tid, c in shared.items():
+                if c < need:
+                    continue
+                t = self.vocab[tid]
+                # a half-typed last token is compared with the heads of t it could be a typo of
+                heads = {t[:n] for n in range(len(q) - k, len(q) + k + 1)} if as_prefix else (t,)
+                if any(_within(q, h, k) for h in heads):
+                    found[tid] = TYPO
+        out = sorted(found.items())
+        if len(self._expand_cache) >= _TOKEN_CACHE_MAX:
+            self._expand_cache.clear()
+        self._expand_cache[key] = out
+        return out
+
+    def search(self, query: str, limit: int = 10) -> pd.DataFrame:
+        """Best `limit` catalog rows for the query, best first, with a `_match` score column."""
+        toks = tokenize(query)
+        if not toks or self.n == 0:
+            return self.df.iloc[0:0].assign(_match=[])
+        total: Optional[np.ndarray] = None
+        for i, q in enumerate(toks):
+            score = np.zeros(self.n, dtype=np.float32)
+            for tid, w in self._expand(q, as_prefix=(i == len(toks) - 1)):
+                rows = self.postings[tid]  # distinct ids, so a gather/scatter max is safe
+                score[rows] = np.maximum(score[rows], w)
+            total = score if total is None else np.where((total > 0) & (score > 0), total + score, 0)
+            if not total.any():
+                return self.df.iloc[0:0].assign(_match=[])
+        hits = np.flatnonzero(total)
+        ranked = hits[np.lexsort((-self.year[hits], self.n_tokens[hits], -total[hits]))]
+        # one row per Slug (the same phone listed for several years): keep the best-ranked
+        _, first = np.unique(self.slug_codes[ranked], return_index=True)
+        top = ranked[np.sort(first)][:max(0, limit)]
+        return self.df.iloc[top].assign(_match=total[top])
@@ -0,0 +1,141 @@
+# backend/similar.py
+"""
+"Phones like this one" (/phones/{slug}/similar).
+
+A SpecIndex is built once per catalog snapshot (see main.catalog_cached). It
+holds one float32 row per phone:
+
+  * the numeric spec columns, imputed with the column median, log-scaled where
+    the spread is multiplicative (price, memory), z-scored and weighted;
+  * one 0/1 column per NotableFeatures label, at FEATURE_WEIGHT.
+
+A query is one vectorized squared-distance pass over the matrix, restricted
+by an optional price ceiling / "cheaper than this" / OS mask, then an
+argpartition for the k nearest. Answers are cached on the index, so per slug
+and catalog version.
+"""
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# column -> (weight, log-scale)
+SPEC_WEIGHTS: Dict[str, Tuple[float, bool]] = {
+    "PriceUSD":      (1.5, True),
+    "ReleaseYear":   (1.0, False),
+    "DisplayInches": (1.0, False),
+    "Battery_mAh":   (0.8, False),
+    "RAM_GB":        (0.8, True),
+    "Storage_GB":    (0.6, True),
+    "MainCameraMP":  (0.6, True),
+    "Weight_g":      (0.4, False),
+}
+FEATURE_WEIGHT = 0.5
+MAX_FEATURES = 16
+CACHE_SIZE = 4096
+OS_MASKS = 8            # distinct ?os= values kept (each is one bool per phone)
+
+class SpecIndex:
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        cols = []
+        for c, (w, log) in SPEC_WEIGHTS.items():
+            v = pd.to_numeric(df[c], errors="coerce").astype(float) if c in df.columns else pd.Series(np.nan, index=df.index)
+            if log:
+                v = np.log1p(v.clip(lower=0))
+            v = v.fillna(v.median() if v.notna().any() else 0.0)
+            std = v.std()
+            cols.append(((v - v.mean()) / std if std and std == std else v * 0.0).to_numpy() * w)
+
+        # one-hot per distinct NotableFeatures string (a few hundred), broadcast to rows
+        codes, uniq = pd.factorize(df["NotableFeatures"].astype(str))
+        feats = pd.Series(uniq, dtype=object).str.get_dummies(sep="; ")
+        feats = feats.drop(columns=[c for c in ("nan", "None", "") if c in feats.columns])
+        counts = pd.Series(np.bincount(codes, minlength=len(uniq)) @ feats.to_numpy(), index=feats.columns)
+        self.features = list(counts.sort_values(ascending=False, kind="stable").index[:MAX_FEATURES])
+        cols += [feats[c].to_numpy()[codes] * FEATURE_WEIGHT for c in self.features]
+
+        self.X = np.column_stack(cols).astype(np.float32) if len(df) else np.zeros((0, len(cols)), np.float32)
+        self.sq = np.einsum("ij,ij->i", self.X, self.X)
+        self.price = pd.to_numeric(df["PriceUSD"], errors="coerce").to_numpy(dtype=float)
+        self.year = pd.to_numeric(df["ReleaseYear"], errors="coerce").fillna(0).to_numpy()
+        self.os = df["OS"].astype(str).str.lower()
+        self.slug_codes, slugs = pd.factorize(df["Slug"].astype(str))
+        # a slug listed for several years resolves to its newest row
+        newest = pd.Series(self.year).groupby(self.slug_codes).idxmax()
+        self.slug_row = {slugs[code]: int(row) for code, row in newest.items()}
+
+        self._os_masks: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._cache: "OrderedDict[tuple, List[Tuple[int, float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def row_for(self, slug: str) -> Optional[int]:
+        return self.slug_row.get(slug)
+
+    def _os_mask(self, os_name: str) -> np.ndarray:
+        key = os_name.lower()
+        with self._lock:
+            m = self._os_masks.get(key)
+            if m is not None:
+                self._os_masks.move_to_end(key)
+                return m
+        # same rule as filter_df_by_intent: case-insensitive substring
+        m = self.os.str.contains(key, regex=False, na=False).to_numpy()
+        with self._lock:
+            self._os_masks[key] = m
+            if len(self._os_masks) > OS_MASKS:
+                self._os_masks.popitem(last=False)
+        return m
+
+    def neighbours(self, slug: str, k: int = 10, max_price: Optional[float] = None,
+                   cheaper: bool = False, os_name: Optional[str] = None) -> Optional[List[Tuple[int, float]]]:
+        """[(row position, distance)] nearest first, one per Slug, or None for an unknown slug."""
+        q = self.row_for(slug)
+        if q is None:
+            return None
+        key = (slug, k, max_price, cheaper, (os_name or "").lower())
+        with self._lock:
+            hit = self._cache.get(key)
+            if hit is not None:
+                self._cache.move_to_end(key)
+                return hit
+
+        ok = self.slug_codes != self.slug_codes[q]
+        if max_price is not None:
+            ok &= self.price <= max_price
+        if cheaper and self.price[q] == self.price[q]:
+            ok &= self.price < self.price[q]
+        if os_name:
+            ok &= self._os_mask(os_name)
+        n_ok = int(ok.sum())
+
+        # |x - q|^2 = |x|^2 - 2 x.q + |q|^2: one matrix-vector product over the
+        # whole matrix (cheaper than gathering the allowed rows), the rest masked out
+        d2 = self.sq - 2.0 * (self.X @ self.X[q]) + self.sq[q]
+        d2[~ok] = np.inf
+        # over-fetch: a slug can have several year rows among the nearest
+        m = k * 4
+        while True:
+            m = min(m, n_ok)
+            part = np.argpartition(d2, m - 1)[:m] if 0 < m < len(d2) else np.flatnonzero(ok)
+            part = part[np.argsort(d2[part], kind="stable")]
+            out, seen = [], set()
+            for i in part:
+                code = self.slug_codes[i]
+                if code in seen:
+                    continue
+                seen.add(code)
+                out.append((int(i), float(np.sqrt(max(d2[i], 0.0)))))
+                if len(out) == k:
+                    break
+            if len(out) == k or m == n_ok:
+                break
+            m *= 4
+
+        with self._lock:
+            self._cache[key] = out
+            if len(self._cache) > CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return out
@@ -0,0 +1,133 @@
+# backend/skyline.py
+"""
+Pareto skyline over price versus specs: the "best value" phones.
+
+A phone is on the skyline when no other phone is at least as cheap and at
+least as good on battery, main camera, RAM, storage and release year, while
+being strictly better somewhere. Phones without a known price are never on it;
+a missing spec counts as the worst value.
+
+The skyline is computed with a blocked sort-filter pass instead of comparing
+all pairs: rows are sorted so that a dominating row always comes first, then
+each block is checked against the skyline found so far (dropping rows as soon
+as one skyline chunk dominates them) and finally against itself.
+
+A SkylineIndex is built once per catalog snapshot (see main.catalog_cached),
+one skyline per OS family. Budget bands need no extra work: price is one of
+the minimized dimensions, so anything dominating a phone under $X is itself
+under $X, and the skyline of "phones under $X" is exactly the skyline's rows
+priced up to X. Each family's skyline is kept sorted by price, which turns
+"best value under $X" into a bisect.
+"""
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# columns where more is better; price is the one minimized dimension
+VALUE_SPECS = ("Battery_mAh", "MainCameraMP", "RAM_GB", "Storage_GB", "ReleaseYear")
+FAMILIES = ("ios", "android", "other")
+BLOCK = 512
+CHUNK = 128
+
+def os_family(os_name) -> str:
+    s = str(os_name or "").lower()
+    # Android skins can carry "ios" in their name ("Android 13, HIOS 12.6")
+    return "android" if "android" in s else ("ios" if "ios" in s else "other")
+
+def value_matrix(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """(ranks, priced): one int32 row per phone, lower is better in every column.
+    Values are replaced by their dense rank, which keeps dominance intact and
+    puts every column on the same scale for the sort."""
+    price = pd.to_numeric(df["PriceUSD"], errors="coerce").to_numpy(dtype=float)
+    priced = (price == price) & (price > 0)
+    cols = [np.where(priced, price, np.inf)]
+    for c in VALUE_SPECS:
+        v = pd.to_numeric(df[c], errors="coerce").to_numpy(dtype=float) if c in df.columns else np.full(len(df), np.nan)
+        cols.append(-np.where(v == v, v, -np.inf))
+    ranks = [np.unique(c, return_inverse=True)[1].reshape(-1) for c in cols]
+    M = np.column_stack(ranks).astype(np.int32) if len(df) else np.zeros((0, len(cols)), np.int32)
+    return M, priced
+
+def skyline_mask(M: np.ndarray) -> np.ndarray:
+    """Rows of M (lower is better) not dominated by any other row; exact duplicates share the verdict."""
+    if len(M) == 0:
+        return np.zeros(0, dtype=bool)
+    uniq, inv = np.unique(M, axis=0, return_inverse=True)
+    # ranks are integers, so a dominating row has a strictly smaller sum and is seen first
+    order = np.argsort(uniq.sum(axis=1, dtype=np.int64), kind="stable")
+    P = uniq[order]
+    keep = np.zeros(len(P), dtype=bool)
+    sky = np.zeros((0, P.shape[1]), dtype=P.dtype)
+    for s in range(0, len(P), BLOCK):
+        B = P[s:s + BLOCK]
+        alive = np.arange(len(B))
+        for c in range(0, len(sky), CHUNK):
+            if not len(alive):
+                break
+            S = sky[c:c + CHUNK]
+            # rows are distinct, so "<= everywhere" already means dominated
+            alive = alive[~(S[None, :, :] <= B[alive][:, None, :]).all(axis=2).any(axis=1)]
+        Bb = B[alive]
+        inner = (Bb[:, None, :] <= Bb[None, :, :]).all(axis=2)
+        np.fill_diagonal(inner, False)
+        alive = alive[~inner.any(axis=0)]
+        keep[s + alive] = True
+        sky = np.vstack([sky, B[alive]])
+    on = np.zeros(len(uniq), dtype=bool)
+    on[order[keep]] = True
+    return on[inv.reshape(-1)]
+
+def pareto_layers(df: pd.DataFrame, need: int) -> np.ndarray:
+    """Layer per row (0 = skyline of df, 1 = skyline of the rest, ...), peeling
+    until at least `need` rows have one; the others (and unpriced rows) get inf."""
+    M, priced = value_matrix(df)
+    layer = np.full(len(df), np.inf)
+    rest = np.flatnonzero(priced)
+    k, done = 0, 0
+    while len(rest) and done < need:
+        on = skyline_mask(M[rest])
+        layer[rest[on]] = k
+        done += int(on.sum())
+        rest = rest[~on]
+        k += 1
+    return layer
+
+class SkylineIndex:
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        M, priced = value_matrix(df)
+        price = np.where(priced, pd.to_numeric(df["PriceUSD"], errors="coerce").to_numpy(dtype=float), np.inf)
+        family = df["OS"].map(os_family).to_numpy()
+        self.slug_codes = pd.factorize(df["Slug"].astype(str))[0]
+
+        # on[i]: row i is on its own OS family's skyline (the BestValue flag)
+        self.on = np.zeros(len(df), dtype=bool)
+        self.rows: Dict[str, np.ndarray] = {}
+        self.prices: Dict[str, np.ndarray] = {}
+        for fam in FAMILIES + (None,):
+            pos = np.flatnonzero(priced & (family == fam)) if fam else np.flatnonzero(priced)
+            sky = pos[skyline_mask(M[pos])]
+            if fam:
+                self.on[sky] = True
+            sky = sky[np.argsort(price[sky], kind="stable")]
+            self.rows[fam or "all"], self.prices[fam or "all"] = sky, price[sky]
+        self.flag = pd.Series(self.on, index=df.index)
+
+    def best_value(self, max_price: Optional[float] = None, os_name: Optional[str] = None,
+                   limit: int = 10) -> List[int]:
+        """Row positions on the skyline priced <= max_price, priciest (best specced) first, one per Slug."""
+        key = os_family(os_name) if os_name else "all"
+        rows = self.rows[key]
+        if max_price is not None:
+            rows = rows[:int(np.searchsorted(self.prices[key], max_price, side="right"))]
+        out, seen = [], set()
+        for i in rows[::-1]:
+            code = self.slug_codes[i]
+            if code in seen:
+                continue
+            seen.add(code)
+            out.append(int(i))
+            if len(out) == limit:
+                break
+        return out
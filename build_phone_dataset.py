@@ -1,4 +1,5 @@
-import argparse, re, csv
+import argparse, re, csv, codecs, os, functools, hashlib, json, sqlite3, tempfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import pandas as pd
 import numpy as np
@@ -39,41 +40,100 @@ def col(df, keys):
             if lc.startswith(k): return orig
     return None
 
-def sniff_sep(path: Path, default=","):
+def _sniff_text(sample: str, default=","):
     try:
-        with path.open("r", encoding="utf-8", errors="ignore") as f:
-            sample = f.read(4096)
         dialect = csv.Sniffer().sniff(sample, delimiters=[",",";","|","\t"])
         return dialect.delimiter
     except Exception:
-        first_line = sample.splitlines()[0] if 'sample' in locals() and sample else ""
+        first_line = sample.splitlines()[0] if sample else ""
         if first_line.count(";") > first_line.count(","): return ";"
         return default
 
-def read_csv_smart(p: Path):
-    tries = []
-    try:
-        sep = sniff_sep(p)
-        df = pd.read_csv(p, sep=sep, engine="python")
-        return df, None
-    except Exception as e:
-        tries.append(f"sniff:{e}")
-    try:
-        df = pd.read_csv(p)
-        return df, None
-    except Exception as e:
-        tries.append(f"default:{e}")
+def sniff_sep(path: Path, default=","):
     try:
-        df = pd.read_csv(p, engine="python", on_bad_lines="skip")
-        return df, None
-    except Exception as e:
-        tries.append(f"python-skip:{e}")
+        with path.open("r", encoding="utf-8", errors="ignore") as f:
+            sample = f.read(4096)
+    except Exception:
+        return default
+    return _sniff_text(sample, default)
+
+def detect_dialect(p: Path, sample_bytes: int = 1 << 16) -> dict:
+    """
+    read_csv options from one small read of the file head: the delimiter (as
+    sniff_sep picks it) and utf-8 unless the sample doesn't decode as utf-8.
+    """
+    with p.open("rb") as f:
+        raw = f.read(sample_bytes)
     try:
-        df = pd.read_csv(p, engine="python", on_bad_lines="skip", encoding="latin-1")
-        return df, None
-    except Exception as e:
-        tries.append(f"latin1:{e}")
-    return pd.DataFrame(), " | ".join(tries)
+        # incremental decode: a multi-byte char cut at the sample edge is fine
+        text, encoding = codecs.getincrementaldecoder("utf-8")().decode(raw, final=False), "utf-8"
+    except UnicodeDecodeError:
+        text, encoding = raw.decode("latin-1"), "latin-1"
+    return {"sep": _sniff_text(text[:4096]), "encoding": encoding}
+
+# Successful read options by file content hash, so a file seen before is read
+# with the option that worked last time. Filled in-process and persisted by
+# IngestCache.
+DIALECTS: dict = {}
+
+def _read_attempts(p: Path, dialect: dict = None):
+    """
+    read_csv options to try in order, with the name used in error reports.
+    One C-engine parse covers well-formed files; the python engine is only
+    tried when the C tokenizer can't cope, latin-1 only when utf-8 fails.
+    low_memory=False keeps dtype inference whole-column, like the python engine.
+    """
+    if dialect and "engine" in dialect:
+        yield "cached", dict(dialect)
+    d = dialect or detect_dialect(p)
+    base = {"sep": d["sep"], "encoding": d["encoding"]}
+    yield "c", dict(base, engine="c", low_memory=False)
+    yield "c-skip", dict(base, engine="c", low_memory=False, on_bad_lines="skip")
+    if d["encoding"] != "latin-1":
+        # non-utf-8 bytes past the sample: still a C parse
+        yield "c-latin1", dict(base, engine="c", low_memory=False, on_bad_lines="skip", encoding="latin-1")
+    yield "python-skip", dict(base, engine="python", on_bad_lines="skip")
+    if d["encoding"] != "latin-1":
+        yield "latin1", dict(base, engine="python", on_bad_lines="skip", encoding="latin-1")
+
+def read_csv_once(p: Path, dialect: dict = None):
+    """(frame, error, options that worked). Normally exactly one parse."""
+    tries = []
+    for name, kw in _read_attempts(p, dialect):
+        try:
+            df = pd.read_csv(p, **kw)
+            return df, None, kw
+        except Exception as e:
+            tries.append(f"{name}:{e}")
+    return pd.DataFrame(), " | ".join(tries), None
+
+def read_csv_smart(p: Path):
+    df, err, _ = read_csv_once(p)
+    return df, err
+
+def read_csv_chunks(p: Path, chunksize: int, dialect: dict = None):
+    """
+    Chunked read_csv_smart: the first option that yields a first chunk is used
+    for the whole file. Returns (chunk iterator, error). Chunks come with a
+    fresh 0..n index, like a small file read whole.
+    """
+    tries = []
+    for name, kw in _read_attempts(p, dialect):
+        kw.pop("low_memory", None)  # per-chunk inference either way
+        try:
+            reader = pd.read_csv(p, chunksize=chunksize, **kw)
+            first = next(reader, None)
+        except Exception as e:
+            tries.append(f"{name}:{e}")
+            continue
+        def chunks(first=first, reader=reader):
+            with reader:
+                if first is not None:
+                    yield first.reset_index(drop=True)
+                for c in reader:
+                    yield c.reset_index(drop=True)
+        return chunks(), None
+    return iter(()), " | ".join(tries)
 
 # ---------- PARSERS (robust) ----------
 def parse_year(s):
@@ -169,6 +229,148 @@ def parse_weight_g(s):
         if 80 <= x <= 350: return x
     return np.nan
 
+# ---------- VECTORIZED PARSERS ----------
+# Column-at-a-time versions of the parsers above, used by ingest. Each one
+# returns exactly what `series.apply(parse_x)` returns: the same regexes, run
+# through pandas' str.extract/extractall, with the branch order kept by
+# resolving rows in the scalar parser's order and only looking at rows that
+# are still unresolved. Scraped columns repeat heavily (5k rows, ~500 distinct
+# display strings), so each parser runs on the distinct values only and the
+# result is broadcast back. The scalar parsers stay as the reference.
+_NUM = r"(\d+(?:\.\d+)?)"
+
+def _per_unique(parse):
+    """Run a column parser on the distinct values and broadcast back to every row."""
+    @functools.wraps(parse)
+    def run(s: pd.Series) -> pd.Series:
+        codes, uniq = pd.factorize(s, use_na_sentinel=False)
+        if len(uniq) == len(s):
+            return parse(s)
+        res = parse(pd.Series(uniq, dtype=s.dtype))
+        return pd.Series(res.to_numpy()[codes], index=s.index, name=s.name)
+    return run
+
+def _text(s: pd.Series) -> pd.Series:
+    return s.astype(str).str.lower()
+
+def _extract_float(t: pd.Series, pat: str) -> pd.Series:
+    """First match of the pattern's group as float (NaN where no match)."""
+    return t.str.extract(pat, expand=False).astype(float)
+
+def _all_floats(t: pd.Series, pat: str = _NUM) -> pd.Series:
+    """Every match in every cell, as floats indexed by (row, match)."""
+    return t.str.extractall(pat)[0].astype(float)
+
+def _first_in_range(nums: pd.Series, lo: float, hi: float, index) -> pd.Series:
+    ok = nums[(nums >= lo) & (nums <= hi)]
+    return ok.groupby(level=0).first().reindex(index)
+
+def _round1(v: pd.Series) -> pd.Series:
+    # Python's round, not np.round: they can disagree on halves
+    return v.map(lambda x: round(x, 1) if x == x else x)
+
+def _sub(t: pd.Series, mask: pd.Series) -> pd.Series:
+    return t[mask.to_numpy()]
+
+@_per_unique
+def parse_year_vec(s: pd.Series) -> pd.Series:
+    y = pd.to_numeric(s, errors="coerce")
+    out = pd.Series(np.nan, index=s.index)
+    ok = (y >= 1995) & (y <= 2035)
+    out[ok] = np.trunc(y[ok])
+    rest = ~ok & s.notna()
+    if rest.any():
+        out[rest] = _extract_float(_sub(s.astype(str), rest), r"(20\d{2})")
+    # apply() on all-int results gives int64; keep that
+    return out.astype("int64") if len(out) and out.notna().all() else out
+
+@_per_unique
+def parse_inches_vec(s: pd.Series) -> pd.Series:
+    t = _text(s)
+    v = _extract_float(t, _NUM + r"\s*(?:inches|inch|\"|in\b)")
+    out = v.where((v >= 3.0) & (v <= 8.5))
+    rest = v.isna()
+    if rest.any():
+        out[rest] = _first_in_range(_all_floats(_sub(t, rest)), 3.0, 8.5, out.index[rest])
+    return out
+
+@_per_unique
+def parse_mah_vec(s: pd.Series) -> pd.Series:
+    t = _text(s)
+    out = _extract_float(t, r"(\d{3,5})\s*m?ah")
+    rest = out.isna()
+    if rest.any():
+        out[rest] = _first_in_range(_all_floats(_sub(t, rest), r"(\d{3,5})"), 1500, 10000, out.index[rest])
+    return out
+
+@_per_unique
+def parse_ram_gb_vec(s: pd.Series) -> pd.Series:
+    t = _text(s)
+    out = pd.Series(np.nan, index=t.index)
+    has = lambda unit: t.str.contains(unit, regex=False)
+    slash, tb, gb, mb = has("/"), has("tb"), has("gb"), has("mb")
+
+    # "8/128": first number, MB -> GB when clearly in MB (falls through if no number)
+    first = _extract_float(t, _NUM)
+    done = slash & first.notna()
+    in_mb = done & mb & ~gb & (first > 64)
+    out[done] = first[done]
+    out[in_mb] = _round1(first[in_mb] / 1024)
+
+    rest = ~done & tb
+    out[rest] = _extract_float(_sub(t, rest), _NUM + r"\s*tb") * 1024
+    done |= rest
+    rest = ~done & gb
+    out[rest] = _extract_float(_sub(t, rest), _NUM + r"\s*gb")
+    done |= rest
+    rest = ~done & mb
+    out[rest] = _round1(_extract_float(_sub(t, rest), r"(\d{2,4})\s*mb") / 1024)
+    done |= rest
+    rest = ~done
+    n = _extract_float(_sub(t, rest), r"(\d{1,3}(?:\.\d+)?)")
+    out[rest] = n.where(n <= 64, _round1(n / 1024))
+    return out
+
+@_per_unique
+def parse_storage_gb_vec(s: pd.Series) -> pd.Series:
+    t = _text(s)
+    out = pd.Series(np.nan, index=t.index)
+    has = lambda unit: t.str.contains(unit, regex=False)
+    nmax = _all_floats(t).groupby(level=0).max().reindex(t.index)
+
+    tb_val = _extract_float(t, _NUM + r"\s*tb") * 1024
+    done = has("tb") & tb_val.notna()
+    out[done] = tb_val[done]
+    rest = ~done & (has("gb") | has("/"))
+    out[rest] = nmax[rest]
+    done |= rest
+    rest = ~done & has("mb") & nmax.notna()
+    out[rest] = _round1(nmax[rest] / 1024)
+    done |= rest
+    out[~done] = nmax[~done]
+    return out
+
+@_per_unique
+def parse_camera_mp_vec(s: pd.Series) -> pd.Series:
+    t = _text(s)
+    out = _extract_float(t, _NUM + r"\s*mp")
+    rest = out.isna()
+    if rest.any():
+        out[rest] = _first_in_range(_all_floats(_sub(t, rest)), 2, 250, out.index[rest])
+    return out
+
+@_per_unique
+def parse_weight_g_vec(s: pd.Series) -> pd.Series:
+    t = _text(s)
+    out = _round1(_extract_float(t, _NUM + r"\s*oz") * 28.3495)
+    rest = out.isna()
+    if rest.any():
+        out[rest] = _extract_float(_sub(t, rest), _NUM + r"\s*g\b")
+    rest = out.isna()
+    if rest.any():
+        out[rest] = _first_in_range(_all_floats(_sub(t, rest)), 80, 350, out.index[rest])
+    return out
+
 def infer_brand_from_model(model_str):
     if not isinstance(model_str, str): return None
     s = model_str.strip().lower()
@@ -189,79 +391,359 @@ FEATURE_KEYS = {
     "Fast charging": ["fast charge","fast charging","supercharge","warp charge","quick charge"]
 }
 
-def load_any_csvs(raw_dir: Path, debug=False):
+def map_columns(df: pd.DataFrame) -> dict:
+    """Raw column picked for each field (None when nothing matches)."""
+    return {field: col(df, keys) for field, keys in SYN.items()}
+
+# ---------- SOURCE ADAPTERS ----------
+# A scraped source keeps its header from one dump to the next, so a header
+# fingerprint identifies the source. A registered adapter fixes the column
+# mapping (no fuzzy col() lookup, no wrong prefix matches) and can add parsers
+# for that source's formats, e.g. one pass over "12 GB RAM | 256 GB Storage"
+# for both RAM and storage. Headers without an adapter take the fuzzy path and
+# are written to --unknown_headers with what col() picked, ready to be turned
+# into an adapter.
+ADAPTERS = {}  # header fingerprint -> {"name", "mapped", "parse"}
+
+# brand spelling in the catalog, where str.title() gets it wrong
+BRAND_NAMES = {"oneplus": "OnePlus", "iqoo": "iQOO", "poco": "POCO", "lg": "LG", "zte": "ZTE", "tcl": "TCL",
+               "htc": "HTC", "xolo": "XOLO", "redmagic": "RedMagic", "moto": "Motorola", "i kall": "I Kall"}
+_LEAD_BRAND = r"^\s*(i kall|\S+)\s+(.+?)\s*$"  # two-word brands first, else the first word
+
+INR_PER_USD = 83.0  # ₹ list prices -> USD; rough, but on the same scale as the other sources
+
+def header_fingerprint(columns) -> str:
+    """Stable id of a header: column names, case/whitespace/order-insensitive."""
+    names = sorted(str(c).strip().lower() for c in columns)
+    return hashlib.sha1("\n".join(names).encode("utf-8")).hexdigest()[:16]
+
+def register_adapter(name: str, columns, mapped: dict, parse=None) -> None:
+    """
+    Register a known source by its header. `mapped` gives the raw column per
+    SYN field (missing fields are None); `parse(df)` may return
+    {SCHEMA column: Series} that replaces the generic parser for those columns.
+    """
+    ADAPTERS[header_fingerprint(columns)] = {"name": name, "mapped": {**dict.fromkeys(SYN), **mapped}, "parse": parse}
+
+def resolve_adapter(df: pd.DataFrame) -> dict:
+    """Registered adapter for df's header, else one built from the fuzzy lookup (name "")."""
+    fp = header_fingerprint(df.columns)
+    ad = ADAPTERS.get(fp)
+    if ad is None:
+        return {"name": "", "fingerprint": fp, "mapped": map_columns(df), "parse": None}
+    return {**ad, "fingerprint": fp}
+
+def _none_for_na(s: pd.Series) -> pd.Series:
+    # parse_frame drops rows whose Brand/Model is None (NaN would become "nan")
+    return s.astype(object).where(s.notna(), None)
+
+def canonical_brand(s: pd.Series) -> pd.Series:
+    low = s.astype(str).str.strip().str.lower()
+    return _none_for_na(low.map(BRAND_NAMES).fillna(low.str.title()).where(s.notna()))
+
+def split_brand_model(names: pd.Series):
+    """'Samsung Galaxy S24' -> ('Samsung', 'Galaxy S24'), for sources whose names lead with the brand."""
+    parts = names.astype(str).str.extract(_LEAD_BRAND, flags=re.I)
+    return canonical_brand(parts[0]), _none_for_na(parts[1])
+
+_MEM_SPLIT = (r"^\s*(?:" + _NUM + r"\s*(kb|mb|gb|tb)\s*ram)?[\s|]*"
+              r"(?:" + _NUM + r"\s*(kb|mb|gb|tb)\s*storage)?")
+_GB_PER = {"kb": 1 / 1024 ** 2, "mb": 1 / 1024, "gb": 1.0, "tb": 1024.0}
+
+def _mem_gb(num: pd.Series, unit: pd.Series) -> pd.Series:
+    return _round1(num.astype(float) * unit.map(_GB_PER).astype(float))
+
+def _parse_mysmartprice(df: pd.DataFrame) -> dict:
+    brand, model = split_brand_model(df["mobile_name"])
+    # "12 GB RAM | 256 GB Storage" (either half may be missing): split once, per distinct value
+    mem = df["ram_and_storage"]
+    codes, uniq = pd.factorize(mem, use_na_sentinel=False)
+    parts = _text(pd.Series(uniq, dtype=object)).str.extract(_MEM_SPLIT)
+    ram, storage = _mem_gb(parts[0], parts[1]).to_numpy(), _mem_gb(parts[2], parts[3]).to_numpy()
+    price = pd.to_numeric(df["price"].astype(str).str.replace(r"[^\d.]", "", regex=True), errors="coerce")
+    return {
+        "Brand": brand, "Model": model,
+        "PriceUSD": (price / INR_PER_USD).round(2),
+        "RAM_GB": pd.Series(ram[codes], index=df.index),
+        "Storage_GB": pd.Series(storage[codes], index=df.index),
+        # "200+50+12 MP Rear Camera": the main sensor is listed first
+        "MainCameraMP": _extract_float(_text(df["rear_camera"]), r"^\s*" + _NUM),
+    }
+
+register_adapter(
+    "mysmartprice",
+    ["Unnamed: 0", "mobile_name", "release_date", "price", "avg_rating", "total_ratings", "cpu",
+     "rear_camera", "front_camera", "display", "ram_and_storage", "battery_and_charging_speed",
+     "operating_system", "5G|NFC|Fingerprint", "expert_view"],
+    {"model": "mobile_name", "release": "release_date", "price": "price", "display": "display",
+     "battery": "battery_and_charging_speed", "ram": "ram_and_storage", "storage": "ram_and_storage",
+     "camera": "rear_camera", "os": "operating_system", "features": "5G|NFC|Fingerprint"},
+    _parse_mysmartprice,
+)
+
+def _parse_phone_news(df: pd.DataFrame) -> dict:
+    # phone_model repeats the brand ("Samsung Galaxy A22"); drop it when it does
+    lead, rest = split_brand_model(df["phone_model"])
+    brand = canonical_brand(df["phone_brand"])
+    model = _none_for_na(df["phone_model"].astype(str).str.strip().where(df["phone_model"].notna()))
+    return {"Brand": brand, "Model": rest.where((lead == brand) & rest.notna(), model)}
+
+register_adapter(
+    "phone_news",
+    ["phone_brand", "phone_model", "store", "price", "currency", "price_USD", "storage", "ram", "Launch",
+     "Dimensions", "Weight", "Display_Type", "Display_Size", "Display_Resolution", "OS", "NFC", "USB",
+     "BATTERY", "Features_Sensors", "Colors", "Video", "Chipset", "CPU", "GPU", "Year", "Foldable",
+     "PPI_Density", "quantile_10", "quantile_50", "quantile_90", "price_range"],
+    {"brand": "phone_brand", "model": "phone_model", "release": "Year", "price": "price_USD",
+     "display": "Display_Size", "battery": "BATTERY", "ram": "ram", "storage": "storage", "os": "OS",
+     "weight": "Weight", "features": "Features_Sensors"},
+    _parse_phone_news,
+)
+
+def record_unknown_headers(report: pd.DataFrame, path: str) -> None:
+    """Merge headers that had no adapter into `path` (fingerprint -> columns, fuzzy mapping, files)."""
+    if not path or report.empty or "adapter" not in report:
+        return
+    try:
+        with open(path, encoding="utf-8") as f:
+            seen = json.load(f)
+    except (OSError, ValueError):
+        seen = {}
+    seen = {fp: e for fp, e in seen.items() if fp not in ADAPTERS}
+    for rep in report[(report["adapter"] == "") & report["header"].map(bool)].to_dict("records"):
+        e = seen.setdefault(rep["fingerprint"], {"columns": list(rep["header"]), "mapped": rep["mapped"], "files": []})
+        if rep["file"] not in e["files"]:
+            e["files"].append(rep["file"])
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(seen, f, indent=2, ensure_ascii=False)
+
+def parse_frame(df: pd.DataFrame, mapped: dict, p: Path, parse=None) -> pd.DataFrame:
+    """Raw rows -> SCHEMA-shaped rows (a whole file, or one chunk of it)."""
+    b, m, y, pr, di, bt, ra, st, ca, os_, we, fe = (mapped[k] for k in SYN)
+    own = parse(df) if parse else {}  # adapter parsers win over the generic ones
+
+    def field(name, raw, fn):
+        if name in own:
+            return own[name]
+        return fn(df[raw]) if raw else np.nan
+
+    tmp = pd.DataFrame()
+    tmp["Brand"] = own["Brand"] if "Brand" in own else (df[b] if b else None)
+    tmp["Model"] = own["Model"] if "Model" in own else (df[m] if m else None)
+    tmp["ReleaseYear"] = field("ReleaseYear", y, parse_year_vec)
+    tmp["PriceUSD"] = field("PriceUSD", pr, lambda s: pd.to_numeric(s, errors="coerce"))
+    tmp["DisplayInches"] = field("DisplayInches", di, parse_inches_vec)
+    tmp["Battery_mAh"] = field("Battery_mAh", bt, parse_mah_vec)
+    tmp["RAM_GB"] = field("RAM_GB", ra, parse_ram_gb_vec)
+    tmp["Storage_GB"] = field("Storage_GB", st, parse_storage_gb_vec)
+    tmp["MainCameraMP"] = field("MainCameraMP", ca, parse_camera_mp_vec)
+    tmp["OS"] = df[os_] if os_ else None
+    tmp["Weight_g"] = field("Weight_g", we, parse_weight_g_vec)
+
+    # If Brand missing but Model present, try to infer brand
+    if b is None and m is not None and "Brand" not in own:
+        inferred = df[m].astype(str).apply(infer_brand_from_model)
+        tmp["Brand"] = tmp["Brand"].where(tmp["Brand"].notna(), inferred)
+
+    # Features
+    if fe:
+        feats = df[fe].astype(str)
+    else:
+        text_cols = [c for c in [di, os_, fe] if c]
+        feats = df[text_cols].astype(str).agg(" ".join, axis=1) if text_cols else pd.Series([""]*len(df))
+    feats_l = feats.str.lower()
+    flags = []
+    for label, keys in FEATURE_KEYS.items():
+        flags.append(np.where(feats_l.str.contains("|".join([re.escape(k) for k in keys])), label, ""))
+    tmp["NotableFeatures"] = pd.Series(["; ".join([f for f in row if f]) for row in zip(*flags)])
+
+    tmp["SourceFiles"] = str(p)
+    tmp["ID"] = None
+    tmp["Slug"] = ((tmp["Brand"].astype(str).str.lower() + "-" + tmp["Model"].astype(str).str.lower())
+                   .str.replace(r"[^a-z0-9]+", "-", regex=True).str.strip("-"))
+
+    # Cleanup
+    tmp["Brand"] = tmp["Brand"].astype(str).str.strip()
+    tmp["Model"] = tmp["Model"].astype(str).str.strip()
+    tmp = tmp[(tmp["Brand"].notna()) & (tmp["Model"].notna()) & (tmp["Brand"]!="None") & (tmp["Model"]!="None")]
+    return tmp
+
+def ingest_file(p: Path, dialect: dict = None):
+    """
+    Read, map and parse one raw CSV. Runs in a worker process, so it returns
+    everything the parent needs: (frame or None, report row, debug line,
+    read options that worked).
+    """
+    df, err, used = read_csv_once(p, dialect)
+    rows_in = len(df)
+
+    if df.empty:
+        return (None,
+                {"file": str(p), "rows_in": rows_in, "rows_out": 0, "mapped": dict.fromkeys(SYN), "reason": f"read_failed_or_empty: {err}",
+                 "adapter": "", "fingerprint": "", "header": []},
+                f"  • {p.name}: read failed/empty ({err})", used)
+
+    ad = resolve_adapter(df)
+    mapped = ad["mapped"]
+    b, m = mapped["brand"], mapped["model"]
+    tmp = parse_frame(df, mapped, p, ad["parse"])
+    rows_out = len(tmp)
+
+    return (tmp if rows_out > 0 else None,
+            {"file": str(p), "rows_in": rows_in, "rows_out": rows_out, "mapped": mapped, "reason": "" if rows_out>0 else "no_brand_or_model_after_mapping",
+             "adapter": ad["name"], "fingerprint": ad["fingerprint"], "header": [str(c) for c in df.columns]},
+            f"  • {p.name}: read={rows_in}, adapter={ad['name'] or '-'}, mapped_brand={b}, mapped_model={m}, out_rows={rows_out}", used)
+
+FILL_COLS = ["PriceUSD","DisplayInches","Battery_mAh","RAM_GB","Storage_GB","MainCameraMP","Weight_g"]
+NUMERIC_COLS = ["ReleaseYear"] + FILL_COLS
+
+def fill_score(df: pd.DataFrame) -> pd.Series:
+    """How complete a row is; the best-filled row wins a Brand+Model+Year tie."""
+    return df[FILL_COLS].notna().sum(axis=1) + df["NotableFeatures"].astype(bool).astype(int)
+
+# ---------- NEAR-DUPLICATE KEY ----------
+# Sources name the same phone differently: "Galaxy S24 Ultra 5G" / "Galaxy
+# S24 Ultra", "Samsung Galaxy S24+" / "Galaxy S24 Plus", "Moto G85" / "G85",
+# "Reno 7" / "Reno7". The dedup key is the model reduced to the tokens that
+# tell phones apart. Rows are blocked by Brand and that key (plus
+# ReleaseYear), so finding duplicates is a sort, not a pairwise comparison.
+# Only connectivity / SIM noise and a leading brand are dropped; Pro, Max,
+# Lite, FE, numbers and memory sizes stay, so real variants (including RAM /
+# storage SKUs with their own prices) stay separate. Memory sizes are written
+# one way ("4/128GB", "4GB RAM + 128GB" and "(4GB, 128GB)" all end in "@4-128"),
+# so only their spelling is normalized. Matching is exact on the key: no
+# similarity scoring, since names one edit apart ("S23" / "S24") are usually
+# different phones.
+_MODEL_NOISE = {"5g", "4g", "lte", "volte", "dual", "sim", "ds", "global", "version", "international"}
+_MEM_PAIR = r"\b(\d+(?:\.\d+)?)\s*/\s*(\d+(?:\.\d+)?)\s*(gb|tb)\b"   # "4/128GB": RAM/storage
+_MEM_SIZE = r"\b(\d+(?:\.\d+)?)\s*(gb|tb|mb)\b(?:\s*(?:ram|rom|storage))?"
+_MEM_GB = {"mb": 1 / 1024, "gb": 1, "tb": 1024}
+
+def _model_key_one(brand: str, model: str) -> str:
+    b = brand.strip().lower()
+    text = re.sub(_MEM_PAIR, r"\1gb \2\3", model.lower())
+    sizes = sorted({float(n) * _MEM_GB[u] for n, u in re.findall(_MEM_SIZE, text)})
+    text = re.sub(_MEM_SIZE, " ", text)
+    toks = re.findall(r"[a-z0-9]+", re.sub(r"(?<=[a-z0-9])\+", " plus ", text))  # "S24+", not "8GB + 128GB"
+    lead = {b, *(k for k, v in BRAND_NAMES.items() if v.lower() == b)}  # "Samsung Galaxy ..", "Moto G85"
+    while toks and toks[0] in lead:
+        toks = toks[1:]
+    kept = [t for t in toks if t not in _MODEL_NOISE]
+    key = "".join(kept or toks)
+    return key + "@" + "-".join(f"{g:g}" for g in sizes) if sizes else key
+
+def model_key(brand: pd.Series, model: pd.Series) -> pd.Series:
+    """Near-duplicate key per row, computed once per distinct Brand/Model pair."""
+    pairs = brand.astype(str) + "\t" + model.astype(str)
+    codes, uniq = pd.factorize(pairs, use_na_sentinel=False)
+    keys = np.array([_model_key_one(*u.split("\t", 1)) for u in uniq], dtype=object)
+    return pd.Series(keys[codes], index=brand.index)
+
+def _ingest_all(csv_paths, workers: int, dialects=None):
+    """ingest_file over every path, in path order; a process pool when it pays off."""
+    dialects = dialects or [None] * len(csv_paths)
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(csv_paths))
+    if workers <= 1:
+        return [ingest_file(p, d) for p, d in zip(csv_paths, dialects)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # map keeps input order, so concat/dedup below sees the same row order as a serial run
+        return list(pool.map(ingest_file, csv_paths, dialects))
+
+# ---------- INCREMENTAL CACHE ----------
+def file_digest(p: Path) -> str:
+    h = hashlib.sha256()
+    with p.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def _code_version() -> str:
+    # parsed output depends on this script: any edit to it invalidates the cache
+    return hashlib.sha256(Path(__file__).read_bytes()).hexdigest()[:16]
+
+class IngestCache:
+    """
+    Manifest of raw-file content hashes plus each file's cached ingest_file()
+    result, so a rebuild only re-parses new or changed files. Entries are per
+    path (SourceFiles and the report record the path) and are dropped when the
+    file disappears or this script changes.
+    """
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.path = self.root / "manifest.json"
+        self.code = _code_version()
+        try:
+            manifest = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            manifest = {}
+        same_code = manifest.get("code") == self.code
+        self.files = manifest.get("files", {}) if same_code else {}
+        DIALECTS.update(manifest.get("dialects", {}) if same_code else {})
+
+    def _blob(self, p: Path, digest: str) -> Path:
+        return self.root / f"{digest[:16]}-{hashlib.sha1(str(p).encode('utf-8')).hexdigest()[:8]}.pkl"
+
+    def lookup(self, p: Path, digest: str):
+        """Cached ingest_file(p) result if p's content is unchanged, else None."""
+        entry = self.files.get(str(p))
+        if not entry or entry.get("sha256") != digest:
+            return None
+        try:
+            return pd.read_pickle(self.root / entry["blob"])
+        except Exception:
+            return None
+
+    def store(self, p: Path, digest: str, result) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        blob = self._blob(p, digest)
+        pd.to_pickle(result, blob)
+        self.files[str(p)] = {"sha256": digest, "blob": blob.name, "rows_out": result[1]["rows_out"]}
+
+    def save(self, paths) -> None:
+        """Keep only `paths`, delete orphaned blobs, write the manifest atomically."""
+        keep = {str(p) for p in paths}
+        self.files = {k: v for k, v in self.files.items() if k in keep}
+        self.root.mkdir(parents=True, exist_ok=True)
+        live = {v["blob"] for v in self.files.values()}
+        for f in self.root.glob("*.pkl"):
+            if f.name not in live:
+                f.unlink(missing_ok=True)
+        tmp = self.path.with_suffix(".json.tmp")
+        dialects = {v["sha256"]: DIALECTS[v["sha256"]] for v in self.files.values() if v["sha256"] in DIALECTS}
+        tmp.write_text(json.dumps({"code": self.code, "files": self.files, "dialects": dialects}, indent=2), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+def _ingest_cached(csv_paths, workers: int, cache: "IngestCache", debug=False):
+    """_ingest_all, reusing cached results for files whose content hash is unchanged."""
+    digests = [file_digest(p) for p in csv_paths]
+    results = [cache.lookup(p, d) for p, d in zip(csv_paths, digests)]
+    todo = [i for i, r in enumerate(results) if r is None]
+    if debug: print(f"♻️  {len(csv_paths) - len(todo)} cached, {len(todo)} new/changed")
+    fresh = _ingest_all([csv_paths[i] for i in todo], workers, [DIALECTS.get(digests[i]) for i in todo])
+    for i, r in zip(todo, fresh):
+        results[i] = r
+        cache.store(csv_paths[i], digests[i], r)
+        if r[3]:
+            DIALECTS[digests[i]] = r[3]
+    cache.save(csv_paths)
+    return results
+
+def load_any_csvs(raw_dir: Path, debug=False, workers: int = 0, cache_dir=None):
     rows = []
     report = []
     csv_paths = list(raw_dir.rglob("*.csv"))
     if debug: print(f"🔎 Found {len(csv_paths)} CSV files under {raw_dir}")
 
-    for p in csv_paths:
-        df, err = read_csv_smart(p)
-        rows_in = len(df)
-        mapped = {"brand": None, "model": None, "release": None, "price": None,
-                  "display": None, "battery": None, "ram": None, "storage": None,
-                  "camera": None, "os": None, "weight": None, "features": None}
-        reason = ""
-
-        if df.empty:
-            report.append({"file": str(p), "rows_in": rows_in, "rows_out": 0, "mapped": mapped, "reason": f"read_failed_or_empty: {err}"})
-            if debug: print(f"  • {p.name}: read failed/empty ({err})")
-            continue
-
-        b = col(df, SYN["brand"]);   m = col(df, SYN["model"])
-        y = col(df, SYN["release"]); pr = col(df, SYN["price"])
-        di = col(df, SYN["display"]); bt = col(df, SYN["battery"])
-        ra = col(df, SYN["ram"]);    st = col(df, SYN["storage"])
-        ca = col(df, SYN["camera"]); os_ = col(df, SYN["os"])
-        we = col(df, SYN["weight"]); fe = col(df, SYN["features"])
-
-        mapped.update({"brand":b,"model":m,"release":y,"price":pr,"display":di,"battery":bt,"ram":ra,"storage":st,"camera":ca,"os":os_,"weight":we,"features":fe})
-
-        tmp = pd.DataFrame()
-        tmp["Brand"] = df[b] if b else None
-        tmp["Model"] = df[m] if m else None
-        tmp["ReleaseYear"] = df[y].apply(parse_year) if y else np.nan
-        tmp["PriceUSD"] = pd.to_numeric(df[pr], errors="coerce") if pr else np.nan
-        tmp["DisplayInches"] = df[di].apply(parse_inches) if di else np.nan
-        tmp["Battery_mAh"] = df[bt].apply(parse_mah) if bt else np.nan
-        tmp["RAM_GB"] = df[ra].apply(parse_ram_gb) if ra else np.nan
-        tmp["Storage_GB"] = df[st].apply(parse_storage_gb) if st else np.nan
-        tmp["MainCameraMP"] = df[ca].apply(parse_camera_mp) if ca else np.nan
-        tmp["OS"] = df[os_] if os_ else None
-        tmp["Weight_g"] = df[we].apply(parse_weight_g) if we else np.nan
-
-        # If Brand missing but Model present, try to infer brand
-        if b is None and m is not None:
-            inferred = df[m].astype(str).apply(infer_brand_from_model)
-            tmp["Brand"] = tmp["Brand"].where(tmp["Brand"].notna(), inferred)
-
-        # Features
-        if fe:
-            feats = df[fe].astype(str)
-        else:
-            text_cols = [c for c in [di, os_, fe] if c]
-            feats = df[text_cols].astype(str).agg(" ".join, axis=1) if text_cols else pd.Series([""]*len(df))
-        feats_l = feats.str.lower()
-        flags = []
-        for label, keys in FEATURE_KEYS.items():
-            flags.append(np.where(feats_l.str.contains("|".join([re.escape(k) for k in keys])), label, ""))
-        tmp["NotableFeatures"] = pd.Series(["; ".join([f for f in row if f]) for row in zip(*flags)])
-
-        tmp["SourceFiles"] = str(p)
-        tmp["ID"] = None
-        tmp["Slug"] = tmp.apply(lambda r: re.sub(r"[^a-z0-9]+","-", f"{str(r['Brand']).lower()}-{str(r['Model']).lower()}").strip("-"), axis=1)
-
-        # Cleanup
-        tmp["Brand"] = tmp["Brand"].astype(str).str.strip()
-        tmp["Model"] = tmp["Model"].astype(str).str.strip()
-        tmp = tmp[(tmp["Brand"].notna()) & (tmp["Model"].notna()) & (tmp["Brand"]!="None") & (tmp["Model"]!="None")]
-        rows_out = len(tmp)
-
-        if debug:
-            print(f"  • {p.name}: read={rows_in}, mapped_brand={b}, mapped_model={m}, out_rows={rows_out}")
-
-        report.append({"file": str(p), "rows_in": rows_in, "rows_out": rows_out, "mapped": mapped, "reason": "" if rows_out>0 else "no_brand_or_model_after_mapping"})
-        if rows_out > 0:
+    # merged in path order either way, so the dedup below sees the same rows as a full rebuild
+    results = (_ingest_cached(csv_paths, workers, IngestCache(cache_dir), debug) if cache_dir
+               else _ingest_all(csv_paths, workers))
+    for tmp, rep, line, _ in results:
+        if debug: print(line)
+        report.append(rep)
+        if tmp is not None:
             rows.append(tmp)
 
     if not rows:
@@ -269,15 +751,145 @@ def load_any_csvs(raw_dir: Path, debug=False):
 
     out = pd.concat(rows, ignore_index=True)
 
-    # Prefer better-filled rows when de-duplicating (Brand+Model+Year)
-    fill_cols = ["PriceUSD","DisplayInches","Battery_mAh","RAM_GB","Storage_GB","MainCameraMP","Weight_g"]
-    out["__fill"] = out[fill_cols].notna().sum(axis=1) + out["NotableFeatures"].astype(bool).astype(int)
-    out = (out.sort_values(["Brand","Model","ReleaseYear","__fill"], ascending=[True,True,True,False])
-              .drop_duplicates(subset=["Brand","Model","ReleaseYear"], keep="first")
-              .drop(columns="__fill"))
+    # Prefer better-filled rows when de-duplicating (Brand + model key + Year);
+    # on a tie the row seen first stays
+    out["__fill"] = fill_score(out)
+    out["__key"] = model_key(out["Brand"], out["Model"])
+    out = (out.sort_values(["Brand","__key","ReleaseYear","__fill"], ascending=[True,True,True,False], kind="stable")
+              .drop_duplicates(subset=["Brand","__key","ReleaseYear"], keep="first")
+              .sort_values(["Brand","Model","ReleaseYear"], kind="stable")
+              .drop(columns=["__fill","__key"]))
 
     return out[SCHEMA], pd.DataFrame(report)
 
+# ---------- STREAMING BUILD (bounded memory) ----------
+_NA_YEAR = 1e18  # key for a missing ReleaseYear; sorts after every real year, like NaN
+
+class DedupStore:
+    """
+    On-disk Brand + model key + ReleaseYear -> best row, for streaming builds.
+    Same rule as the in-memory dedup: the row with the higher fill_score wins,
+    and on a tie the row seen first stays. Rows come back ordered like
+    sort_values(["Brand","Model","ReleaseYear"]) (missing years last).
+    """
+    def __init__(self, path: str):
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=OFF")
+        self.db.execute("PRAGMA synchronous=OFF")
+        cols = ", ".join(f'"{c}"' for c in SCHEMA)
+        self.db.execute(f"""CREATE TABLE IF NOT EXISTS best (
+            k_brand TEXT NOT NULL, k_model TEXT NOT NULL, k_year REAL NOT NULL, fill INTEGER NOT NULL, {cols},
+            PRIMARY KEY (k_brand, k_model, k_year)) WITHOUT ROWID""")
+        names = ", ".join(f'"{c}"' for c in ["k_brand", "k_model", "k_year", "fill"] + SCHEMA)
+        marks = ", ".join("?" * (4 + len(SCHEMA)))
+        updates = ", ".join(f'"{c}"=excluded."{c}"' for c in ["fill"] + SCHEMA)
+        self._upsert = (f"INSERT INTO best ({names}) VALUES ({marks}) "
+                        f"ON CONFLICT(k_brand, k_model, k_year) DO UPDATE SET {updates} "
+                        f"WHERE excluded.fill > best.fill")
+
+    def add(self, df: pd.DataFrame) -> None:
+        years = df["ReleaseYear"].astype(float)
+        keys = [df["Brand"].tolist(), model_key(df["Brand"], df["Model"]).tolist(),
+                years.fillna(_NA_YEAR).tolist(), fill_score(df).tolist()]
+        # tolist() gives plain Python values; NaN binds as NULL
+        vals = [df[c].astype(float).tolist() if c in NUMERIC_COLS else df[c].tolist() for c in SCHEMA]
+        with self.db:
+            self.db.executemany(self._upsert, zip(*keys, *vals))
+
+    def __len__(self) -> int:
+        return self.db.execute("SELECT COUNT(*) FROM best").fetchone()[0]
+
+    def pages(self, size: int):
+        """Deduplicated rows as SCHEMA frames of at most `size` rows, in output order."""
+        cols = ", ".join(f'"{c}"' for c in SCHEMA)
+        cur = self.db.execute(f'SELECT {cols} FROM best ORDER BY k_brand, "Model", k_year')
+        while True:
+            rows = cur.fetchmany(size)
+            if not rows:
+                return
+            page = pd.DataFrame(rows, columns=SCHEMA)
+            page[NUMERIC_COLS] = page[NUMERIC_COLS].astype(float)
+            yield page
+
+    def close(self) -> None:
+        self.db.close()
+
+def stream_build(raw_dir: Path, out_csv: str, out_json: str, min_year: int, max_year: int,
+                 limit: int = 0, chunksize: int = 100_000, store_path: str = "", debug=False):
+    """
+    Bounded-memory build for raw files larger than RAM. Each CSV is read in
+    chunks, mapped from its header and parsed chunk by chunk into a DedupStore;
+    the output CSV/JSON is then written page by page from the store. Memory
+    stays around one chunk whatever the raw size. Returns (rows written, report).
+    """
+    csv_paths = list(raw_dir.rglob("*.csv"))
+    if debug: print(f"🔎 Found {len(csv_paths)} CSV files under {raw_dir} (streaming, {chunksize} rows/chunk)")
+    report = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        store = DedupStore(store_path or os.path.join(tmpdir, "dedup.sqlite"))
+        try:
+            for p in csv_paths:
+                chunks, err = read_csv_chunks(p, chunksize)
+                mapped, rows_in, rows_out, reason = dict.fromkeys(SYN), 0, 0, ""
+                ad = {"name": "", "fingerprint": "", "mapped": mapped, "parse": None}
+                header = []
+                try:
+                    for chunk in chunks:
+                        if rows_in == 0:
+                            ad, header = resolve_adapter(chunk), [str(c) for c in chunk.columns]
+                            mapped = ad["mapped"]
+                        rows_in += len(chunk)
+                        tmp = parse_frame(chunk, mapped, p, ad["parse"])
+                        rows_out += len(tmp)
+                        if len(tmp):
+                            store.add(tmp)
+                except Exception as e:
+                    reason = f"read_error_after_{rows_in}_rows: {e}"
+                if not reason:
+                    if rows_in == 0:
+                        reason = f"read_failed_or_empty: {err}"
+                    elif rows_out == 0:
+                        reason = "no_brand_or_model_after_mapping"
+                if debug:
+                    print(f"  • {p.name}: read={rows_in}, adapter={ad['name'] or '-'}, mapped_brand={mapped['brand']}, mapped_model={mapped['model']}, out_rows={rows_out}"
+                          + (f" ({reason})" if reason else ""))
+                report.append({"file": str(p), "rows_in": rows_in, "rows_out": rows_out, "mapped": mapped, "reason": reason,
+                               "adapter": ad["name"], "fingerprint": ad["fingerprint"], "header": header})
+
+            Path(out_csv).parent.mkdir(parents=True, exist_ok=True)
+            written = 0
+            with open(out_csv, "w", encoding="utf-8", newline="") as fc, open(out_json, "w", encoding="utf-8") as fj:
+                fj.write("[")
+                for page in store.pages(chunksize):
+                    # year window + cap, exactly as main() applies them to the full frame
+                    page = page[(page["ReleaseYear"].fillna(0) >= min_year) & (page["ReleaseYear"].fillna(9999) <= max_year)]
+                    if limit and limit > 0:
+                        page = page.head(limit - written)
+                    if page.empty:
+                        if limit and written >= limit:
+                            break
+                        continue
+                    page.to_csv(fc, index=False, header=(fc.tell() == 0))
+                    body = page.to_json(orient="records")[1:-1]
+                    fj.write(("," if written else "") + body)
+                    written += len(page)
+                fj.write("]")
+                if fc.tell() == 0:
+                    pd.DataFrame(columns=SCHEMA).to_csv(fc, index=False)
+        finally:
+            store.close()
+    return written, pd.DataFrame(report)
+
+def write_report(report: pd.DataFrame, path: str) -> None:
+    """Ingest report CSV, one row per raw file, mapped columns flattened."""
+    if report.empty:
+        return
+    mapped_df = report.drop(columns=["header"], errors="ignore")
+    mapped_cols = pd.json_normalize(mapped_df["mapped"])
+    mapped_df = pd.concat([mapped_df.drop(columns=["mapped"]), mapped_cols], axis=1)
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    mapped_df.to_csv(path, index=False)
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--raw_dir", required=True)
@@ -287,13 +899,31 @@ def main():
     ap.add_argument("--max_year", type=int, default=2035)
     ap.add_argument("--limit", type=int, default=0, help="0 = no cap")
     ap.add_argument("--debug", action="store_true")
+    ap.add_argument("--workers", type=int, default=0, help="parallel file ingest; 0 = one per CPU, 1 = serial")
     ap.add_argument("--report", default="data/processed/ingest_report.csv")
+    ap.add_argument("--unknown_headers", default="data/processed/unknown_headers.json",
+                    help="headers with no source adapter, and what the fuzzy mapping picked ('' = off)")
+    ap.add_argument("--cache_dir", default="data/cache/ingest", help="per-file parsed output + content-hash manifest")
+    ap.add_argument("--no_cache", action="store_true", help="re-parse every raw file")
+    ap.add_argument("--stream", action="store_true", help="chunked, bounded-memory build for very large raw files")
+    ap.add_argument("--chunksize", type=int, default=100_000, help="--stream: rows per chunk")
+    ap.add_argument("--dedup_db", default="", help="--stream: sqlite file for the dedup store (default: temp)")
     args = ap.parse_args()
 
     raw = Path(args.raw_dir)
     raw.mkdir(parents=True, exist_ok=True)
 
-    df, report = load_any_csvs(raw, debug=args.debug)
+    if args.stream:
+        n, report = stream_build(raw, args.out_csv, args.out_json, args.min_year, args.max_year,
+                                 limit=args.limit, chunksize=args.chunksize, store_path=args.dedup_db, debug=args.debug)
+        write_report(report, args.report)
+        record_unknown_headers(report, args.unknown_headers)
+        print(f"✅ Wrote {n} rows to:\n  - {args.out_csv}\n  - {args.out_json}")
+        print(f"🧾 Ingest report: {args.report}")
+        return
+
+    df, report = load_any_csvs(raw, debug=args.debug, workers=args.workers,
+                               cache_dir=None if args.no_cache else Path(args.cache_dir))
 
     # year window
     df = df[(df["ReleaseYear"].fillna(0) >= args.min_year) & (df["ReleaseYear"].fillna(9999) <= args.max_year)]
@@ -306,12 +936,8 @@ def main():
     df.to_json(args.out_json, orient="records")
 
     # write ingest report (flatten mapped dict)
-    if not report.empty:
-        mapped_df = report.copy()
-        mapped_cols = pd.json_normalize(mapped_df["mapped"])
-        mapped_df = pd.concat([mapped_df.drop(columns=["mapped"]), mapped_cols], axis=1)
-        Path(args.report).parent.mkdir(parents=True, exist_ok=True)
-        mapped_df.to_csv(args.report, index=False)
+    write_report(report, args.report)
+    record_unknown_headers(report, args.unknown_headers)
 
     print(f"✅ Wrote {len(df)} rows to:\n  - {args.out_csv}\n  - {args.out_json}")
     print(f"🧾 Ingest report: {args.report}")
@@ -1,5 +1,6 @@
-﻿import React, { useEffect, useState } from "react";
+﻿import React, { useEffect, useRef, useState } from "react";
 import TopNav from "./components/TopNav.jsx";
+import { chatSocket, socketReply } from "./lib/api.js";
 import { AnimatePresence, motion } from "framer-motion";
 import { Smartphone, Tablet, Laptop, Headphones } from "lucide-react";
 import { Sparkles, SlidersHorizontal, MessageSquareText, Lock } from "lucide-react";
@@ -55,9 +56,14 @@ function useSession() {
   const [messages, setMessages] = useState([]);
   const [thinking, setThinking] = useState(false);
   const [blurb, setBlurb] = useState(null);  // NEW
+  const socket = useRef(null);  // /chat/ws bound to sid; control patches go over it
+
+  useEffect(() => () => socket.current?.close(), []);
 
   const start = async () => {
     const res = await startChat();
+    socket.current?.close();
+    socket.current = chatSocket(res.session_id);
     setSid(res.session_id);
     setMessages([{ from: "assistant", text: res.message }]);
     setUi(res.ui || null);
@@ -78,8 +84,13 @@ function useSession() {
 
   const patch = async (partial) => {
     if (!sid) return;
-    const res = await patchChat(sid, partial);
-    setUi(res.ui || null);
+    let res;
+    try {
+      res = socketReply(await socket.current.request({ type: "patch", patch: partial }));
+    } catch {
+      res = await patchChat(sid, partial);  // socket not (yet) open: plain HTTP
+    }
+    if ("ui" in res) setUi(res.ui || null);
     setIntent(res.intent || {});
     if (res.picks) setPicks(res.picks);
     if (res.ask)   setBlurb(res.ask);         // NEW (often null)
@@ -26,3 +26,68 @@ export async function chatMessage(session_id, message) {
     })
   );
 }
+
+/* ---------- chat over /chat/ws ----------
+   One socket per chat session. request(frame) resolves with the frames the
+   server sends back for it (up to "done"). It rejects when the socket is not
+   open, or was opened for a different session, so callers can fall back to HTTP. */
+const WS_BASE = BASE.replace(/^http/, "ws");
+
+export function chatSocket(session_id) {
+  const ws = new WebSocket(`${WS_BASE}/chat/ws?session_id=${encodeURIComponent(session_id)}`);
+  const pending = new Map();
+  let bound = false;
+  let seq = 0;
+
+  const fail = () => {
+    bound = false;
+    for (const p of pending.values()) p.reject(new Error("chat socket closed"));
+    pending.clear();
+  };
+  ws.onclose = fail;
+  ws.onerror = fail;
+  ws.onmessage = (ev) => {
+    let f;
+    try { f = JSON.parse(ev.data); } catch { return; }
+    if (f.type === "session") {
+      // an unknown session id gets a fresh session: not ours, so don't use it
+      bound = f.session_id === session_id;
+      if (!bound) ws.close();
+      return;
+    }
+    const p = pending.get(f.id);
+    if (!p) return;
+    if (f.type === "done") {
+      pending.delete(f.id);
+      p.resolve(p.frames);
+    } else {
+      p.frames.push(f);
+    }
+  };
+
+  return {
+    request(frame) {
+      if (!bound || ws.readyState !== WebSocket.OPEN) {
+        return Promise.reject(new Error("chat socket not open"));
+      }
+      const id = ++seq;
+      return new Promise((resolve, reject) => {
+        pending.set(id, { frames: [], resolve, reject });
+        ws.send(JSON.stringify({ ...frame, id }));
+      });
+    },
+    close() { ws.close(); },
+  };
+}
+
+// Frames of one reply folded into the /chat/message response shape (only the parts received).
+export function socketReply(frames) {
+  const res = {};
+  for (const f of frames) {
+    if (f.type === "count") { res.intent = f.intent; res.count = f.count; }
+    else if (f.type === "picks") { res.picks = f.picks; res.cursor = f.cursor; }
+    else if (f.type === "ask") res.ask = f.text;
+    else if (f.type === "error") res.ask = f.detail;
+  }
+  return res;
+}
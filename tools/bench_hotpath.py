@@ -0,0 +1,160 @@
+# tools/bench_hotpath.py
+"""
+Benchmarks for the recommendation hot path at scaled catalog sizes.
+
+    python tools/bench_hotpath.py                              # 100, 10k, 100k, 1M rows
+    python tools/bench_hotpath.py --sizes 100,10000 --out data/bench/base.json
+    python tools/bench_hotpath.py --compare data/bench/base.json --threshold 0.15
+
+Every run writes a JSON file; with --compare the median of each
+(bench, size, case) is checked against the baseline and the script exits 1
+when anything got slower than the threshold allows.
+"""
+import argparse, json, os, platform, statistics, subprocess, sys, tempfile, time, warnings
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.normpath(os.path.join(os.path.dirname(__file__), ".."))
+OUT_DIR = os.path.join(ROOT, "data", "bench")
+
+# The backend reads these at import time: keep LLM calls and the catalog
+# watcher out of the measurements.
+os.environ.setdefault("USE_OLLAMA", "0")
+os.environ.setdefault("CATALOG_POLL_SECONDS", "0")
+sys.path.insert(0, os.path.join(ROOT, "backend"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import main  # noqa: E402
+from make_synthetic_catalog import generate_catalog  # noqa: E402
+
+# filter_df_by_intent's must-have loop reindexes a boolean mask on every call
+warnings.filterwarnings("ignore", message="Boolean Series key will be reindexed")
+
+# Representative intents: (free text the user typed, structured intent it maps to)
+CASES = {
+    "empty":          ("show me phones", {}),
+    "android-budget": ("android under 600 with long battery",
+                       {"os": "Android", "budget": 600, "min_battery": 5000}),
+    "ios-compact":    ("compact iphone, around 900, good camera",
+                       {"os": "iOS", "budget": 900, "prefer_small": True, "camera_priority": True}),
+    "brand-features": ("samsung or google, 5g and wireless charging, 12gb ram",
+                       {"brands": ["Samsung", "Google"], "must_have": ["5g", "wireless charging"], "min_ram": 12}),
+    "tight":          ("large android under 250 with 512gb, ip68, no xiaomi",
+                       {"os": "Android", "budget": 250, "prefer_large": True, "min_storage": 512,
+                        "must_have": ["ip68"], "avoid_brands": ["Xiaomi"]}),
+}
+
+def timeit(fn, repeat: int, budget_s: float) -> list:
+    """Run fn up to `repeat` times (at least once) or until budget_s is spent."""
+    times = []
+    start = time.perf_counter()
+    while len(times) < repeat:
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+        if time.perf_counter() - start > budget_s:
+            break
+    return times
+
+def run_size(n: int, repeat: int, budget_s: float, seed: int, tmpdir: str) -> list:
+    path = os.path.join(tmpdir, f"catalog_{n}.csv")
+    generate_catalog(n, seed=seed).to_csv(path, index=False)
+
+    results = []
+    def rec(bench, case, fn):
+        ts = timeit(fn, repeat, budget_s)
+        results.append({
+            "bench": bench, "size": n, "case": case, "runs": len(ts),
+            "min_s": min(ts), "median_s": statistics.median(ts), "mean_s": statistics.fmean(ts),
+        })
+        print(f"  {bench:<20} {case:<15} median {statistics.median(ts)*1000:10.2f} ms  ({len(ts)} runs)")
+
+    print(f"== {n:,} rows")
+    rec("load_df", "cold", lambda: main._read_catalog(path))
+
+    main.CSV_PATH = path
+    main.reload_catalog(force=True)
+    df = main.load_df()
+
+    for case, (text, raw) in CASES.items():
+        intent = main.normalize_intent(raw)
+        filtered = main.filter_df_by_intent(df, intent, strict_budget=True)
+        ranked = main.rank_df(filtered if not filtered.empty else df, intent)
+
+        rec("rule_extract_intent", case, lambda: main.rule_extract_intent(text))
+        rec("normalize_intent", case, lambda: main.normalize_intent(raw))
+        rec("filter_df_by_intent", case, lambda: main.filter_df_by_intent(df, intent, strict_budget=True))
+        rec("candidates_multi", case, lambda: main.candidates_multi(intent))
+        rec("rank_df", case, lambda: main.rank_df(filtered if not filtered.empty else df, intent))
+        rec("unique_topn", case, lambda: main.unique_topn(ranked, 6))
+    return results
+
+def _git_rev() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return ""
+
+def compare(current: dict, baseline: dict, threshold: float, min_delta_ms: float) -> list:
+    """Return rows whose median got slower than baseline * (1 + threshold)."""
+    base = {(r["bench"], r["size"], r["case"]): r for r in baseline.get("results", [])}
+    slower = []
+    for r in current["results"]:
+        b = base.get((r["bench"], r["size"], r["case"]))
+        if not b or not b["median_s"]:
+            continue
+        ratio = r["median_s"] / b["median_s"]
+        delta_ms = (r["median_s"] - b["median_s"]) * 1000
+        if ratio > 1 + threshold and delta_ms > min_delta_ms:
+            slower.append({**r, "baseline_median_s": b["median_s"], "ratio": round(ratio, 3)})
+    return slower
+
+def main_cli():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", default="100,10000,100000,1000000")
+    ap.add_argument("--repeat", type=int, default=7)
+    ap.add_argument("--budget", type=float, default=10.0, help="max seconds per bench/case before stopping repeats")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--out", default="")
+    ap.add_argument("--compare", default="", help="baseline JSON from an earlier run")
+    ap.add_argument("--threshold", type=float, default=0.15, help="allowed slowdown, 0.15 = +15%%")
+    ap.add_argument("--min_delta_ms", type=float, default=0.5, help="ignore slowdowns smaller than this")
+    args = ap.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            results += run_size(n, args.repeat, args.budget, args.seed, tmp)
+
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    report = {
+        "meta": {
+            "timestamp": stamp, "git": _git_rev(), "seed": args.seed, "sizes": sizes,
+            "python": platform.python_version(), "pandas": pd.__version__, "numpy": np.__version__,
+            "machine": platform.machine(), "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    out = args.out or os.path.join(OUT_DIR, f"hotpath-{stamp}.json")
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Wrote {len(results)} results to {out}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        slower = compare(report, baseline, args.threshold, args.min_delta_ms)
+        if slower:
+            print(f"❌ {len(slower)} regression(s) over +{args.threshold:.0%}:")
+            for r in slower:
+                print(f"  {r['bench']:<20} {r['size']:>9,} {r['case']:<15} "
+                      f"{r['baseline_median_s']*1000:.2f} -> {r['median_s']*1000:.2f} ms (x{r['ratio']})")
+            sys.exit(1)
+        print(f"✅ No regressions vs {args.compare}")
+
+if __name__ == "__main__":
+    main_cli()
@@ -1,11 +1,18 @@
 # tools/enrich_curated.py
-import base64, io, json, math, os
+import argparse, base64, functools, io, json, math, os
+from concurrent.futures import ProcessPoolExecutor
+import PIL
 from PIL import Image, ImageDraw, ImageFont, ImageColor
+import numpy as np
 import pandas as pd
 
 IN_CSV  = "data/processed/phones_clean.csv"     # change if you use a curated CSV
 OUT_CSV = "data/processed/phones_enriched.csv"
 OUT_JSON= "data/processed/phones_enriched.json"
+IMAGE_CACHE = "data/cache/enrich_images.json"   # render params + label -> data URL from earlier runs
+IMAGE_SIZE = (512, 320)
+IMAGE_COLORS = ("#111827", "#1f2937")           # gradient top -> bottom
+FONT_SIZE = 28
 
 # brand price multipliers (coarse)
 BRAND_FACTOR = {
@@ -44,31 +51,31 @@ def price_estimate(row):
     base = max(120, min(base, 1600))
     return round(base, -1)  # nearest $10
 
-def gradient_image_data_url(text, w=512, h=320, a="#111827", b="#1f2937"):
-    # Create a simple vertical gradient and overlay a label (Brand + Model)
-    img = Image.new("RGB", (w, h), a)
-    draw = ImageDraw.Draw(img)
-
-    a_rgb = ImageColor.getrgb(a)
-    b_rgb = ImageColor.getrgb(b)
-
-    for y in range(h):
-        t = y / (h - 1)
-        r = int(a_rgb[0] + (b_rgb[0] - a_rgb[0]) * t)
-        g = int(a_rgb[1] + (b_rgb[1] - a_rgb[1]) * t)
-        bl = int(a_rgb[2] + (b_rgb[2] - a_rgb[2]) * t)
-        draw.line([(0, y), (w, y)], fill=(r, g, bl))
-
-    # Font (try a few common ones, fallback to default)
-    font = None
+@functools.lru_cache(maxsize=None)
+def _font(size=FONT_SIZE):
+    # Font (try a few common ones, fallback to default); loaded once per process
     for name in ["arial.ttf", "DejaVuSans.ttf", "SegoeUI.ttf"]:
         try:
-            font = ImageFont.truetype(name, 28)
-            break
+            return ImageFont.truetype(name, size)
         except Exception:
             pass
-    if font is None:
-        font = ImageFont.load_default()
+    return ImageFont.load_default()
+
+@functools.lru_cache(maxsize=8)
+def _gradient(w, h, a, b):
+    """Vertical a->b gradient, built once as an array (same pixels as per-row int() steps)."""
+    a_rgb = np.array(ImageColor.getrgb(a), dtype=np.float64)
+    b_rgb = np.array(ImageColor.getrgb(b), dtype=np.float64)
+    t = np.arange(h, dtype=np.float64)[:, None] / (h - 1)
+    rows = np.trunc(a_rgb + (b_rgb - a_rgb) * t).astype(np.uint8)       # (h, 3)
+    return Image.fromarray(np.ascontiguousarray(np.broadcast_to(rows[:, None, :], (h, w, 3))), "RGB")
+
+def gradient_image_data_url(text, w=IMAGE_SIZE[0], h=IMAGE_SIZE[1], a=IMAGE_COLORS[0], b=IMAGE_COLORS[1],
+                            optimize=False):
+    # Create a simple vertical gradient and overlay a label (Brand + Model)
+    img = _gradient(w, h, a, b).copy()
+    draw = ImageDraw.Draw(img)
+    font = _font()
 
     # Measure text with textbbox (Pillow 10+)
     bbox = draw.textbbox((0, 0), text, font=font)  # (left, top, right, bottom)
@@ -78,44 +85,98 @@ def gradient_image_data_url(text, w=512, h=320, a="#111827", b="#1f2937"):
     # Draw centered
     draw.text(((w - tw) // 2, (h - th) // 2), text, fill="white", font=font)
 
-    # Encode to data URL
-    import io, base64
+    # Encode to data URL (optimize=True is zlib level 9: ~7% smaller, ~3x slower)
     buf = io.BytesIO()
-    img.save(buf, format="PNG", optimize=True)
+    img.save(buf, format="PNG", optimize=optimize)
     b64 = base64.b64encode(buf.getvalue()).decode("ascii")
     return f"data:image/png;base64,{b64}"
 
+def _labels(df):
+    # “photo” – a text-based placeholder: Brand + Model
+    brand = df["Brand"].fillna("").astype(str).str[:12]
+    model = df["Model"].fillna("").astype(str).str[:18]
+    label = (brand + " " + model).str.strip()
+    return label.where(label != "", "Phone")
+
+def render_params(optimize=False):
+    """Everything besides the label that goes into an image's bytes."""
+    path = getattr(_font(), "path", None)
+    return {
+        "size": list(IMAGE_SIZE), "colors": list(IMAGE_COLORS), "font_size": FONT_SIZE,
+        "font": os.path.basename(path) if isinstance(path, str) else "default",
+        "optimize": bool(optimize), "pillow": PIL.__version__,
+    }
+
+def load_image_cache(path, params):
+    """label -> data URL from earlier runs; empty unless they rendered with the same `params`."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cached, dict) or cached.get("params") != params:
+        return {}
+    return cached.get("images") or {}
+
+def save_image_cache(path, params, images):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"params": params, "images": images}, f)
+    os.replace(tmp, path)
+
+def render_images(labels, workers=0, cache=None, optimize=False):
+    """One image per distinct label: reuse `cache`, render the rest in a process pool."""
+    cache = dict(cache or {})
+    todo = sorted(set(labels) - set(cache))
+    if todo:
+        render = functools.partial(gradient_image_data_url, optimize=optimize)
+        workers = min(workers or os.cpu_count() or 1, len(todo))
+        if workers <= 1:
+            cache.update(zip(todo, map(render, todo)))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                cache.update(zip(todo, pool.map(render, todo, chunksize=64)))
+    return [cache[l] for l in labels], len(todo), cache
+
 def main():
-    os.makedirs(os.path.dirname(OUT_CSV), exist_ok=True)
-    df = pd.read_csv(IN_CSV)
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--in_csv", default=IN_CSV)
+    ap.add_argument("--out_csv", default=OUT_CSV)
+    ap.add_argument("--out_json", default=OUT_JSON)
+    ap.add_argument("--workers", type=int, default=0, help="image render processes; 0 = one per CPU")
+    ap.add_argument("--image_cache", default=IMAGE_CACHE)
+    ap.add_argument("--force", action="store_true", help="re-render every image instead of reusing cached ones")
+    ap.add_argument("--optimize_png", action="store_true", help="smallest PNGs (zlib 9), ~3x slower to render")
+    args = ap.parse_args()
+
+    os.makedirs(os.path.dirname(args.out_csv) or ".", exist_ok=True)
+    df = pd.read_csv(args.in_csv)
     # normalize columns used
     for c in ["Brand","Model","ReleaseYear","PriceUSD","DisplayInches","Battery_mAh","RAM_GB","Storage_GB","MainCameraMP","OS","NotableFeatures","Slug"]:
         if c not in df.columns:
             df[c] = None
 
-    # fill/improve price + create image url if missing
-    prices = []
-    images = []
-    for _, row in df.iterrows():
-        price = row.get("PriceUSD")
-        if pd.isna(price) or float(price) < 120 or float(price) > 2000:
-            price = price_estimate(row)
-        else:
-            price = float(price)
-
-        # “photo” – a text-based placeholder: Brand + Model
-        label = f"{row.get('Brand','')[:12]} {row.get('Model','')[:18]}".strip()
-        imgurl = gradient_image_data_url(label or "Phone")
-
-        prices.append(price)
-        images.append(imgurl)
-
-    df["PriceUSD"] = prices
-    df["ImageURL"] = images
-
-    df.to_csv(OUT_CSV, index=False)
-    df.to_json(OUT_JSON, orient="records", force_ascii=False)
-    print(f"✅ Wrote {len(df)} rows to:\n - {OUT_CSV}\n - {OUT_JSON}")
+    # fill/improve price where missing or implausible
+    price = pd.to_numeric(df["PriceUSD"], errors="coerce")
+    bad = price.isna() | (price < 120) | (price > 2000)
+    if bad.any():
+        price[bad] = df[bad].apply(price_estimate, axis=1)
+    df["PriceUSD"] = price.astype(float)
+
+    # placeholder image per label; labels seen in earlier runs with the same
+    # render params (size, colours, font, PNG optimization) reuse their image
+    labels = _labels(df).tolist()
+    distinct = set(labels)
+    params = render_params(args.optimize_png)
+    cache = {} if args.force else load_image_cache(args.image_cache, params)
+    df["ImageURL"], rendered, cache = render_images(labels, args.workers, cache, args.optimize_png)
+    save_image_cache(args.image_cache, params, {l: cache[l] for l in distinct})
+
+    df.to_csv(args.out_csv, index=False)
+    df.to_json(args.out_json, orient="records", force_ascii=False)
+    print(f"🖼️  Rendered {rendered} new images, reused {len(distinct) - rendered} ({len(distinct)} distinct labels)")
+    print(f"✅ Wrote {len(df)} rows to:\n - {args.out_csv}\n - {args.out_json}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,247 @@
+# tools/fake_services.py
+"""
+Deterministic local stand-ins for the services the backend calls, so the full
+pipeline (LLM calls, image lookups, their timeouts and fallbacks) can be
+load-tested and profiled offline.
+
+  POST /api/generate   Ollama generate (stream or not, format=json or text)
+  GET  /api/tags       Ollama model list
+  GET  /w/api.php      Wikipedia action=query&prop=pageimages
+
+Response bodies depend only on the request (same prompt -> same answer), and
+latency/errors come from a seeded RNG.
+
+    python tools/fake_services.py --port 11434 --llm_latency lognormal:400,0.5 --error_rate 0.02
+    OLLAMA_URL=http://127.0.0.1:11434 WIKI_API_URL=http://127.0.0.1:11434/w/api.php uvicorn main:app
+
+Latency specs (milliseconds): fixed:MS, uniform:LO,HI, normal:MEAN,SD, lognormal:MEDIAN,SIGMA
+"""
+import argparse, hashlib, json, math, random, re, threading, time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+def parse_latency(spec: str):
+    """'lognormal:400,0.5' -> callable(rng) returning seconds."""
+    kind, _, args = (spec or "fixed:0").partition(":")
+    a = [float(x) for x in args.split(",") if x.strip()] or [0.0]
+    if kind == "fixed":
+        return lambda rng: a[0] / 1000
+    if kind == "uniform":
+        return lambda rng: rng.uniform(a[0], a[1]) / 1000
+    if kind == "normal":
+        return lambda rng: max(0.0, rng.gauss(a[0], a[1])) / 1000
+    if kind == "lognormal":
+        return lambda rng: rng.lognormvariate(math.log(max(a[0], 1e-3)), a[1]) / 1000
+    raise ValueError(f"unknown latency spec: {spec}")
+
+def _h(s: str) -> int:
+    return int(hashlib.sha1(s.encode("utf-8")).hexdigest()[:8], 16)
+
+def _phone_from_prompt(prompt: str) -> dict:
+    # Prompts embed the phone as JSON after "Phone:" or "Phone facts:"
+    m = re.search(r"Phone(?: facts)?:\s*(\{.*?\})", prompt, re.S)
+    try:
+        return json.loads(m.group(1)) if m else {}
+    except Exception:
+        return {}
+
+def _user_text(prompt: str) -> str:
+    m = re.search(r"User(?: message)?:\s*(.*?)\s*JSON:", prompt, re.S)
+    return (m.group(1) if m else prompt).lower()
+
+# ---------- canned LLM answers (shaped like the schemas in the prompts) ----------
+def answer_intent(prompt: str) -> dict:
+    t = _user_text(prompt)
+    out = {k: None for k in ["budget","os","prefer_small","prefer_large","min_battery","min_ram",
+                             "min_storage","min_camera","brands","avoid_brands","must_have","min_year","max_year"]}
+    if "camera_priority" in prompt:
+        out["camera_priority"] = True if re.search(r"camera|photo", t) else None
+    m = re.search(r"\$?\s*(\d{3,4})\b(?!\s*(?:mah|gb))", t)
+    if m: out["budget"] = float(m.group(1))
+    if re.search(r"iphone|ios|apple", t): out["os"] = "iOS"
+    elif "android" in t: out["os"] = "Android"
+    if re.search(r"compact|small|mini", t): out["prefer_small"] = True
+    elif re.search(r"large|big|max", t): out["prefer_large"] = True
+    if re.search(r"battery", t): out["min_battery"] = 5000
+    feats = [f for f, k in [("5G", "5g"), ("wireless charging", "wireless"), ("IP68", "ip68"), ("eSIM", "esim")] if k in t]
+    out["must_have"] = feats or None
+    brands = [b.title() for b in ["samsung","google","oneplus","xiaomi","sony","motorola","apple"] if b in t]
+    out["brands"] = brands or None
+    return out
+
+def answer_pros_cons(prompt: str) -> dict:
+    p = _phone_from_prompt(prompt)
+    pros, cons = [], []
+    if (p.get("Battery_mAh") or 0) >= 5000: pros.append("Long battery life")
+    if (p.get("RAM_GB") or 0) >= 8: pros.append("Plenty of RAM for multitasking")
+    if (p.get("Storage_GB") or 0) >= 256: pros.append("Large storage for photos and apps")
+    if (p.get("MainCameraMP") or 0) >= 48: pros.append("Detailed main camera")
+    if (p.get("DisplayInches") or 0) >= 6.7: pros.append("Large, immersive display")
+    if (p.get("DisplayInches") or 9) <= 6.2: pros.append("Compact, one-handed size")
+    pros = (pros or ["Balanced specs for the price"])[:5]
+    cons = ["Heavier than some rivals" if (p.get("DisplayInches") or 0) >= 6.7 else "Smaller battery than big phones",
+            "No charger in the box"]
+    return {"pros": pros, "cons": cons}
+
+def answer_explanations(prompt: str) -> dict:
+    def listed(key):
+        m = re.search(key + r":\s*(\[.*?\])", prompt, re.S)
+        try:
+            return json.loads(m.group(1)) if m else []
+        except Exception:
+            return []
+    if "Labels:" in prompt:
+        return {lab: f"{lab} explained in plain words." for lab in listed("Labels")}
+    return {"pros": {b: "Helps in everyday use." for b in listed("Pros")},
+            "cons": {b: "Worth keeping in mind." for b in listed("Cons")}}
+
+def answer_text(prompt: str) -> str:
+    p = _phone_from_prompt(prompt)
+    name = f"{p.get('Brand') or p.get('brand') or 'This'} {p.get('Model') or p.get('model') or 'phone'}".strip()
+    return (f"{name} fits what you asked for: it balances screen size, battery and price well. "
+            "It should stay quick for years and take good everyday photos.")
+
+def llm_response(body: dict) -> str:
+    prompt = str(body.get("prompt") or "")
+    if body.get("format") == "json":
+        if "phone-shopping intent" in prompt:
+            return json.dumps(answer_intent(prompt))
+        if "keys pros" in prompt:
+            return json.dumps(answer_pros_cons(prompt))
+        if "'pros' and 'cons'" in prompt or "Labels:" in prompt:
+            return json.dumps(answer_explanations(prompt))
+        return "{}"
+    if "keys pros" in prompt:   # llm_pros_cons asks for JSON without format=json
+        return json.dumps(answer_pros_cons(prompt))
+    return answer_text(prompt)
+
+def wiki_response(title: str, miss_rate: float) -> dict:
+    h = _h(title)
+    if (h % 10000) / 10000 < miss_rate:
+        return {"batchcomplete": "", "query": {"pages": {"-1": {"ns": 0, "title": title, "missing": ""}}}}
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", title).strip("_")
+    return {"batchcomplete": "", "query": {"pages": {str(h % 10_000_000): {
+        "pageid": h % 10_000_000, "ns": 0, "title": title,
+        "thumbnail": {"source": f"https://upload.wikimedia.org/wikipedia/commons/thumb/f/f0/{slug}.jpg/640px-{slug}.jpg",
+                      "width": 640, "height": 480},
+        "pageimage": f"{slug}.jpg",
+    }}}}
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    cfg: argparse.Namespace = None
+    rng = random.Random(0)
+    lock = threading.Lock()
+
+    def log_message(self, fmt, *args):
+        if self.cfg.verbose:
+            super().log_message(fmt, *args)
+
+    def _draw(self, latency):
+        """One locked draw from the seeded RNG: (delay_s, fail, hang, bad_json)."""
+        c = self.cfg
+        with self.lock:
+            return (latency(self.rng), self.rng.random() < c.error_rate,
+                    self.rng.random() < c.hang_rate, self.rng.random() < c.bad_json_rate)
+
+    def _send(self, code: int, obj, ctype="application/json"):
+        data = obj if isinstance(obj, bytes) else json.dumps(obj).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _chaos(self, latency) -> tuple:
+        delay, fail, hang, bad = self._draw(latency)
+        time.sleep(self.cfg.hang_s if hang else delay)
+        if fail:
+            self._send(500, {"error": "injected failure"})
+            return True, bad
+        return False, bad
+
+    def do_GET(self):
+        u = urlparse(self.path)
+        if u.path == "/api/tags":
+            return self._send(200, {"models": [{"name": self.cfg.model, "model": self.cfg.model}]})
+        if u.path == "/w/api.php":
+            failed, _ = self._chaos(self.cfg.wiki_latency_fn)
+            if failed:
+                return
+            q = parse_qs(u.query)
+            return self._send(200, wiki_response((q.get("titles") or [""])[0], self.cfg.wiki_miss_rate))
+        self._send(404, {"error": "not found"})
+
+    def do_POST(self):
+        if urlparse(self.path).path != "/api/generate":
+            return self._send(404, {"error": "not found"})
+        n = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(n) or b"{}")
+        except Exception:
+            return self._send(400, {"error": "invalid JSON body"})
+        failed, bad = self._chaos(self.cfg.llm_latency_fn)
+        if failed:
+            return
+        text = llm_response(body)
+        if bad:
+            text = text[: max(1, len(text) // 2)]  # truncated: not valid JSON
+        model = body.get("model") or self.cfg.model
+        now = datetime.now(timezone.utc).isoformat()
+        tokens = re.findall(r"\S+\s*", text) or [""]
+        final = {"model": model, "created_at": now, "response": "", "done": True, "done_reason": "stop",
+                 "total_duration": 0, "prompt_eval_count": len(str(body.get("prompt") or "")) // 4,
+                 "eval_count": len(tokens)}
+
+        if body.get("stream", True) is False:
+            return self._send(200, {**final, "response": text})
+
+        # Ollama streams NDJSON by default: one chunk per token, then a done record
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        def chunk(obj):
+            line = (json.dumps(obj) + "\n").encode("utf-8")
+            self.wfile.write(f"{len(line):X}\r\n".encode() + line + b"\r\n")
+            self.wfile.flush()
+        for tok in tokens:
+            chunk({"model": model, "created_at": now, "response": tok, "done": False})
+            if self.cfg.token_ms:
+                time.sleep(self.cfg.token_ms / 1000)
+        chunk(final)
+        self.wfile.write(b"0\r\n\r\n")
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=11434)
+    ap.add_argument("--model", default="llama3.1:8b")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--llm_latency", default="lognormal:300,0.4")
+    ap.add_argument("--wiki_latency", default="lognormal:80,0.5")
+    ap.add_argument("--token_ms", type=float, default=5.0, help="delay between streamed chunks")
+    ap.add_argument("--error_rate", type=float, default=0.0, help="share of requests answered with HTTP 500")
+    ap.add_argument("--hang_rate", type=float, default=0.0, help="share of requests that sleep --hang_s (client timeouts)")
+    ap.add_argument("--hang_s", type=float, default=35.0)
+    ap.add_argument("--bad_json_rate", type=float, default=0.0, help="share of LLM answers truncated mid-JSON")
+    ap.add_argument("--wiki_miss_rate", type=float, default=0.2, help="share of titles with no page image")
+    ap.add_argument("--verbose", action="store_true")
+    args = ap.parse_args()
+    args.llm_latency_fn = parse_latency(args.llm_latency)
+    args.wiki_latency_fn = parse_latency(args.wiki_latency)
+
+    Handler.cfg = args
+    Handler.rng = random.Random(args.seed)
+    srv = ThreadingHTTPServer((args.host, args.port), Handler)
+    srv.daemon_threads = True
+    print(f"🧪 Fake Ollama + Wikipedia on http://{args.host}:{args.port} "
+          f"(llm {args.llm_latency}, wiki {args.wiki_latency}, errors {args.error_rate:.0%})")
+    try:
+        srv.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
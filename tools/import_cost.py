@@ -0,0 +1,95 @@
+# tools/import_cost.py
+"""
+Measure what `import main` costs the backend at startup, using
+`python -X importtime` in a fresh interpreter, and how long startup warmup
+(catalog, asset index, HTTP client, LLM, pipeline) takes after that.
+
+    python tools/import_cost.py
+    python tools/import_cost.py --top 30 --repeat 5 --warmup --out data/bench/import.json
+
+Per module the minimum over --repeat runs is reported, so a cold disk cache on
+the first run does not skew the numbers.
+"""
+import argparse, json, os, re, subprocess, sys
+
+ROOT = os.path.normpath(os.path.join(os.path.dirname(__file__), ".."))
+BACKEND = os.path.join(ROOT, "backend")
+LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)")
+
+WARMUP_SNIPPET = """
+import json, time
+t0 = time.perf_counter()
+import main
+t1 = time.perf_counter()
+main.run_warmup()
+print("WARMUP " + json.dumps({"import_s": t1 - t0, "warmup_s": time.perf_counter() - t1,
+                              "steps": main._WARMUP_STATE["steps"]}))
+"""
+
+def _env() -> dict:
+    env = dict(os.environ)
+    env.setdefault("USE_OLLAMA", "0")
+    env.setdefault("CATALOG_POLL_SECONDS", "0")
+    return env
+
+def importtime(module: str) -> dict:
+    """One fresh interpreter: {module: (self_us, cumulative_us, depth)}."""
+    p = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                       cwd=BACKEND, env=_env(), capture_output=True, text=True)
+    if p.returncode != 0:
+        raise SystemExit(p.stderr[-2000:])
+    out = {}
+    for line in p.stderr.splitlines():
+        m = LINE.match(line)
+        if m:
+            out[m.group(4)] = (int(m.group(1)), int(m.group(2)), len(m.group(3)) // 2)
+    return out
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--module", default="main")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--top", type=int, default=20)
+    ap.add_argument("--warmup", action="store_true", help="also time run_warmup() after the import")
+    ap.add_argument("--out", default="")
+    args = ap.parse_args()
+
+    runs = [importtime(args.module) for _ in range(max(1, args.repeat))]
+    mods = {}
+    for name in runs[0]:
+        vals = [r[name] for r in runs if name in r]
+        mods[name] = {"self_ms": min(v[0] for v in vals) / 1000, "cum_ms": min(v[1] for v in vals) / 1000,
+                      "depth": vals[0][2]}
+    total = mods.get(args.module, {}).get("cum_ms", 0.0)
+
+    # direct imports of the module are what can actually be deferred
+    direct = sorted(((n, m) for n, m in mods.items() if m["depth"] == 1), key=lambda x: -x[1]["cum_ms"])
+    print(f"import {args.module}: {total:.1f} ms (min of {len(runs)})")
+    print("  direct imports by cumulative time:")
+    for n, m in direct[:args.top]:
+        print(f"    {m['cum_ms']:9.1f} ms  {m['cum_ms'] / total:6.1%}  {n}" if total else f"    {n}")
+    print("  slowest modules by self time:")
+    for n, m in sorted(mods.items(), key=lambda x: -x[1]["self_ms"])[:args.top]:
+        print(f"    {m['self_ms']:9.1f} ms  {n}")
+
+    report = {"module": args.module, "total_ms": total, "runs": len(runs), "modules": mods}
+    if args.warmup:
+        p = subprocess.run([sys.executable, "-c", WARMUP_SNIPPET], cwd=BACKEND, env=_env(),
+                           capture_output=True, text=True)
+        line = next((l for l in p.stdout.splitlines() if l.startswith("WARMUP ")), None)
+        if line is None:
+            raise SystemExit(p.stderr[-2000:])
+        report["warmup"] = json.loads(line[len("WARMUP "):])
+        w = report["warmup"]
+        print(f"  time to ready: import {w['import_s']*1000:.0f} ms + warmup {w['warmup_s']*1000:.0f} ms")
+        for step, st in w["steps"].items():
+            print(f"    {step:<13} {st['status']:<8} {st['seconds']*1000:9.1f} ms")
+
+    if args.out:
+        os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"🧾 Report: {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+# tools/loadtest_chat.py
+"""
+Replay chat flows (/chat/start -> /chat/patch -> /chat/message) concurrently
+and report throughput and latency percentiles per endpoint.
+
+In-process against the FastAPI app (needs httpx for TestClient), optionally on
+a generated catalog:
+    python tools/loadtest_chat.py --rows 100000 --users 16 --duration 30
+
+Against a running server:
+    python tools/loadtest_chat.py --url http://127.0.0.1:8000 --users 32 --duration 60 --out data/bench/load.json
+"""
+import argparse, json, os, random, sys, tempfile, threading, time
+from collections import defaultdict
+
+import numpy as np
+
+ROOT = os.path.normpath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Each flow is what one visitor does after /chat/start.
+# ("patch", {...}) mirrors the wizard controls, ("message", "...") the chat box.
+FLOWS = {
+    "wizard": [
+        ("patch", {"budget": 700}),
+        ("patch", {"os": "Android"}),
+        ("patch", {"prefer_small": True}),
+        ("patch", {"min_battery": 5000}),
+        ("patch", {"must_have": ["5G"]}),
+        ("message", "show results"),
+    ],
+    "one-shot": [
+        ("message", "android, compact, under 600, long battery"),
+        ("message", "show results"),
+    ],
+    "conversation": [
+        ("message", "I want a new phone"),
+        ("message", "900"),
+        ("message", "iphone"),
+        ("message", "skip"),
+        ("message", "yes long battery"),
+        ("message", "show results"),
+    ],
+    "brand-tweaks": [
+        ("message", "samsung or google with wireless charging"),
+        ("patch", {"budget": 1200}),
+        ("patch", {"min_storage": "256 GB"}),
+        ("patch", {"budget": 900}),
+        ("message", "recommend something"),
+    ],
+}
+
+class HttpClient:
+    """requests.Session against a live server."""
+    def __init__(self, url: str):
+        import requests
+        self.url = url.rstrip("/")
+        self.s = requests.Session()
+
+    def post(self, path: str, body):
+        r = self.s.post(self.url + path, json=body, timeout=120)
+        return r.status_code, (r.json() if r.content else {})
+
+class InProcClient:
+    """fastapi TestClient around backend/main.py's app (one per worker thread)."""
+    def __init__(self, app):
+        from fastapi.testclient import TestClient
+        self.c = TestClient(app)
+
+    def post(self, path: str, body):
+        r = self.c.post(path, json=body)
+        return r.status_code, (r.json() if r.content else {})
+
+def _run_flow(client, flow, rec) -> None:
+    t0 = time.perf_counter()
+    status, body = client.post("/chat/start", None)
+    rec("/chat/start", time.perf_counter() - t0, status)
+    sid = body.get("session_id")
+    if not sid:
+        return
+    for kind, arg in flow:
+        path = "/chat/patch" if kind == "patch" else "/chat/message"
+        payload = {"session_id": sid, ("patch" if kind == "patch" else "message"): arg}
+        t0 = time.perf_counter()
+        status, _ = client.post(path, payload)
+        rec(path, time.perf_counter() - t0, status)
+
+def run(make_client, users: int, duration: float, sessions: int, seed: int) -> dict:
+    lat = defaultdict(list)
+    errors = defaultdict(int)
+    lock = threading.Lock()
+    done = [0]
+    deadline = time.perf_counter() + duration if duration else None
+    names = sorted(FLOWS)
+
+    def rec(path, dt, status):
+        with lock:
+            lat[path].append(dt)
+            if status >= 400:
+                errors[path] += 1
+
+    def worker(k: int):
+        client = make_client()
+        rng = random.Random(seed + k)
+        while True:
+            with lock:
+                if sessions and done[0] >= sessions:
+                    return
+                done[0] += 1
+            if deadline and time.perf_counter() > deadline:
+                return
+            try:
+                _run_flow(client, FLOWS[rng.choice(names)], rec)
+            except Exception as e:
+                rec("exception", 0.0, 599)
+                print("[loadtest]", e.__class__.__name__, e)
+
+    t0 = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(k,), daemon=True) for k in range(users)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    wall = time.perf_counter() - t0
+
+    def pct(xs):
+        a = np.asarray(xs) * 1000
+        return {f"p{q}": round(float(np.percentile(a, q)), 2) for q in (50, 90, 95, 99)} | {
+            "max": round(float(a.max()), 2), "mean": round(float(a.mean()), 2)}
+
+    total = sum(len(v) for v in lat.values())
+    return {
+        "users": users, "wall_s": round(wall, 3), "requests": total,
+        "throughput_rps": round(total / wall, 2) if wall else 0.0,
+        "errors": dict(errors),
+        "endpoints": {p: {"count": len(v), "latency_ms": pct(v)} for p, v in sorted(lat.items()) if v},
+        "all": {"count": total, "latency_ms": pct([x for v in lat.values() for x in v])} if total else {},
+    }
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--url", default="", help="live server; omit to run in-process")
+    ap.add_argument("--catalog", default="", help="in-process: CSV to serve (default PHONES_CSV)")
+    ap.add_argument("--rows", type=int, default=0, help="in-process: generate a synthetic catalog of this size")
+    ap.add_argument("--users", type=int, default=8)
+    ap.add_argument("--duration", type=float, default=20.0, help="seconds; 0 = run --sessions flows")
+    ap.add_argument("--sessions", type=int, default=0)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--out", default="")
+    args = ap.parse_args()
+
+    tmp = None
+    if args.url:
+        make_client = lambda: HttpClient(args.url)
+    else:
+        if args.rows:
+            sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+            from make_synthetic_catalog import generate_catalog
+            tmp = tempfile.TemporaryDirectory()
+            args.catalog = os.path.join(tmp.name, f"phones_{args.rows}.csv")
+            generate_catalog(args.rows, seed=args.seed).to_csv(args.catalog, index=False)
+        if args.catalog:
+            os.environ["PHONES_CSV"] = os.path.abspath(args.catalog)
+        os.environ.setdefault("CATALOG_POLL_SECONDS", "0")
+        sys.path.insert(0, os.path.join(ROOT, "backend"))
+        import main as backend
+        backend.load_df()  # keep the cold load out of the first request
+        make_client = lambda: InProcClient(backend.app)
+
+    report = run(make_client, args.users, args.duration, args.sessions, args.seed)
+    report["target"] = args.url or f"in-process:{os.environ.get('PHONES_CSV', '')}"
+
+    print(f"{report['requests']} requests in {report['wall_s']} s -> {report['throughput_rps']} req/s "
+          f"({args.users} users), errors: {report['errors'] or 0}")
+    for path, r in report["endpoints"].items():
+        l = r["latency_ms"]
+        print(f"  {path:<14} n={r['count']:<6} p50 {l['p50']:>8} ms  p90 {l['p90']:>8}  p99 {l['p99']:>8}  max {l['max']:>8}")
+    if args.out:
+        os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"🧾 Report: {args.out}")
+    if tmp:
+        tmp.cleanup()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+# tools/make_synthetic_catalog.py
+"""
+Generate a realistic synthetic phone catalog of any size, shaped like the one
+the backend serves (same columns as phones_clean.csv, no ImageURL).
+
+Everything is drawn from a seed catalog (default data/processed/phones_clean.csv):
+  - brand mix and brand -> OS from the seed frequencies
+  - specs by bootstrapping whole seed rows, so RAM/storage/battery/camera keep
+    their joint correlations; older generations step down a tier per two years
+  - price from a log-linear fit of the seed prices on specs + brand, plus a
+    resampled residual and a per-year depreciation
+  - NotableFeatures flags with the per-flag frequency of the row's price quartile
+  - model names from the brand's seed naming patterns with the generation bumped
+
+    python tools/make_synthetic_catalog.py --rows 100000 --out data/synthetic/phones_100k.csv
+"""
+import argparse, os, re
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.normpath(os.path.join(os.path.dirname(__file__), ".."))
+SEED_CSV = os.path.join(ROOT, "data", "processed", "phones_clean.csv")
+
+COLUMNS = [
+    "ID","Brand","Model","Slug","ReleaseYear","PriceUSD",
+    "DisplayInches","Battery_mAh","RAM_GB","Storage_GB",
+    "MainCameraMP","OS","Weight_g","NotableFeatures","SourceFiles"
+]
+RAM_TIERS = np.array([2, 3, 4, 6, 8, 12, 16, 24])
+STORAGE_TIERS = np.array([32, 64, 128, 256, 512, 1024])
+DEPRECIATION = 0.12      # log-price drop per year of age
+MAX_AGE = 6              # oldest generation, in years before the seed's years
+
+def _load_seed(path: str) -> pd.DataFrame:
+    df = pd.read_csv(path, low_memory=False)
+    df = df[[c for c in COLUMNS if c in df.columns]].copy()
+    for c in ["ReleaseYear","PriceUSD","DisplayInches","Battery_mAh","RAM_GB","Storage_GB","MainCameraMP","Weight_g"]:
+        df[c] = pd.to_numeric(df[c], errors="coerce")
+    df["Brand"] = df["Brand"].astype(str).str.strip()
+    df["Model"] = df["Model"].astype(str).str.replace(r"\s*\(Global\)\s*$", "", regex=True).str.strip()
+    df["NotableFeatures"] = df["NotableFeatures"].fillna("").astype(str)
+    return df.dropna(subset=["ReleaseYear","PriceUSD","RAM_GB","Storage_GB","Battery_mAh","MainCameraMP"]).reset_index(drop=True)
+
+def _price_design(ram, storage, battery, camera, brand_idx, n_brands) -> np.ndarray:
+    X = np.column_stack([
+        np.ones(len(ram)), np.log2(ram), np.log2(storage), battery / 1000.0, np.log(camera),
+    ])
+    return np.hstack([X, np.eye(n_brands)[brand_idx]])
+
+def _fit_price(seed: pd.DataFrame, brands: list) -> tuple:
+    """Ridge fit of log(price) on specs + brand; returns (coef, residuals)."""
+    bidx = seed["Brand"].map({b: i for i, b in enumerate(brands)}).to_numpy()
+    X = _price_design(seed["RAM_GB"].to_numpy(), seed["Storage_GB"].to_numpy(),
+                      seed["Battery_mAh"].to_numpy(), seed["MainCameraMP"].to_numpy(), bidx, len(brands))
+    y = np.log(seed["PriceUSD"].to_numpy())
+    lam = np.eye(X.shape[1]) * 1.0
+    lam[0, 0] = 0.0  # don't shrink the intercept
+    coef = np.linalg.solve(X.T @ X + lam, X.T @ y)
+    return coef, y - X @ coef
+
+def _model_patterns(seed: pd.DataFrame) -> dict:
+    """Per brand: list of (pattern, base_number, is_year) from seed model names."""
+    out: dict = {}
+    for brand, models in seed.groupby("Brand")["Model"]:
+        pats = []
+        for m in sorted(set(models)):
+            mt = re.search(r"\d+", m)
+            if not mt:
+                pats.append((m + " {n}", 1, False))
+                continue
+            num = int(mt.group(0))
+            pats.append((m[:mt.start()] + "{n}" + m[mt.end():], num, num >= 2000))
+        out[brand] = pats
+    return out
+
+def _step_tier(values: np.ndarray, tiers: np.ndarray, steps: np.ndarray) -> np.ndarray:
+    idx = np.searchsorted(tiers, values).clip(0, len(tiers) - 1)
+    return tiers[(idx - steps).clip(0, len(tiers) - 1)]
+
+def generate_catalog(n: int, seed: int = 42, seed_csv: str = SEED_CSV, max_age: int = MAX_AGE) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    base = _load_seed(seed_csv)
+    brands = sorted(base["Brand"].unique())
+
+    # brand mix, then a template row of that brand for the joint spec profile
+    freq = base["Brand"].value_counts(normalize=True).reindex(brands).to_numpy()
+    bidx = rng.choice(len(brands), size=n, p=freq)
+    by_brand = [np.flatnonzero(base["Brand"].to_numpy() == b) for b in brands]
+    pick = rng.random(n)
+    tmpl = np.empty(n, dtype=np.int64)
+    for i, rows in enumerate(by_brand):
+        sel = bidx == i
+        tmpl[sel] = rows[(pick[sel] * len(rows)).astype(np.int64)]
+    t = base.iloc[tmpl].reset_index(drop=True)
+
+    # age: mostly current generations, geometric tail back to max_age
+    age = np.minimum(rng.geometric(0.45, size=n) - 1, max_age)
+    year = t["ReleaseYear"].to_numpy().astype(int) - age
+    tier_down = age // 2
+
+    ram = _step_tier(t["RAM_GB"].to_numpy(), RAM_TIERS, tier_down).astype(float)
+    storage = _step_tier(t["Storage_GB"].to_numpy(), STORAGE_TIERS, tier_down).astype(float)
+    battery = (t["Battery_mAh"].to_numpy() * (1 - 0.03 * age) * rng.normal(1, 0.04, n)).round(-1).clip(2000, 7500)
+    camera = t["MainCameraMP"].to_numpy().copy()
+    older = age >= 4
+    camera[older] = np.minimum(camera[older], rng.choice([12.0, 16.0, 48.0], size=older.sum()))
+    display = (t["DisplayInches"].to_numpy() - 0.04 * age + rng.normal(0, 0.05, n)).round(2).clip(4.7, 7.6)
+    weight = (t["Weight_g"].to_numpy() + rng.normal(0, 6, n)).round(1).clip(120, 300)
+
+    # price: seed fit on specs + brand, a resampled residual, then depreciation
+    coef, resid = _fit_price(base, brands)
+    X = _price_design(ram, storage, battery, camera, bidx, len(brands))
+    logp = X @ coef + rng.choice(resid, size=n) - DEPRECIATION * age
+    price = np.exp(logp).round(2).clip(79, 2499)
+
+    # features: per-flag frequency within the seed's price quartiles
+    q_edges = np.quantile(base["PriceUSD"], [0.25, 0.5, 0.75])
+    seed_q = np.searchsorted(q_edges, base["PriceUSD"].to_numpy())
+    row_q = np.searchsorted(q_edges, price)
+    flags = sorted({f.strip() for s in base["NotableFeatures"] for f in s.split(";") if f.strip()})
+    notable = pd.Series([""] * n, dtype=object)
+    for f in flags:
+        has = base["NotableFeatures"].str.contains(re.escape(f), regex=True).to_numpy()
+        p_q = np.array([has[seed_q == q].mean() if (seed_q == q).any() else has.mean() for q in range(4)])
+        notable = notable + np.where(rng.random(n) < p_q[row_q], "; " + f, "")
+    notable = notable.str.lstrip("; ")
+
+    # names: the brand's seed pattern with the generation moved back by age
+    pats = _model_patterns(base)
+    pat_pick = rng.random(n)
+    model = np.empty(n, dtype=object)
+    brand_arr = np.array(brands, dtype=object)[bidx]
+    for i, b in enumerate(brands):
+        pl = pats[b]
+        which = (pat_pick * len(pl)).astype(int)
+        for k, (pat, num, is_year) in enumerate(pl):
+            sel = np.flatnonzero((bidx == i) & (which == k))
+            gens = year[sel] if is_year else np.maximum(1, num - age[sel])
+            model[sel] = [pat.format(n=g) for g in gens]
+    cfg = [f"{int(r)}/{int(s)}GB" for r, s in zip(ram, storage)]
+    model = pd.Series(model) + " " + pd.Series(cfg)
+    dup = pd.DataFrame({"b": brand_arr, "m": model}).groupby(["b", "m"]).cumcount().to_numpy()
+    model = model.where(dup == 0, model + " v" + pd.Series(dup + 1).astype(str))
+
+    os_arr = np.where(brand_arr == "Apple", "iOS", "Android")
+    slug = (pd.Series(brand_arr) + "-" + model).str.lower().str.replace(r"[^a-z0-9]+", "-", regex=True).str.strip("-")
+    sdup = slug.groupby(slug).cumcount().to_numpy()
+    slug = slug.where(sdup == 0, slug + "-" + pd.Series(sdup + 1).astype(str))
+
+    out = pd.DataFrame({
+        "ID": [f"SYN{i:07d}" for i in range(1, n + 1)],
+        "Brand": brand_arr,
+        "Model": model,
+        "Slug": slug,
+        "ReleaseYear": year,
+        "PriceUSD": price,
+        "DisplayInches": display,
+        "Battery_mAh": battery.astype(int),
+        "RAM_GB": ram,
+        "Storage_GB": storage,
+        "MainCameraMP": camera,
+        "OS": os_arr,
+        "Weight_g": weight,
+        "NotableFeatures": notable,
+        "SourceFiles": f"synthetic_seed{seed}.csv",
+    })
+    return out[COLUMNS]
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, required=True)
+    ap.add_argument("--out", required=True)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--seed_csv", default=SEED_CSV)
+    ap.add_argument("--max_age", type=int, default=MAX_AGE)
+    args = ap.parse_args()
+
+    df = generate_catalog(args.rows, seed=args.seed, seed_csv=args.seed_csv, max_age=args.max_age)
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    df.to_csv(args.out, index=False)
+    print(f"✅ Wrote {len(df)} rows to {args.out}")
+
+if __name__ == "__main__":
+    main()